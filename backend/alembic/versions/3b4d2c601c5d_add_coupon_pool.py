@@ -0,0 +1,48 @@
+"""Add coupon pool
+
+Revision ID: 3b4d2c601c5d
+Revises: 7666676a35bc
+Create Date: 2026-10-19 18:05:31.774020
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b4d2c601c5d'
+down_revision: Union[str, None] = '7666676a35bc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('coupon_codes',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+    sa.Column('reward_template_id', sa.UUID(), nullable=False),
+    sa.Column('code', sa.String(length=64), nullable=False),
+    sa.Column('reward_id', sa.UUID(), nullable=True),
+    sa.Column('issued_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('redeemed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['reward_id'], ['rewards.id'], ),
+    sa.ForeignKeyConstraint(['reward_template_id'], ['reward_templates.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('reward_id'),
+    sa.UniqueConstraint('reward_template_id', 'code', name='uq_coupon_codes_template_code')
+    )
+    op.create_index('ix_coupon_codes_available', 'coupon_codes', ['reward_template_id', 'id'], unique=False,
+                    postgresql_where=sa.text('reward_id IS NULL'))
+    op.add_column('reward_templates', sa.Column('coupon_pool', sa.Boolean(), server_default=sa.text('false'),
+                                                nullable=False))
+    op.add_column('rewards', sa.Column('code', sa.String(length=64), nullable=True))
+    op.add_column('rewards', sa.Column('redeemed_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('rewards', 'redeemed_at')
+    op.drop_column('rewards', 'code')
+    op.drop_column('reward_templates', 'coupon_pool')
+    op.drop_index('ix_coupon_codes_available', table_name='coupon_codes', postgresql_where=sa.text('reward_id IS NULL'))
+    op.drop_table('coupon_codes')
@@ -0,0 +1,55 @@
+"""UUIDv7 server defaults for claim_logs and rewards
+
+Revision ID: 3f1c9a7d2b64
+Revises: ba49b71a7e56
+Create Date: 2026-10-19 09:12:41.318204
+
+The ORM already generates UUIDv7 ids client-side; this adds an equivalent
+server default so raw SQL / COPY loaders get time-ordered keys too.
+Existing rows keep their uuid4 ids — the column type is unchanged, so
+old and new keys coexist and new inserts simply append to the index.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2b64'
+down_revision: Union[str, None] = 'ba49b71a7e56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # gen_random_uuid() is v4; overlay the 48-bit unix-ms timestamp and flip
+    # the version nibble from 0100 to 0111 (RFC 9562 UUIDv7)
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+            SELECT encode(
+                set_bit(
+                    set_bit(
+                        overlay(
+                            uuid_send(gen_random_uuid())
+                            PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                            FROM 1 FOR 6
+                        ),
+                        52, 1
+                    ),
+                    53, 1
+                ),
+                'hex'
+            )::uuid
+        $$ LANGUAGE sql VOLATILE
+        """
+    )
+    op.execute("ALTER TABLE claim_logs ALTER COLUMN id SET DEFAULT uuid_generate_v7()")
+    op.execute("ALTER TABLE rewards ALTER COLUMN id SET DEFAULT uuid_generate_v7()")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE rewards ALTER COLUMN id DROP DEFAULT")
+    op.execute("ALTER TABLE claim_logs ALTER COLUMN id DROP DEFAULT")
+    op.execute("DROP FUNCTION IF EXISTS uuid_generate_v7()")
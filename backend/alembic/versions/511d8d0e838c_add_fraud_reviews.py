@@ -0,0 +1,40 @@
+"""Add fraud reviews
+
+Revision ID: 511d8d0e838c
+Revises: f4b8d3c27e15
+Create Date: 2026-10-19 16:02:44.180357
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '511d8d0e838c'
+down_revision: Union[str, None] = 'f4b8d3c27e15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('fraud_reviews',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('reason', sa.String(length=32), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('claim_ids', postgresql.ARRAY(sa.UUID()), nullable=False),
+    sa.Column('details', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('first_flagged_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('audited_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'reason')
+    )
+    op.create_index('ix_fraud_reviews_status_score', 'fraud_reviews', ['status', 'score'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_fraud_reviews_status_score', table_name='fraud_reviews')
+    op.drop_table('fraud_reviews')
@@ -0,0 +1,45 @@
+"""Add rollup redemptions
+
+Revision ID: 6e3a0c8f5b21
+Revises: d41f7b9c2e58
+Create Date: 2026-10-19 22:31:40.672915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e3a0c8f5b21'
+down_revision: Union[str, None] = 'd41f7b9c2e58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('claim_rollups', sa.Column('redemptions', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.create_index('ix_rewards_redeemed_at', 'rewards', ['redeemed_at'], unique=False,
+                    postgresql_where=sa.text('redeemed_at IS NOT NULL'))
+    # rewards redeemed before this revision are counted into the existing rollups once, here
+    op.execute(
+        """
+        UPDATE claim_rollups r SET redemptions = s.redemptions
+        FROM (
+            SELECT g.granularity,
+                   timezone('UTC', date_trunc(g.granularity, timezone('UTC', rw.created_at))) AS bucket_start,
+                   rw.location_id, count(*) AS redemptions
+            FROM rewards rw CROSS JOIN (VALUES ('hour'), ('day')) AS g (granularity)
+            WHERE rw.location_id IS NOT NULL AND rw.redeemed_at IS NOT NULL
+              AND rw.redeemed_at <= (SELECT watermark FROM rollup_watermarks WHERE name = 'claim_rollups')
+            GROUP BY 1, 2, 3
+        ) s
+        WHERE r.granularity = s.granularity AND r.bucket_start = s.bucket_start AND r.location_id = s.location_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_rewards_redeemed_at', table_name='rewards', postgresql_where=sa.text('redeemed_at IS NOT NULL'))
+    op.drop_column('claim_rollups', 'redemptions')
@@ -0,0 +1,43 @@
+"""Add campaign windows and active-row partial indexes
+
+Revision ID: 7666676a35bc
+Revises: 511d8d0e838c
+Create Date: 2026-10-19 17:12:05.390214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7666676a35bc'
+down_revision: Union[str, None] = '511d8d0e838c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('reward_templates', sa.Column('starts_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('reward_templates', sa.Column('ends_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_reward_templates_active_location', 'reward_templates', ['location_id'], unique=False,
+                    postgresql_where=sa.text('is_active'))
+    op.create_index('ix_reward_templates_starts_at', 'reward_templates', ['starts_at'], unique=False,
+                    postgresql_where=sa.text('starts_at IS NOT NULL'))
+    op.create_index('ix_reward_templates_ends_at', 'reward_templates', ['ends_at'], unique=False,
+                    postgresql_where=sa.text('ends_at IS NOT NULL'))
+    op.create_index('ix_locations_active_city', 'locations', ['city'], unique=False,
+                    postgresql_where=sa.text('is_active'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_locations_active_city', table_name='locations', postgresql_where=sa.text('is_active'))
+    op.drop_index('ix_reward_templates_ends_at', table_name='reward_templates',
+                  postgresql_where=sa.text('ends_at IS NOT NULL'))
+    op.drop_index('ix_reward_templates_starts_at', table_name='reward_templates',
+                  postgresql_where=sa.text('starts_at IS NOT NULL'))
+    op.drop_index('ix_reward_templates_active_location', table_name='reward_templates',
+                  postgresql_where=sa.text('is_active'))
+    op.drop_column('reward_templates', 'ends_at')
+    op.drop_column('reward_templates', 'starts_at')
@@ -0,0 +1,43 @@
+"""Add reward prize tables
+
+Revision ID: 82cba4e72188
+Revises: 3b4d2c601c5d
+Create Date: 2026-10-19 19:10:47.521983
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '82cba4e72188'
+down_revision: Union[str, None] = '3b4d2c601c5d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('reward_prizes',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('reward_template_id', sa.UUID(), nullable=False),
+    sa.Column('reward_type', sa.String(length=20), nullable=False),
+    sa.Column('reward_value', sa.Integer(), nullable=False),
+    sa.Column('reward_description', sa.String(length=500), nullable=True),
+    sa.Column('weight', sa.Float(), nullable=False),
+    sa.Column('stock', sa.Integer(), nullable=True),
+    sa.Column('awarded', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['reward_template_id'], ['reward_templates.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_reward_prizes_reward_template_id'), 'reward_prizes', ['reward_template_id'], unique=False)
+    op.add_column('reward_templates', sa.Column('has_prizes', sa.Boolean(), server_default=sa.text('false'), nullable=False))
+    op.add_column('reward_templates', sa.Column('prize_version', sa.Integer(), server_default=sa.text('0'), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('reward_templates', 'prize_version')
+    op.drop_column('reward_templates', 'has_prizes')
+    op.drop_index(op.f('ix_reward_prizes_reward_template_id'), table_name='reward_prizes')
+    op.drop_table('reward_prizes')
@@ -0,0 +1,53 @@
+"""Add claim rollups, rollup watermarks and sponsor accounts
+
+Revision ID: 8d2e4b6a1c03
+Revises: 3f1c9a7d2b64
+Create Date: 2026-10-19 10:04:27.551930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2e4b6a1c03'
+down_revision: Union[str, None] = '3f1c9a7d2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('claim_rollups',
+    sa.Column('granularity', sa.String(length=5), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('location_id', sa.UUID(), nullable=False),
+    sa.Column('sponsor_id', sa.UUID(), nullable=True),
+    sa.Column('claims', sa.Integer(), nullable=False),
+    sa.Column('first_claim_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('last_claim_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ),
+    sa.ForeignKeyConstraint(['sponsor_id'], ['sponsors.id'], ),
+    sa.PrimaryKeyConstraint('granularity', 'bucket_start', 'location_id')
+    )
+    op.create_index('ix_claim_rollups_sponsor_bucket', 'claim_rollups', ['sponsor_id', 'granularity', 'bucket_start'], unique=False)
+
+    op.create_table('rollup_watermarks',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('watermark', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    op.add_column('users', sa.Column('sponsor_id', sa.UUID(), nullable=True))
+    op.create_foreign_key('users_sponsor_id_fkey', 'users', 'sponsors', ['sponsor_id'], ['id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('users_sponsor_id_fkey', 'users', type_='foreignkey')
+    op.drop_column('users', 'sponsor_id')
+    op.drop_table('rollup_watermarks')
+    op.drop_index('ix_claim_rollups_sponsor_bucket', table_name='claim_rollups')
+    op.drop_table('claim_rollups')
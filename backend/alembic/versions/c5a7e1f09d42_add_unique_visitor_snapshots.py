@@ -0,0 +1,34 @@
+"""Add unique visitor snapshots
+
+Revision ID: c5a7e1f09d42
+Revises: 8d2e4b6a1c03
+Create Date: 2026-10-19 11:37:52.104118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a7e1f09d42'
+down_revision: Union[str, None] = '8d2e4b6a1c03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('unique_visitor_snapshots',
+    sa.Column('scope', sa.String(length=20), nullable=False),
+    sa.Column('scope_id', sa.UUID(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('estimate', sa.Integer(), nullable=False),
+    sa.Column('registers', sa.LargeBinary(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('scope', 'scope_id', 'day')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('unique_visitor_snapshots')
@@ -0,0 +1,27 @@
+"""Add active location lat/lon index
+
+Revision ID: d41f7b9c2e58
+Revises: 82cba4e72188
+Create Date: 2026-10-19 21:04:12.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f7b9c2e58'
+down_revision: Union[str, None] = '82cba4e72188'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_locations_active_lat_lon', 'locations', ['latitude', 'longitude'], unique=False,
+                    postgresql_where=sa.text('is_active'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_locations_active_lat_lon', table_name='locations', postgresql_where=sa.text('is_active'))
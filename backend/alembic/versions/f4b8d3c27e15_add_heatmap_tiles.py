@@ -0,0 +1,36 @@
+"""Add heatmap tiles
+
+Revision ID: f4b8d3c27e15
+Revises: c5a7e1f09d42
+Create Date: 2026-10-19 13:21:08.462771
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b8d3c27e15'
+down_revision: Union[str, None] = 'c5a7e1f09d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('heatmap_tiles',
+    sa.Column('sponsor_id', sa.UUID(), nullable=False),
+    sa.Column('zoom', sa.SmallInteger(), nullable=False),
+    sa.Column('x', sa.Integer(), nullable=False),
+    sa.Column('y', sa.Integer(), nullable=False),
+    sa.Column('counts', sa.LargeBinary(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['sponsor_id'], ['sponsors.id'], ),
+    sa.PrimaryKeyConstraint('sponsor_id', 'zoom', 'x', 'y')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('heatmap_tiles')
@@ -1,3 +1,3 @@
-from app.api import health, users, locations, claims, rewards
+from app.api import debug, health, metrics, users, locations, live, claims, rewards, leaderboards, sponsor, exports
 
-__all__ = ["health", "users", "locations", "claims", "rewards"]
+__all__ = ["debug", "health", "metrics", "users", "locations", "live", "claims", "rewards", "leaderboards", "sponsor", "exports"]
@@ -0,0 +1,115 @@
+"""Sponsor coupon pool endpoints – loading codes and store-side redemption."""
+
+import uuid
+from typing import AsyncIterator
+
+import redis.asyncio as aioredis
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.deps import get_sponsor_scope
+from app.core.redis import get_redis
+from app.schemas.coupon import (
+    CouponGenerateRequest,
+    CouponLoadResult,
+    CouponPoolStats,
+    CouponRedeemRequest,
+    CouponRedemption,
+)
+from app.services.coupons import (
+    SOLD_OUT_KEY,
+    ensure_sponsor_template,
+    load_codes,
+    pool_stats,
+    redeem_code,
+    stream_codes,
+)
+
+router = APIRouter()
+
+READ_CHUNK = 1 << 20  # bytes of an upload decoded at a time
+
+
+async def upload_lines(upload: UploadFile) -> AsyncIterator[str]:
+    """Lines of an uploaded file without reading it into memory whole."""
+    pending = b""
+    while chunk := await upload.read(READ_CHUNK):
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig")
+    if pending:
+        yield pending.decode("utf-8-sig")
+
+
+async def _stats(db: AsyncSession, template_id: uuid.UUID) -> CouponPoolStats:
+    total, issued, redeemed = await pool_stats(db, template_id)
+    return CouponPoolStats(
+        reward_template_id=template_id, total=total, issued=issued, redeemed=redeemed, available=total - issued
+    )
+
+
+async def _load(db: AsyncSession, redis_client: aioredis.Redis, template_id: uuid.UUID, codes) -> CouponLoadResult:
+    try:
+        loaded = await load_codes(db, template_id, codes)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, str(exc))
+    await redis_client.delete(SOLD_OUT_KEY.format(template_id))  # restocked: a later sell-out is news again
+    return CouponLoadResult(loaded=loaded, pool=await _stats(db, template_id))
+
+
+@router.get("/{template_id}", response_model=CouponPoolStats)
+async def coupon_pool(
+    template_id: uuid.UUID,
+    sponsor_id: uuid.UUID = Depends(get_sponsor_scope),
+    db: AsyncSession = Depends(get_db),
+):
+    """Codes loaded, issued and redeemed for one of the sponsor's reward templates."""
+    await ensure_sponsor_template(db, sponsor_id, template_id)
+    return await _stats(db, template_id)
+
+
+@router.post("/{template_id}/upload", response_model=CouponLoadResult)
+async def upload_coupons(
+    template_id: uuid.UUID,
+    file: UploadFile = File(..., description="Text file with one coupon code per line"),
+    sponsor_id: uuid.UUID = Depends(get_sponsor_scope),
+    db: AsyncSession = Depends(get_db),
+    redis_client: aioredis.Redis = Depends(get_redis),
+):
+    """Add the sponsor's own codes to the pool (streamed in with COPY; duplicates are skipped)."""
+    await ensure_sponsor_template(db, sponsor_id, template_id)
+    return await _load(db, redis_client, template_id, upload_lines(file))
+
+
+@router.post("/{template_id}/generate", response_model=CouponLoadResult)
+async def generate_coupons(
+    template_id: uuid.UUID,
+    body: CouponGenerateRequest,
+    sponsor_id: uuid.UUID = Depends(get_sponsor_scope),
+    db: AsyncSession = Depends(get_db),
+    redis_client: aioredis.Redis = Depends(get_redis),
+):
+    """Generate `count` random codes into the pool."""
+    await ensure_sponsor_template(db, sponsor_id, template_id)
+    return await _load(db, redis_client, template_id, stream_codes(body.count, body.length, body.prefix))
+
+
+@router.post("/redeem", response_model=CouponRedemption)
+async def redeem_coupon(
+    body: CouponRedeemRequest,
+    sponsor_id: uuid.UUID = Depends(get_sponsor_scope),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Redeem a code at checkout. Idempotent: repeating it (a retried request, a
+    double scan) returns the original redemption with `already_redeemed=true`.
+    """
+    redemption = await redeem_code(db, sponsor_id, body.reward_template_id, body.code.strip())
+    return CouponRedemption(
+        code=body.code.strip(),
+        reward_id=redemption.reward_id,
+        redeemed_at=redemption.redeemed_at,
+        already_redeemed=redemption.already_redeemed,
+    )
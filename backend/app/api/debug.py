@@ -0,0 +1,30 @@
+"""Development-only diagnostics (mounted when DEBUG is on)."""
+
+from typing import Literal
+
+from fastapi import APIRouter, Query, Response, status
+
+from app.core import slow_queries
+from app.schemas.debug import SlowQueryRead
+
+router = APIRouter()
+
+
+@router.get("/slow-queries", response_model=list[SlowQueryRead])
+async def list_slow_queries(
+    limit: int = Query(20, ge=1, le=1000),
+    order_by: Literal["total_ms", "count", "max_ms", "mean_ms"] = Query("total_ms"),
+    plans: bool = Query(False, description="Include the latest sampled EXPLAIN plan"),
+):
+    """Top slow statements in this worker, grouped by normalised SQL."""
+    offenders = [SlowQueryRead.model_validate(q) for q in slow_queries.top_offenders(limit, order_by)]
+    if not plans:
+        for offender in offenders:
+            offender.plan = None
+    return offenders
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_slow_queries():
+    slow_queries.reset()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,59 @@
+"""Sponsor data export endpoints."""
+
+import uuid
+from datetime import datetime, timezone
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.dates import as_utc
+from app.core.deps import get_sponsor_scope
+from app.services.export_service import stream_claim_export
+from app.services.location_service import ensure_sponsor_location
+
+router = APIRouter()
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@router.get("/claims")
+async def export_claims(
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    gzip: bool = Query(False, description="Compress the download with gzip"),
+    location_id: Optional[uuid.UUID] = Query(None),
+    start: Optional[datetime] = Query(None, description="Inclusive start of claimed_at"),
+    end: Optional[datetime] = Query(None, description="Exclusive end of claimed_at"),
+    sponsor_id: uuid.UUID = Depends(get_sponsor_scope),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Download the sponsor's raw claim log, oldest first.
+
+    The body is streamed from a server-side cursor in bounded chunks, so
+    exports of any size use constant memory on the server.
+    """
+    if location_id is not None:
+        await ensure_sponsor_location(db, sponsor_id, location_id)
+
+    filename = f"claims-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.{fmt}"
+    media_type = MEDIA_TYPES[fmt]
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    body = stream_claim_export(
+        sponsor_id,
+        fmt,
+        gzip=gzip,
+        location_id=location_id,
+        start=as_utc(start) if start else None,
+        end=as_utc(end) if end else None,
+    )
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
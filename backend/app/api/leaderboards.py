@@ -0,0 +1,87 @@
+"""Leaderboard endpoints – pages and "around me" windows served from Redis sorted sets."""
+
+import re
+import uuid
+from typing import Literal, Optional
+
+import redis.asyncio as redis
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.deps import get_current_active_user
+from app.core.redis import get_redis
+from app.models.user import User
+from app.schemas.leaderboard import LeaderboardEntry, LeaderboardPage, LeaderboardStanding
+from app.services.leaderboard import around, board_key, current_season, normalize_city, top
+
+router = APIRouter()
+
+SEASON = re.compile(r"\d{4}-S\d{1,2}")
+
+
+def resolve_board(
+    board: Literal["global", "city", "season"] = Query("global"),
+    city: Optional[str] = Query(None, max_length=100),
+    season: Optional[str] = Query(None, description="e.g. 2026-S4; defaults to the current season"),
+) -> tuple[str, str]:
+    """`(label, redis_key)` for the requested board."""
+    if board == "city":
+        if not city or not city.strip():
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, "city is required for the city leaderboard")
+        return f"city:{normalize_city(city)}", board_key("city", city)
+    if board == "season":
+        season = season or current_season()
+        if not SEASON.fullmatch(season):
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, "season must look like 2026-S4")
+        return f"season:{season}", board_key("season", season)
+    return "global", board_key("global")
+
+
+async def _entries(db: AsyncSession, ranked: list[tuple[str, int, int]]) -> list[LeaderboardEntry]:
+    """Attach display names with one primary-key lookup for the page."""
+    if not ranked:
+        return []
+    ids = [uuid.UUID(member) for member, _, _ in ranked]
+    result = await db.execute(select(User.id, User.display_name, User.avatar_url).where(User.id.in_(ids)))
+    profiles = {row.id: row for row in result}
+    return [
+        LeaderboardEntry(
+            rank=rank,
+            user_id=user_id,
+            display_name=profiles[user_id].display_name if user_id in profiles else "",
+            avatar_url=profiles[user_id].avatar_url if user_id in profiles else None,
+            score=score,
+        )
+        for user_id, (_, rank, score) in zip(ids, ranked)
+    ]
+
+
+@router.get("", response_model=LeaderboardPage)
+async def get_leaderboard(
+    board: tuple[str, str] = Depends(resolve_board),
+    offset: int = Query(0, ge=0, le=10_000),
+    limit: int = Query(50, ge=1, le=100),
+    _user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis),
+):
+    """Top-N page of a leaderboard, highest score first."""
+    label, key = board
+    ranked, total = await top(redis_client, key, offset, limit)
+    return LeaderboardPage(board=label, total=total, entries=await _entries(db, ranked))
+
+
+@router.get("/me", response_model=LeaderboardStanding)
+async def get_my_standing(
+    board: tuple[str, str] = Depends(resolve_board),
+    window: int = Query(5, ge=0, le=25, description="Players shown above and below you"),
+    user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis),
+):
+    """The current user's rank and score, with their neighbours on the board."""
+    label, key = board
+    rank, score, ranked, total = await around(redis_client, key, user.id, window)
+    return LeaderboardStanding(board=label, total=total, rank=rank, score=score, entries=await _entries(db, ranked))
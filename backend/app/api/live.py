@@ -0,0 +1,174 @@
+"""Live WebSockets – map changes for the tiles a client watches, and the hot/cold proximity stream."""
+
+import asyncio
+import json
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core import settings
+from app.core.database import async_session_factory
+from app.core.deps import get_current_user
+from app.core.redis import redis_client
+from app.models.user import User
+from app.services.live_map import RESYNC, Subscriber, channels_around, get_hub, tile_channel, user_claims_channel
+from app.services.notifications import record_position
+from app.services.proximity import PROXIMITY_WALKERS, Walker, get_proximity_index, load_claimed
+
+router = APIRouter()
+
+
+async def authenticate_websocket(websocket: WebSocket) -> Optional[User]:
+    """Resolve the user from `Authorization: Bearer …` or a `?token=` query parameter (browsers can't set headers)."""
+    token = websocket.query_params.get("token")
+    scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and credentials:
+        token = credentials
+    if not token:
+        return None
+
+    async with async_session_factory() as db:
+        try:
+            user = await get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token), db)
+            await db.commit()  # first sighting auto-creates the user
+        except HTTPException:
+            return None
+    return user if user.is_active else None
+
+
+def parse_position(message: dict) -> tuple[float, float]:
+    latitude, longitude = float(message["latitude"]), float(message["longitude"])
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError("coordinates out of range")
+    return latitude, longitude
+
+
+def requested_channels(message: dict) -> set[str]:
+    """
+    Channels for one client message:
+    `{"latitude": .., "longitude": ..}` watches the 3x3 tiles around a point,
+    `{"tiles": [[x, y], ...]}` watches explicit tiles at `live_map_zoom`.
+    """
+    if "tiles" in message:
+        n = 1 << settings.live_map_zoom
+        tiles = message["tiles"]
+        if not isinstance(tiles, list) or len(tiles) > settings.live_map_max_tiles:
+            raise ValueError(f"tiles must be a list of at most {settings.live_map_max_tiles} [x, y] pairs")
+        channels = set()
+        for tile in tiles:
+            x, y = (int(v) for v in tile)
+            if not (0 <= x < n and 0 <= y < n):
+                raise ValueError(f"tile {x}/{y} is outside zoom {settings.live_map_zoom}")
+            channels.add(tile_channel(x, y))
+        return channels
+
+    return channels_around(*parse_position(message))
+
+
+@router.websocket("/live")
+async def live_map(websocket: WebSocket):
+    """
+    Stream `location.*` events for the watched tiles instead of polling `/map/locations`.
+
+    Send a position (or explicit tiles) whenever the viewport moves. A
+    `{"type": "resync"}` message means events were dropped – refetch the map.
+    """
+    user = await authenticate_websocket(websocket)
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+
+    hub = get_hub()
+    subscriber = Subscriber(settings.live_map_queue_size)
+    hub.attach(subscriber)
+
+    async def forward() -> None:
+        while True:
+            await websocket.send_text(await subscriber.queue.get())
+
+    sender = asyncio.create_task(forward())
+    try:
+        while True:
+            raw = await websocket.receive_text()
+            try:
+                channels = requested_channels(json.loads(raw))
+            except (ValueError, TypeError, KeyError) as exc:
+                await websocket.send_json({"type": "error", "detail": str(exc) or "invalid message"})
+                continue
+            await hub.set_channels(subscriber, channels)
+            await websocket.send_json({"type": "subscribed", "tiles": len(channels)})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        await hub.detach(subscriber)
+
+
+@router.websocket("/proximity")
+async def proximity_stream(websocket: WebSocket):
+    """
+    Hot/cold guidance: send `{"latitude": .., "longitude": ..}` as often as the
+    GPS updates and get back distance, bearing and a hotter/colder signal for
+    the nearest unclaimed treasure. Answered from this worker's in-memory
+    snapshot; updates faster than `proximity_min_interval_ms` are ignored.
+    """
+    user = await authenticate_websocket(websocket)
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    proximity = get_proximity_index()
+    try:
+        await proximity.ensure_loaded()
+        async with async_session_factory() as db:
+            claimed = await load_claimed(db, user.id)
+    except Exception:
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+        raise
+    await websocket.accept()
+
+    walker = Walker(claimed)
+    hub = get_hub()
+    claims = Subscriber(maxsize=16)
+    hub.attach(claims)
+    await hub.set_channels(claims, {user_claims_channel(user.id)})
+
+    async def follow_claims() -> None:
+        while True:
+            message = await claims.queue.get()
+            if message == RESYNC:
+                async with async_session_factory() as db:
+                    walker.claimed = await load_claimed(db, user.id)
+            else:
+                walker.claimed.add(message)
+
+    follower = asyncio.create_task(follow_claims())
+    loop = asyncio.get_running_loop()
+    position_recorded = 0.0
+    PROXIMITY_WALKERS.inc()
+    try:
+        while True:
+            raw = await websocket.receive_text()
+            try:
+                latitude, longitude = parse_position(json.loads(raw))
+            except (ValueError, TypeError, KeyError) as exc:
+                await websocket.send_json({"type": "error", "detail": str(exc) or "invalid message"})
+                continue
+            now = loop.time()
+            if walker.throttled(now):
+                continue
+            if now - position_recorded >= settings.push_position_interval_seconds:
+                position_recorded = now
+                pipe = redis_client.pipeline(transaction=False)
+                record_position(pipe, user.id, latitude, longitude)
+                await pipe.execute()
+            # read the snapshot per update: the refresher swaps it in place
+            await websocket.send_json(walker.update(proximity.index, latitude, longitude))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        PROXIMITY_WALKERS.dec()
+        follower.cancel()
+        await hub.detach(claims)
@@ -2,14 +2,17 @@
 
 from typing import Optional
 
+import redis.asyncio as redis
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.deps import get_current_active_user
+from app.core.redis import get_redis
 from app.models.user import User
 from app.schemas.location import LocationWithDistance
 from app.services.location_service import get_nearby_locations
+from app.services.notifications import map_position_due, record_position
 
 router = APIRouter()
 
@@ -20,8 +23,9 @@ async def list_nearby_locations(
     longitude: float = Query(..., ge=-180, le=180),
     radius_km: float = Query(1000.0, ge=0.1, le=1000),
     city: Optional[str] = Query(None),
-    _user: User = Depends(get_current_active_user),
+    user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis),
 ):
     """
     Return active treasure locations near the given coordinates.
@@ -29,6 +33,12 @@ async def list_nearby_locations(
     """
     nearby = await get_nearby_locations(db, latitude, longitude, radius_km, city)
 
+    # last-known position for geo-targeted pushes (map polls are frequent; a stale-by-a-minute position is fine)
+    if map_position_due(user.id):
+        pipe = redis_client.pipeline(transaction=False)
+        record_position(pipe, user.id, latitude, longitude)
+        await pipe.execute()
+
     return [
         LocationWithDistance(
             id=item["location"].id,
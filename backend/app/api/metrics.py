@@ -0,0 +1,26 @@
+"""Prometheus scrape endpoint (mounted only when `metrics_token` is set)."""
+
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.core import settings
+from app.core.metrics import CONTENT_TYPE, render
+
+
+def require_scrape_token(authorization: Optional[str] = Header(None)) -> None:
+    """The metrics reveal routes, volumes and pool sizes: only the scraper holding the token may read them."""
+    expected = f"Bearer {settings.metrics_token}"
+    if not settings.metrics_token or not hmac.compare_digest((authorization or "").encode(), expected.encode()):
+        raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid metrics token", {"WWW-Authenticate": "Bearer"})
+
+
+router = APIRouter(tags=["metrics"], dependencies=[Depends(require_scrape_token)])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Process-local metrics in Prometheus text format (scrape every worker)."""
+    return PlainTextResponse(render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,70 @@
+"""Sponsor prize table endpoints – weighted outcomes for a reward template."""
+
+import uuid
+from typing import Sequence
+
+import redis.asyncio as aioredis
+from fastapi import APIRouter, Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.deps import get_sponsor_scope
+from app.core.redis import get_redis
+from app.models.reward_prize import RewardPrize
+from app.models.reward_template import RewardTemplate
+from app.schemas.prize import PrizeRead, PrizeTableRead, PrizeTableWrite
+from app.services.coupons import SOLD_OUT_KEY, ensure_sponsor_template
+from app.services.prizes import replace_prizes
+
+router = APIRouter()
+
+
+def _table(template: RewardTemplate, prizes: Sequence[RewardPrize]) -> PrizeTableRead:
+    total = sum(p.weight for p in prizes)
+    return PrizeTableRead(
+        reward_template_id=template.id,
+        version=template.prize_version,
+        has_prizes=template.has_prizes,
+        prizes=[
+            PrizeRead(
+                id=p.id, reward_type=p.reward_type, reward_value=p.reward_value,
+                reward_description=p.reward_description, weight=p.weight, stock=p.stock,
+                awarded=p.awarded, probability=p.weight / total,
+            )
+            for p in prizes
+        ],
+    )
+
+
+@router.get("/{template_id}", response_model=PrizeTableRead)
+async def prize_table(
+    template_id: uuid.UUID,
+    sponsor_id: uuid.UUID = Depends(get_sponsor_scope),
+    db: AsyncSession = Depends(get_db),
+):
+    """The template's prize table with each prize's odds and how many have been awarded."""
+    template = await ensure_sponsor_template(db, sponsor_id, template_id)
+    result = await db.execute(
+        select(RewardPrize).where(RewardPrize.reward_template_id == template_id).order_by(RewardPrize.weight.desc())
+    )
+    return _table(template, result.scalars().all())
+
+
+@router.put("/{template_id}", response_model=PrizeTableRead)
+async def update_prize_table(
+    template_id: uuid.UUID,
+    body: PrizeTableWrite,
+    sponsor_id: uuid.UUID = Depends(get_sponsor_scope),
+    db: AsyncSession = Depends(get_db),
+    redis_client: aioredis.Redis = Depends(get_redis),
+):
+    """
+    Replace the prize table, e.g. 1% product, 10% coupon, 89% points. Send an
+    existing prize's `id` to change it without resetting its awarded count;
+    prizes left out are removed. An empty list restores the fixed reward.
+    """
+    template = await ensure_sponsor_template(db, sponsor_id, template_id)
+    prizes = await replace_prizes(db, template, [p.model_dump() for p in body.prizes])
+    await redis_client.delete(SOLD_OUT_KEY.format(template_id))  # restocked: a later sell-out is news again
+    return _table(template, prizes)
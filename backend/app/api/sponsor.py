@@ -0,0 +1,118 @@
+"""Sponsor dashboard endpoints."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional
+
+import redis.asyncio as aioredis
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.dates import as_utc
+from app.core import settings
+from app.core.deps import get_sponsor_scope
+from app.core.redis import get_redis
+from app.schemas.analytics import AnalyticsBucket, HeatmapCell, HeatmapTileRead, SponsorAnalytics
+from app.services.analytics_service import get_sponsor_analytics
+from app.services.heatmap import GRID_SIZE, get_heatmap_tile
+from app.services.location_service import ensure_sponsor_location
+from app.services.unique_visitors import STANDARD_ERROR, count_unique
+
+router = APIRouter()
+
+MAX_BUCKETS = 2000
+BUCKET_SIZE = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+
+
+@router.get("/analytics", response_model=SponsorAnalytics)
+async def sponsor_analytics(
+    granularity: Literal["hour", "day"] = Query("day"),
+    start: Optional[datetime] = Query(None, description="Inclusive start (defaults to 30 days before end)"),
+    end: Optional[datetime] = Query(None, description="Exclusive end (defaults to now)"),
+    location_id: Optional[uuid.UUID] = Query(None),
+    sponsor_id: uuid.UUID = Depends(get_sponsor_scope),
+    db: AsyncSession = Depends(get_db),
+    redis_client: aioredis.Redis = Depends(get_redis),
+):
+    """
+    Claim and redemption totals per hour/day bucket for the sponsor's locations.
+
+    Served entirely from the pre-aggregated rollups, so the cost depends on
+    the number of buckets requested rather than the number of claims.
+    `unique_users` is a HyperLogLog estimate over the UTC days the range touches
+    (days past the Redis retention come from the Postgres snapshots).
+    """
+    end = as_utc(end) if end else datetime.now(timezone.utc)
+    start = as_utc(start) if start else end - timedelta(days=30)
+    if start >= end:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "start must be before end")
+    if (end - start) / BUCKET_SIZE[granularity] > MAX_BUCKETS:
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            f"Range too large for {granularity} buckets (max {MAX_BUCKETS})",
+        )
+    if location_id is not None:
+        await ensure_sponsor_location(db, sponsor_id, location_id)
+
+    rows = await get_sponsor_analytics(db, sponsor_id, granularity, start, end, location_id)
+    buckets = [AnalyticsBucket(**row) for row in rows]
+    total_claims = sum(b.claims for b in buckets)
+    total_redemptions = sum(b.redemptions for b in buckets)
+
+    unique_users = await count_unique(
+        redis_client,
+        "location" if location_id else "sponsor",
+        location_id or sponsor_id,
+        start.date(),
+        (end - timedelta(microseconds=1)).date(),
+        db,
+    )
+
+    return SponsorAnalytics(
+        sponsor_id=sponsor_id,
+        location_id=location_id,
+        granularity=granularity,
+        start=start,
+        end=end,
+        total_claims=total_claims,
+        total_redemptions=total_redemptions,
+        redemption_rate=total_redemptions / total_claims if total_claims else 0.0,
+        unique_users=unique_users,
+        unique_users_error=STANDARD_ERROR,
+        buckets=buckets,
+    )
+
+
+@router.get("/heatmap/{zoom}/{x}/{y}", response_model=HeatmapTileRead)
+async def sponsor_heatmap_tile(
+    zoom: int = Path(..., ge=0, le=22),
+    x: int = Path(..., ge=0),
+    y: int = Path(..., ge=0),
+    sponsor_id: uuid.UUID = Depends(get_sponsor_scope),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Pre-aggregated claim counts for one slippy-map tile of the sponsor's heatmap.
+
+    Only zoom levels listed in `heatmap_zoom_levels` are precomputed; tiles
+    without claims come back empty.
+    """
+    if zoom not in settings.heatmap_zoom_levels:
+        raise HTTPException(
+            status.HTTP_404_NOT_FOUND,
+            f"Zoom {zoom} is not precomputed (available: {settings.heatmap_zoom_levels})",
+        )
+    if x >= 1 << zoom or y >= 1 << zoom:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Tile out of range")
+
+    tile = await get_heatmap_tile(db, sponsor_id, zoom, x, y)
+    cells: list[HeatmapCell] = []
+    total = 0
+    if tile is not None:
+        grid, total = tile
+        for idx in grid.nonzero()[0]:
+            row, col = divmod(int(idx), GRID_SIZE)
+            cells.append(HeatmapCell(row=row, col=col, count=int(grid[idx])))
+
+    return HeatmapTileRead(zoom=zoom, x=x, y=y, grid_size=GRID_SIZE, total=total, cells=cells)
@@ -0,0 +1,68 @@
+"""Bulk loading helpers built on asyncpg's binary COPY protocol."""
+
+from __future__ import annotations
+
+from typing import Iterable, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def copy_records(
+    conn: AsyncConnection,
+    table: str,
+    columns: Sequence[str],
+    records: Iterable[Sequence],
+) -> None:
+    """
+    COPY `records` into `table` over the connection's underlying asyncpg driver.
+
+    Runs inside whatever transaction `conn` has open – make sure one has begun
+    (any `conn.execute` does) if the COPY must roll back with the rest.
+    """
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(table, records=list(records), columns=list(columns))
+
+
+async def copy_upsert(
+    conn: AsyncConnection,
+    table: str,
+    columns: Sequence[str],
+    records: Iterable[Sequence],
+    conflict_columns: Sequence[str],
+    update_columns: Optional[Sequence[str]] = None,
+) -> int:
+    """
+    Upsert `records` into `table` through a COPY-loaded temp staging table.
+
+    COPY cannot resolve conflicts itself, so rows land in a transaction-scoped
+    `_stage_<table>` first and are merged with one INSERT ... ON CONFLICT.
+    `update_columns=None` updates every non-conflict column; pass `[]` to
+    skip existing rows instead. Records sharing a conflict key are collapsed
+    to the last one first – one INSERT ... ON CONFLICT DO UPDATE cannot touch
+    a row twice. Returns the number of rows inserted or updated.
+    """
+    key = [list(columns).index(c) for c in conflict_columns]
+    records = {tuple(r[i] for i in key): r for r in records}.values()
+
+    stage = f"_stage_{table}"
+    await conn.execute(text(f"CREATE TEMP TABLE IF NOT EXISTS {stage} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"))
+    await conn.execute(text(f"TRUNCATE {stage}"))
+    await copy_records(conn, stage, columns, records)
+
+    if update_columns is None:
+        update_columns = [c for c in columns if c not in conflict_columns]
+    column_list = ", ".join(columns)
+    if update_columns:
+        assignments = ", ".join(f"{c} = EXCLUDED.{c}" for c in update_columns)
+        on_conflict = f"DO UPDATE SET {assignments}"
+    else:
+        on_conflict = "DO NOTHING"
+
+    result = await conn.execute(
+        text(
+            f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {stage} "
+            f"ON CONFLICT ({', '.join(conflict_columns)}) {on_conflict}"
+        )
+    )
+    return result.rowcount
@@ -1,7 +1,12 @@
+import asyncio
+
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core import settings
+from app.core.metrics import TimedQueuePool, instrument_engine
+from app.core.slow_queries import install_slow_query_log
+from app.core.tracing import span
 
 engine = create_async_engine(
     settings.database_url,
@@ -9,7 +14,10 @@ engine = create_async_engine(
     pool_pre_ping=True,
     pool_size=10,
     max_overflow=20,
+    poolclass=TimedQueuePool,
 )
+instrument_engine(engine)
+install_slow_query_log(engine)
 
 async_session_factory = async_sessionmaker(
     engine,
@@ -23,12 +31,22 @@ class Base(DeclarativeBase):
     pass
 
 
+async def warm_pool() -> None:
+    """Open `pool_size` connections up front so the first requests don't pay for connects."""
+    async def touch():
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql("SELECT 1")
+
+    await asyncio.gather(*(touch() for _ in range(engine.pool.size())))
+
+
 async def get_db() -> AsyncSession:  # type: ignore[misc]
     """FastAPI dependency that yields an async database session."""
     async with async_session_factory() as session:
         try:
             yield session
-            await session.commit()
+            with span("db.commit"):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
@@ -0,0 +1,10 @@
+"""Datetime helpers shared by the API and services."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+
+def as_utc(value: datetime) -> datetime:
+    """Normalise a (possibly naive) query datetime to UTC; naive values are taken as UTC."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
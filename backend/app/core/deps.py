@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
-from fastapi import Depends, HTTPException, status
+import uuid
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.security import verify_firebase_token
+from app.core.tracing import span
 from app.models.user import User
 
 bearer_scheme = HTTPBearer()
@@ -22,29 +26,31 @@ async def get_current_user(
     Verify the Firebase ID token from the Authorization header,
     find or auto-create the corresponding User row, and return it.
     """
-    decoded = verify_firebase_token(credentials.credentials)
-    firebase_uid: str = decoded["uid"]
-    email: str = decoded.get("email", "")
-    name: str = decoded.get("name", "")
-    picture: str = decoded.get("picture", "")
-
-    # Look up existing user
-    result = await db.execute(select(User).where(User.firebase_uid == firebase_uid))
-    user = result.scalar_one_or_none()
-
-    if user is None:
-        # Auto-create on first authenticated request
-        user = User(
-            firebase_uid=firebase_uid,
-            email=email,
-            display_name=name or email.split("@")[0],
-            avatar_url=picture,
-        )
-        db.add(user)
-        await db.flush()
-        await db.refresh(user)
+    with span("auth.get_current_user") as current:
+        decoded = await verify_firebase_token(credentials.credentials)
+        firebase_uid: str = decoded["uid"]
+        email: str = decoded.get("email", "")
+        name: str = decoded.get("name", "")
+        picture: str = decoded.get("picture", "")
 
-    return user
+        # Look up existing user
+        result = await db.execute(select(User).where(User.firebase_uid == firebase_uid))
+        user = result.scalar_one_or_none()
+
+        if user is None:
+            # Auto-create on first authenticated request
+            current.set_attribute("user.created", True)
+            user = User(
+                firebase_uid=firebase_uid,
+                email=email,
+                display_name=name or email.split("@")[0],
+                avatar_url=picture,
+            )
+            db.add(user)
+            await db.flush()
+            await db.refresh(user)
+
+        return user
 
 
 async def get_current_active_user(
@@ -57,3 +63,40 @@ async def get_current_active_user(
             detail="User account is deactivated",
         )
     return user
+
+
+async def get_current_sponsor_user(
+    user: User = Depends(get_current_active_user),
+) -> User:
+    """Restrict an endpoint to sponsor and admin accounts."""
+    if user.role not in ("sponsor", "admin"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Sponsor access required",
+        )
+    return user
+
+
+async def get_sponsor_scope(
+    sponsor_id: Optional[uuid.UUID] = Query(None, description="Sponsor to report on (admins only)"),
+    user: User = Depends(get_current_sponsor_user),
+) -> uuid.UUID:
+    """
+    Resolve which sponsor's data the caller may read.
+
+    Sponsor accounts are pinned to their own `sponsor_id`; admins must pass one.
+    """
+    if user.role == "admin":
+        if sponsor_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="sponsor_id is required for admin accounts",
+            )
+        return sponsor_id
+
+    if user.sponsor_id is None or (sponsor_id is not None and sponsor_id != user.sponsor_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed to access this sponsor",
+        )
+    return user.sponsor_id
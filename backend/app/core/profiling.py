@@ -0,0 +1,112 @@
+"""Opt-in cProfile capture for individual requests.
+
+A request is profiled when it carries a valid `X-Profile` token (see
+`sign_profile_token`) or is picked by `profile_sample_rate`. Each profile is
+written to `profile_dir` as `<request_id>.prof` (pstats) plus a
+`<request_id>.json` sidecar with the route, status and duration;
+`scripts/profile_report.py` aggregates them by route.
+
+The middleware is only installed when `profiling_enabled` is on, so
+deployments without it pay nothing. cProfile sees the whole thread, so
+coroutines from other requests that run while the profiled one awaits show
+up in its profile too; only one request is profiled at a time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import hashlib
+import hmac
+import json
+import random
+import re
+import time
+import uuid
+from pathlib import Path
+
+from app.core import settings
+from app.core.metrics import UNMATCHED_ROUTE
+
+PROFILE_HEADER = b"x-profile"
+REQUEST_ID_HEADER = b"x-request-id"
+SAFE_REQUEST_ID = re.compile(r"[A-Za-z0-9_-]{1,64}")  # caller-supplied ids become file names
+
+
+def _signature(expires: int) -> str:
+    return hmac.new(settings.secret_key.encode(), f"profile:{expires}".encode(), hashlib.sha256).hexdigest()
+
+
+def sign_profile_token(ttl_seconds: int = 3600) -> str:
+    """Header value that triggers profiling until it expires."""
+    expires = int(time.time()) + ttl_seconds
+    return f"{expires}.{_signature(expires)}"
+
+
+def verify_profile_token(token: str) -> bool:
+    expires, _, signature = token.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(signature, _signature(int(expires)))
+
+
+def _write_profile(directory: Path, profiler: cProfile.Profile, meta: dict) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(directory / f"{meta['request_id']}.prof")
+    (directory / f"{meta['request_id']}.json").write_text(json.dumps(meta))
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware profiling sampled or explicitly requested HTTP requests."""
+
+    def __init__(self, app):
+        self.app = app
+        self.directory = Path(settings.profile_dir)
+        self.active = False  # cProfile is per thread; profile one request at a time
+
+    def _wanted(self, scope) -> bool:
+        if self.active:
+            return False
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return verify_profile_token(value.decode("latin-1"))
+        return random.random() < settings.profile_sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = next(
+            (value.decode("latin-1") for name, value in scope["headers"] if name == REQUEST_ID_HEADER), ""
+        )
+        if not SAFE_REQUEST_ID.fullmatch(request_id):
+            request_id = uuid.uuid4().hex
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [*message.get("headers", []), (b"x-profile-id", request_id.encode())]
+            await send(message)
+
+        self.active = True
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            self.active = False
+            meta = {
+                "request_id": request_id,
+                "method": scope["method"],
+                "route": getattr(scope.get("route"), "path", UNMATCHED_ROUTE),
+                "path": scope["path"],
+                "status": status,
+                "duration_ms": (time.perf_counter() - started) * 1000,
+                "captured_at": time.time(),
+            }
+            await asyncio.to_thread(_write_profile, self.directory, profiler, meta)
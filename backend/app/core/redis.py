@@ -1,10 +1,21 @@
 """Redis client for caching and rate limiting."""
 
+import asyncio
+
 import redis.asyncio as redis
 
 from app.core import settings
+from app.core.metrics import InstrumentedRedis
+
+redis_client = InstrumentedRedis.from_url(settings.redis_url, decode_responses=True)
+
+# Separate client for binary payloads (e.g. raw HyperLogLog registers) that must not be utf-8 decoded
+redis_bytes_client = InstrumentedRedis.from_url(settings.redis_url)
+
 
-redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+async def warm_pool(connections: int = 10) -> None:
+    """Open `connections` Redis connections up front (concurrent PINGs each check one out)."""
+    await asyncio.gather(*(redis_client.ping() for _ in range(connections)))
 
 
 async def get_redis() -> redis.Redis:
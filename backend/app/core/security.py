@@ -1,18 +1,46 @@
-"""Firebase authentication utilities."""
+"""Firebase authentication utilities.
 
-import os
+`firebase_admin` (and the google-auth stack under it) costs ~170 ms to
+import, so it is imported on first use rather than with the app. The
+lifespan starts initialising it in a worker thread (`start_firebase_init`);
+requests await that same task, so one arriving early waits for it instead of
+initialising again on the event loop. A failed init is logged as it happens
+and retried by the next request.
+"""
+
+import asyncio
+import logging
+import threading
 from pathlib import Path
+from typing import Optional
 
-import firebase_admin
-from firebase_admin import auth as firebase_auth, credentials
 from fastapi import HTTPException, status
 
 from app.core import settings
+from app.core.tracing import span
+
+logger = logging.getLogger(__name__)
+
+STUB_TOKEN_PREFIX = "stub:"
+
+_init_lock = threading.Lock()
+_initialized = False
+_init_task: Optional[asyncio.Task] = None
 
 
 def init_firebase() -> None:
-    """Initialize the Firebase Admin SDK (idempotent)."""
-    if not firebase_admin._apps:
+    """Initialize the Firebase Admin SDK (idempotent, thread-safe)."""
+    global _initialized
+    if _initialized:
+        return
+
+    import firebase_admin
+    from firebase_admin import credentials
+
+    with _init_lock:
+        if firebase_admin._apps:
+            _initialized = True
+            return
         # Check if service account file exists
         cred_path = Path(settings.google_application_credentials)
         if not cred_path.is_absolute():
@@ -28,16 +56,56 @@ def init_firebase() -> None:
             cred = credentials.ApplicationDefault()
         
         firebase_admin.initialize_app(cred, {"projectId": settings.firebase_project_id})
+        _initialized = True
+
+
+def _log_init_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Firebase initialisation failed", exc_info=task.exception())
 
 
-def verify_firebase_token(id_token: str) -> dict:
+def start_firebase_init() -> asyncio.Task:
+    """
+    The process's Firebase init task, running `init_firebase` in a worker
+    thread. Started on first call (or again after a failed attempt); later
+    calls return the same task.
+    """
+    global _init_task
+    loop = asyncio.get_running_loop()
+    task = _init_task
+    if task is None or task.get_loop() is not loop or (task.done() and (task.cancelled() or task.exception())):
+        task = _init_task = loop.create_task(asyncio.to_thread(init_firebase))
+        task.add_done_callback(_log_init_failure)
+    return task
+
+
+async def verify_firebase_token(id_token: str) -> dict:
     """
     Verify a Firebase ID token and return the decoded claims.
 
     Raises HTTPException 401 on invalid / expired tokens.
+
+    With `debug` and `stub_auth_tokens` both on, `stub:<uid>` tokens are
+    accepted without Firebase so load tests can act as many users.
     """
+    if settings.debug and settings.stub_auth_tokens and id_token.startswith(STUB_TOKEN_PREFIX):
+        uid = id_token[len(STUB_TOKEN_PREFIX):]
+        return {"uid": uid, "email": f"{uid}@loadtest.invalid", "name": uid}
+
+    try:
+        # shielded: a cancelled request must not cancel the init other requests are waiting on
+        await asyncio.shield(start_firebase_init())
+    except Exception:  # already logged by the task
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is temporarily unavailable",
+        )
+
+    from firebase_admin import auth as firebase_auth
+
     try:
-        decoded = firebase_auth.verify_id_token(id_token)
+        with span("auth.verify_firebase_token"):
+            decoded = firebase_auth.verify_id_token(id_token)
         return decoded
     except firebase_auth.ExpiredIdTokenError:
         raise HTTPException(
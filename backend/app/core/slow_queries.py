@@ -0,0 +1,185 @@
+"""Slow-query log: statements over `slow_query_ms`, grouped by normalised SQL.
+
+Every statement is timed by engine events; slow ones are logged with the
+route that issued them and folded into an in-process table of offenders
+(served by `/debug/slow-queries` in debug mode). A `slow_query_explain_rate`
+fraction of slow read-only SELECTs is re-run in the background under
+`EXPLAIN (ANALYZE, BUFFERS)` and the latest plan is kept with its group.
+ANALYZE executes the statement, so anything that writes or takes row locks –
+data-modifying CTEs, `FOR UPDATE` / `FOR SHARE` – is never replayed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core import settings
+from app.core.metrics import current_route
+
+logger = logging.getLogger(__name__)
+
+MAX_GROUPS = 1000  # distinct normalised statements tracked per process
+MAX_ROUTES = 20  # routes remembered per statement
+SKIP_KEY = "slow_query_skip"  # conn.info flag on the EXPLAIN connection
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER = re.compile(r"\$\d+(?:::[\w\[\]]+)?")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_QUOTED = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"")
+# writes anywhere (e.g. WITH ... UPDATE), and every locking clause: FOR [NO KEY] UPDATE, FOR [KEY] SHARE
+_NOT_READ_ONLY = re.compile(r"\b(?:INSERT|UPDATE|DELETE|MERGE)\b|\bFOR\s+(?:KEY\s+)?SHARE\b", re.IGNORECASE)
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse literals, placeholders and IN-lists so equivalent statements group together."""
+    sql = _STRING.sub("?", statement)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _LIST.sub("(...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def fingerprint(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+@dataclass
+class SlowQuery:
+    fingerprint: str
+    sql: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    routes: dict[str, int] = field(default_factory=dict)
+    last_seen: Optional[datetime] = None
+    plan: Optional[list] = None  # EXPLAIN (FORMAT JSON) output of the latest sampled run
+    plan_ms: Optional[float] = None  # duration of the statement that was explained
+    plan_at: Optional[datetime] = None
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+SLOW_QUERIES: dict[str, SlowQuery] = {}
+
+
+def top_offenders(limit: int = 20, order_by: str = "total_ms") -> list[SlowQuery]:
+    key = {"total_ms": lambda q: q.total_ms, "count": lambda q: q.count, "max_ms": lambda q: q.max_ms,
+           "mean_ms": lambda q: q.mean_ms}[order_by]
+    return sorted(SLOW_QUERIES.values(), key=key, reverse=True)[:limit]
+
+
+def reset() -> None:
+    SLOW_QUERIES.clear()
+
+
+def record(statement: str, elapsed_ms: float, route: Optional[str]) -> SlowQuery:
+    """Fold one slow execution into its group."""
+    normalized = normalize_sql(statement)
+    fp = fingerprint(normalized)
+    entry = SLOW_QUERIES.get(fp)
+    if entry is None:
+        if len(SLOW_QUERIES) >= MAX_GROUPS:
+            # evict the group with the least total time to make room
+            del SLOW_QUERIES[min(SLOW_QUERIES.values(), key=lambda q: q.total_ms).fingerprint]
+        entry = SLOW_QUERIES[fp] = SlowQuery(fingerprint=fp, sql=normalized)
+    entry.count += 1
+    entry.total_ms += elapsed_ms
+    entry.max_ms = max(entry.max_ms, elapsed_ms)
+    entry.last_seen = datetime.now(timezone.utc)
+    route = route or "-"
+    if route in entry.routes or len(entry.routes) < MAX_ROUTES:
+        entry.routes[route] = entry.routes.get(route, 0) + 1
+    return entry
+
+
+# ---- EXPLAIN sampling ----
+
+_explaining: set[str] = set()  # fingerprints with an EXPLAIN in flight
+_tasks: set[asyncio.Task] = set()  # strong refs so pending EXPLAINs aren't garbage collected
+
+
+def is_read_only(statement: str) -> bool:
+    """Whether replaying `statement` under EXPLAIN ANALYZE can neither write nor lock rows."""
+    if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return False
+    return not _NOT_READ_ONLY.search(_QUOTED.sub("", statement))
+
+
+def _should_explain(statement: str, entry: SlowQuery) -> bool:
+    if settings.slow_query_explain_rate <= 0 or entry.fingerprint in _explaining:
+        return False
+    # ANALYZE executes the statement: never replay writes or locking reads
+    if not is_read_only(statement):
+        return False
+    return random.random() < settings.slow_query_explain_rate
+
+
+async def _explain(engine: AsyncEngine, entry: SlowQuery, statement: str, parameters, elapsed_ms: float) -> None:
+    try:
+        async with engine.connect() as conn:
+            conn.sync_connection.info[SKIP_KEY] = True
+            try:
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters
+                )
+                plan = result.scalar()
+            finally:
+                conn.sync_connection.info.pop(SKIP_KEY, None)
+                await conn.rollback()
+        entry.plan = json.loads(plan) if isinstance(plan, str) else plan
+        entry.plan_ms = elapsed_ms
+        entry.plan_at = datetime.now(timezone.utc)
+    except Exception:
+        logger.exception("EXPLAIN failed for slow query %s", entry.fingerprint)
+    finally:
+        _explaining.discard(entry.fingerprint)
+
+
+# ---- Engine events ----
+
+def install_slow_query_log(engine: AsyncEngine) -> None:
+    """Time every statement on `engine` and record those over `slow_query_ms`."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["slow_query_started"].pop()) * 1000
+        if elapsed_ms < settings.slow_query_ms or conn.info.get(SKIP_KEY):
+            return
+
+        route = current_route()
+        entry = record(statement, elapsed_ms, route)
+        logger.warning("Slow query %.1f ms [%s] route=%s: %s", elapsed_ms, entry.fingerprint, route or "-", entry.sql)
+
+        if not executemany and _should_explain(statement, entry):
+            _explaining.add(entry.fingerprint)
+            # events run in a greenlet on the event loop thread, so the loop is reachable here
+            task = asyncio.get_running_loop().create_task(_explain(engine, entry, statement, parameters, elapsed_ms))
+            _tasks.add(task)
+            task.add_done_callback(_tasks.discard)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(context):
+        started = context.connection.info.get("slow_query_started") if context.connection is not None else None
+        if started:
+            started.pop()
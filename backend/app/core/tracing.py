@@ -0,0 +1,347 @@
+"""Request tracing with W3C trace-context propagation.
+
+`TracingMiddleware` starts a server span per sampled request – continuing the
+caller's trace when a `traceparent` header is present, honouring its sampled
+flag – and `span()` opens child spans around the stages worth timing (auth,
+queries, Redis calls, commit). Outside a sampled trace `span()` returns a
+shared no-op, so unsampled requests pay a context-variable lookup per stage.
+
+Finished spans are queued and exported in batches by a background task
+(`start()` / `shutdown()` in the app lifespan): OTLP/HTTP JSON to a
+collector, JSON lines to a file, or an in-memory list for tests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import json
+import logging
+import os
+import random
+import re
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Optional
+
+from app.core import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_QUEUE = 2048  # finished spans buffered for export; the oldest are dropped beyond this
+MAX_BATCH = 512  # spans per export call
+EXPORT_INTERVAL = 5.0  # seconds between background flushes
+
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns", "attributes",
+                 "error", "_token")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], kind: int = KIND_INTERNAL,
+                 attributes: Optional[dict[str, Any]] = None):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = attributes or {}
+        self.error: Optional[str] = None
+        self._token: Optional[contextvars.Token] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end_ns = time.time_ns()
+        if exc is not None and self.error is None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+        if _processor is not None:
+            _processor.on_end(self)
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class _NoopSpan:
+    """Stands in for a span when the request isn't sampled."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+
+def span(name: str, **attributes: Any) -> Span | _NoopSpan:
+    """Child span of the current one, or the no-op when there is no sampled trace."""
+    parent = _current_span.get()
+    if parent is None:
+        return NOOP_SPAN
+    return Span(name, parent.trace_id, parent.span_id, attributes=attributes)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def traced(name: str):
+    """Decorator running an async function inside `span(name)`."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _otlp_attribute(key: str, value: Any) -> dict:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+# ---- Exporters ----
+
+def otlp_payload(spans: list[Span]) -> dict:
+    """OTLP/HTTP JSON `ExportTraceServiceRequest` for one batch."""
+    resource = [_otlp_attribute("service.name", settings.tracing_service_name)]
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": resource},
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": [s.to_otlp() for s in spans]}],
+        }]
+    }
+
+
+class InMemoryExporter:
+    def __init__(self):
+        self.spans: list[Span] = []
+
+    async def export(self, spans: list[Span]) -> None:
+        self.spans.extend(spans)
+
+    async def close(self) -> None:
+        pass
+
+
+class FileExporter:
+    """Appends one OTLP JSON span per line."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def _write(self, lines: str) -> None:
+        with self.path.open("a", encoding="utf-8") as fp:
+            fp.write(lines)
+
+    async def export(self, spans: list[Span]) -> None:
+        lines = "".join(json.dumps(s.to_otlp(), separators=(",", ":")) + "\n" for s in spans)
+        await asyncio.to_thread(self._write, lines)
+
+    async def close(self) -> None:
+        pass
+
+
+class OtlpHttpExporter:
+    """POSTs batches to an OTLP/HTTP collector endpoint (e.g. `http://collector:4318/v1/traces`)."""
+
+    def __init__(self, endpoint: str, timeout: float = 10.0):
+        import httpx  # only needed when exporting; keeps ~40 ms off every cold start
+
+        self.endpoint = endpoint
+        self.client = httpx.AsyncClient(timeout=timeout)
+
+    async def export(self, spans: list[Span]) -> None:
+        response = await self.client.post(self.endpoint, json=otlp_payload(spans))
+        response.raise_for_status()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def make_exporter(kind: str):
+    if kind == "otlp":
+        return OtlpHttpExporter(settings.tracing_otlp_endpoint)
+    if kind == "file":
+        return FileExporter(settings.tracing_file_path)
+    if kind == "memory":
+        return InMemoryExporter()
+    raise ValueError(f"Unknown tracing exporter: {kind}")
+
+
+# ---- Batch processor ----
+
+class BatchSpanProcessor:
+    """Queues finished spans and exports them from a background task."""
+
+    def __init__(self, exporter, max_queue: int = MAX_QUEUE, max_batch: int = MAX_BATCH,
+                 interval: float = EXPORT_INTERVAL):
+        self.exporter = exporter
+        self.queue: deque[Span] = deque(maxlen=max_queue)
+        self.max_batch = max_batch
+        self.interval = interval
+        self.dropped = 0
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def on_end(self, finished: Span) -> None:
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        self.queue.append(finished)
+        if self._wake is not None and len(self.queue) >= self.max_batch:
+            self._wake.set()
+
+    async def flush(self) -> None:
+        while self.queue:
+            batch = [self.queue.popleft() for _ in range(min(len(self.queue), self.max_batch))]
+            try:
+                await self.exporter.export(batch)
+            except Exception:
+                logger.exception("Dropped %d spans: export failed", len(batch))
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+        await self.exporter.close()
+
+
+_processor: Optional[BatchSpanProcessor] = None
+
+
+def configure(exporter) -> BatchSpanProcessor:
+    """Route finished spans to `exporter` (replacing any previous processor)."""
+    global _processor
+    _processor = BatchSpanProcessor(exporter)
+    return _processor
+
+
+async def start() -> None:
+    """Lifespan hook: build the configured exporter and start background export."""
+    configure(make_exporter(settings.tracing_exporter)).start()
+
+
+async def shutdown() -> None:
+    global _processor
+    if _processor is not None:
+        await _processor.shutdown()
+        _processor = None
+
+
+# ---- Middleware ----
+
+def parse_traceparent(value: str) -> Optional[tuple[str, str, bool]]:
+    """`(trace_id, parent_span_id, sampled)` from a W3C `traceparent`, or None if malformed."""
+    match = TRACEPARENT.match(value.strip().lower())
+    if match is None:
+        return None
+    trace_id, parent_id, flags = match.groups()
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    return trace_id, parent_id, bool(int(flags, 16) & 0x01)
+
+
+class TracingMiddleware:
+    """Pure ASGI middleware opening the server span for sampled requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        parent = None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                parent = parse_traceparent(value.decode("latin-1"))
+                break
+        if parent is not None:
+            trace_id, parent_id, sampled = parent
+        else:
+            trace_id, parent_id = os.urandom(16).hex(), None
+            sampled = random.random() < settings.tracing_sample_rate
+        if not sampled:
+            await self.app(scope, receive, send)
+            return
+
+        server_span = Span(scope["method"], trace_id, parent_id, kind=KIND_SERVER,
+                           attributes={"http.method": scope["method"], "http.target": scope["path"]})
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                server_span.set_attribute("http.status_code", message["status"])
+                if message["status"] >= 500:
+                    server_span.error = f"HTTP {message['status']}"
+                message["headers"] = [*message.get("headers", []), (b"traceparent", server_span.traceparent.encode())]
+            await send(message)
+
+        with server_span:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route is not None:
+                    server_span.name = f"{scope['method']} {route}"
+                    server_span.set_attribute("http.route", route)
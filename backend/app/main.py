@@ -1,22 +1,46 @@
 """HotNCold – FastAPI application factory."""
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.core import settings
-from app.core.security import init_firebase
-from app.api import health, users, locations, claims, rewards
+from app.core import settings, database, redis
+from app.core.metrics import MetricsMiddleware
+from app.core.profiling import ProfilingMiddleware
+from app.core import tracing
+from app.core.security import start_firebase_init
+from app.services.live_map import close_hub
+from app.services.proximity import close_proximity_index
+from app.api import (
+    debug, health, metrics, users, locations, live, claims, rewards, leaderboards, sponsor, exports, coupons,
+    prizes,
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup / shutdown lifecycle."""
     # Startup
-    init_firebase()
+    # credential discovery may hit the filesystem or metadata server: keep it off the event loop
+    # (requests await the same task; a failure is logged when it happens)
+    app.state.firebase_ready = start_firebase_init()
+    if settings.tracing_enabled:
+        await tracing.start()
+    if settings.warm_pools:
+        try:
+            await asyncio.wait_for(asyncio.gather(database.warm_pool(), redis.warm_pool()), timeout=10)
+        except Exception as exc:  # a cold pool is slower, not fatal – connects are retried per request
+            print(f"⚠️  Could not warm connection pools: {exc}")
     yield
-    # Shutdown (cleanup if needed)
+    # Shutdown – runs after the server has drained in-flight requests
+    await close_proximity_index()
+    await close_hub()
+    await tracing.shutdown()
+    await database.engine.dispose()
+    await redis.redis_client.aclose()
+    await redis.redis_bytes_client.aclose()
 
 
 def create_app() -> FastAPI:
@@ -35,13 +59,29 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    if settings.profiling_enabled:
+        application.add_middleware(ProfilingMiddleware)
+    if settings.tracing_enabled:
+        application.add_middleware(tracing.TracingMiddleware)
+    if settings.metrics_enabled:
+        application.add_middleware(MetricsMiddleware)
 
     # Routers
     application.include_router(health.router)
+    if settings.metrics_enabled and settings.metrics_token:
+        application.include_router(metrics.router)
     application.include_router(users.router, prefix="/users", tags=["users"])
     application.include_router(locations.router, prefix="/map", tags=["map"])
+    application.include_router(live.router, prefix="/map", tags=["map"])
     application.include_router(claims.router, prefix="/locations", tags=["claims"])
     application.include_router(rewards.router, prefix="/users/me/rewards", tags=["rewards"])
+    application.include_router(leaderboards.router, prefix="/leaderboards", tags=["leaderboards"])
+    application.include_router(sponsor.router, prefix="/sponsor", tags=["sponsor"])
+    application.include_router(exports.router, prefix="/sponsor/exports", tags=["sponsor"])
+    application.include_router(coupons.router, prefix="/sponsor/coupons", tags=["sponsor"])
+    application.include_router(prizes.router, prefix="/sponsor/prizes", tags=["sponsor"])
+    if settings.debug:
+        application.include_router(debug.router, prefix="/debug", tags=["debug"])
 
     return application
 
@@ -7,5 +7,16 @@ from app.models.location import Location
 from app.models.reward_template import RewardTemplate
 from app.models.claim_log import ClaimLog
 from app.models.reward import Reward
+from app.models.claim_rollup import ClaimRollup
+from app.models.rollup_watermark import RollupWatermark
+from app.models.unique_visitor_snapshot import UniqueVisitorSnapshot
+from app.models.heatmap_tile import HeatmapTile
+from app.models.fraud_review import FraudReview
+from app.models.coupon_code import CouponCode
+from app.models.reward_prize import RewardPrize
 
-__all__ = ["Base", "User", "Sponsor", "Location", "RewardTemplate", "ClaimLog", "Reward"]
+__all__ = [
+    "Base", "User", "Sponsor", "Location", "RewardTemplate", "ClaimLog", "Reward",
+    "ClaimRollup", "RollupWatermark", "UniqueVisitorSnapshot", "HeatmapTile",
+    "FraudReview", "CouponCode", "RewardPrize",
+]
@@ -6,6 +6,7 @@ from datetime import datetime
 from sqlalchemy import DateTime, Float, ForeignKey, String, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from uuid_extensions import uuid7
 
 from app.models.base import Base
 
@@ -14,7 +15,8 @@ class ClaimLog(Base):
     """Log of reward claims to prevent duplicate claims."""
     __tablename__ = "claim_logs"
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # UUIDv7 keys are time-ordered, so inserts land on the right edge of the PK index
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
     )
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, func, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ClaimRollup(Base):
+    """Pre-aggregated claim and redemption counts per location and hour/day bucket (UTC)."""
+    __tablename__ = "claim_rollups"
+    __table_args__ = (
+        Index("ix_claim_rollups_sponsor_bucket", "sponsor_id", "granularity", "bucket_start"),
+    )
+
+    granularity: Mapped[str] = mapped_column(String(5), primary_key=True)  # hour | day
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    location_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("locations.id"), primary_key=True
+    )
+    sponsor_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("sponsors.id"), nullable=True
+    )
+    claims: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # rewards won by this bucket's claims that have been redeemed so far (redemptions / claims = redemption rate)
+    redemptions: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    first_claim_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_claim_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self) -> str:
+        return f"<ClaimRollup {self.granularity} {self.bucket_start} location={self.location_id} claims={self.claims}>"
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Identity, Index, String, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class CouponCode(Base):
+    """One single-use coupon code in a reward template's pool."""
+    __tablename__ = "coupon_codes"
+    __table_args__ = (
+        UniqueConstraint("reward_template_id", "code", name="uq_coupon_codes_template_code"),
+        # the hand-out queue: only unissued codes, in load order
+        Index("ix_coupon_codes_available", "reward_template_id", "id", postgresql_where=text("reward_id IS NULL")),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    reward_template_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("reward_templates.id"), nullable=False
+    )
+    code: Mapped[str] = mapped_column(String(64), nullable=False)
+    reward_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("rewards.id"), nullable=True, unique=True
+    )
+    issued_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    redeemed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<CouponCode {self.code} template={self.reward_template_id} reward={self.reward_id}>"
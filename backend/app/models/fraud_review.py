@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey, Index, String, func
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class FraudReview(Base):
+    """A user flagged by the offline claim audit for one reason, awaiting (or after) human review."""
+    __tablename__ = "fraud_reviews"
+    __table_args__ = (
+        Index("ix_fraud_reviews_status_score", "status", "score"),
+    )
+
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    reason: Mapped[str] = mapped_column(String(32), primary_key=True)  # exact_coordinates | shared_coordinates | ...
+    score: Mapped[float] = mapped_column(Float, nullable=False)  # higher is more suspicious; comparable per reason
+    claim_ids: Mapped[list[uuid.UUID]] = mapped_column(ARRAY(UUID(as_uuid=True)), nullable=False)  # sample of offending claims
+    details: Mapped[dict] = mapped_column(JSONB, nullable=False)  # the user's audit features
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="open")  # open | dismissed | confirmed
+    first_flagged_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    audited_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<FraudReview user={self.user_id} {self.reason} score={self.score:.2f} {self.status}>"
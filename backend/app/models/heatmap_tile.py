@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, LargeBinary, SmallInteger, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class HeatmapTile(Base):
+    """Claim counts for one slippy-map tile, binned into a fixed cell grid."""
+    __tablename__ = "heatmap_tiles"
+
+    sponsor_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("sponsors.id"), primary_key=True
+    )
+    zoom: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    x: Mapped[int] = mapped_column(Integer, primary_key=True)
+    y: Mapped[int] = mapped_column(Integer, primary_key=True)
+    counts: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)  # zlib(uint32[GRID_SIZE * GRID_SIZE])
+    total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<HeatmapTile sponsor={self.sponsor_id} {self.zoom}/{self.x}/{self.y} total={self.total}>"
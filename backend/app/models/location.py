@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, String, func
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, String, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -13,6 +13,12 @@ from app.models.base import Base
 
 class Location(Base):
     __tablename__ = "locations"
+    __table_args__ = (
+        # nearby / map queries filter on is_active (the campaign scheduler keeps it current), so index only those
+        Index("ix_locations_active_city", "city", postgresql_where=text("is_active")),
+        # the nearby query's lat/lon box
+        Index("ix_locations_active_lat_lon", "latitude", "longitude", postgresql_where=text("is_active")),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     sponsor_id: Mapped[Optional[uuid.UUID]] = mapped_column(
@@ -4,17 +4,22 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from uuid_extensions import uuid7
 
 from app.models.base import Base
 
 
 class Reward(Base):
     __tablename__ = "rewards"
+    __table_args__ = (
+        # the analytics refresh folds in the rewards redeemed since its watermark
+        Index("ix_rewards_redeemed_at", "redeemed_at", postgresql_where=text("redeemed_at IS NOT NULL")),
+    )
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
     )
@@ -28,6 +33,8 @@ class Reward(Base):
         UUID(as_uuid=True), ForeignKey("locations.id"), nullable=True
     )
     redeemed: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    code: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # coupon code from the template's pool
+    redeemed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
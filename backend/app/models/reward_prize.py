@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import uuid
+from typing import Optional
+
+from sqlalchemy import Float, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class RewardPrize(Base):
+    """One weighted outcome of a reward template's prize table."""
+    __tablename__ = "reward_prizes"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    reward_template_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("reward_templates.id"), nullable=False, index=True
+    )
+    # same fields as a fixed template, so a drawn prize is awarded exactly like one
+    reward_type: Mapped[str] = mapped_column(String(20), nullable=False)  # points | coupon | raffle | product
+    reward_value: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    reward_description: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    weight: Mapped[float] = mapped_column(Float, nullable=False)  # relative; need not sum to anything
+    stock: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # NULL = unlimited
+    awarded: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    @property
+    def in_stock(self) -> bool:
+        return self.stock is None or self.awarded < self.stock
+
+    def __repr__(self) -> str:
+        return f"<RewardPrize {self.reward_type}={self.reward_value} weight={self.weight} template={self.reward_template_id}>"
@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, String, func
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, String, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -14,6 +14,13 @@ from app.models.base import Base
 class RewardTemplate(Base):
     """Template for rewards that can be claimed at a location."""
     __tablename__ = "reward_templates"
+    __table_args__ = (
+        # the claim path's template lookup only ever wants the active one
+        Index("ix_reward_templates_active_location", "location_id", postgresql_where=text("is_active")),
+        # the campaign scheduler's boundary scans touch only windowed templates
+        Index("ix_reward_templates_starts_at", "starts_at", postgresql_where=text("starts_at IS NOT NULL")),
+        Index("ix_reward_templates_ends_at", "ends_at", postgresql_where=text("ends_at IS NOT NULL")),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     location_id: Mapped[uuid.UUID] = mapped_column(
@@ -26,10 +33,24 @@ class RewardTemplate(Base):
     bearing_degrees: Mapped[float] = mapped_column(Float, nullable=False, default=45.0)
     elevation_degrees: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    # coupon rewards hand out codes from coupon_codes once a pool has been loaded (and fail when it runs dry)
+    coupon_pool: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default=text("false"))
+    # False: award the fixed reward above. True: draw a prize from reward_prizes instead.
+    has_prizes: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default=text("false"))
+    # bumped (never reset) on every edit of the prize table so cached alias tables know to rebuild
+    prize_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    # Campaign window: the scheduler (app.tasks.campaigns) flips is_active, on the template and its location,
+    # when these pass. NULL means open-ended.
+    starts_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    ends_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     location = relationship("Location", back_populates="reward_template", lazy="selectin")
 
+    def in_window(self, at: datetime) -> bool:
+        """Whether `at` falls inside the campaign window (templates without one always do)."""
+        return (self.starts_at is None or self.starts_at <= at) and (self.ends_at is None or at < self.ends_at)
+
     def __repr__(self) -> str:
         return f"<RewardTemplate {self.reward_type}={self.reward_value} for location={self.location_id} at {self.bearing_degrees}°>"
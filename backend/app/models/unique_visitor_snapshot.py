@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Integer, LargeBinary, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class UniqueVisitorSnapshot(Base):
+    """Persisted copy of a daily HyperLogLog unique-visitor counter from Redis."""
+    __tablename__ = "unique_visitor_snapshots"
+
+    scope: Mapped[str] = mapped_column(String(20), primary_key=True)  # location | sponsor | template
+    scope_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    estimate: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    registers: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)  # raw Redis HLL value
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<UniqueVisitorSnapshot {self.scope}={self.scope_id} {self.day} ~{self.estimate}>"
@@ -3,6 +3,13 @@ from app.schemas.location import LocationBase, LocationCreate, LocationRead, Loc
 from app.schemas.reward_template import RewardTemplateBase, RewardTemplateCreate, RewardTemplateRead
 from app.schemas.claim import ClaimRequest, ClaimResponse
 from app.schemas.reward import RewardRead, RewardSummary
+from app.schemas.analytics import AnalyticsBucket, HeatmapCell, HeatmapTileRead, SponsorAnalytics
+from app.schemas.debug import SlowQueryRead
+from app.schemas.leaderboard import LeaderboardEntry, LeaderboardPage, LeaderboardStanding
+from app.schemas.coupon import (
+    CouponGenerateRequest, CouponLoadResult, CouponPoolStats, CouponRedeemRequest, CouponRedemption,
+)
+from app.schemas.prize import PrizeRead, PrizeTableRead, PrizeTableWrite, PrizeWrite
 
 __all__ = [
     "UserBase", "UserRead", "UserUpdate", "UserStats",
@@ -10,4 +17,9 @@ __all__ = [
     "RewardTemplateBase", "RewardTemplateCreate", "RewardTemplateRead",
     "ClaimRequest", "ClaimResponse",
     "RewardRead", "RewardSummary",
+    "AnalyticsBucket", "SponsorAnalytics", "HeatmapCell", "HeatmapTileRead",
+    "SlowQueryRead",
+    "LeaderboardEntry", "LeaderboardPage", "LeaderboardStanding",
+    "CouponGenerateRequest", "CouponLoadResult", "CouponPoolStats", "CouponRedeemRequest", "CouponRedemption",
+    "PrizeRead", "PrizeTableRead", "PrizeTableWrite", "PrizeWrite",
 ]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+
+class AnalyticsBucket(BaseModel):
+    """Claim totals for one hour/day bucket."""
+    bucket_start: datetime
+    claims: int
+    redemptions: int  # rewards from these claims redeemed so far
+    active_locations: int
+    first_claim_at: datetime
+    last_claim_at: datetime
+
+
+class SponsorAnalytics(BaseModel):
+    sponsor_id: uuid.UUID
+    location_id: Optional[uuid.UUID]
+    granularity: Literal["hour", "day"]
+    start: datetime
+    end: datetime
+    total_claims: int
+    total_redemptions: int
+    redemption_rate: float  # total_redemptions / total_claims (0 without claims)
+    unique_users: int
+    unique_users_error: float  # relative standard error of the HyperLogLog estimate
+    buckets: list[AnalyticsBucket]
+
+
+class HeatmapCell(BaseModel):
+    row: int  # 0 = north edge of the tile
+    col: int  # 0 = west edge of the tile
+    count: int
+
+
+class HeatmapTileRead(BaseModel):
+    """Sparse claim-count grid for one slippy-map tile."""
+    zoom: int
+    x: int
+    y: int
+    grid_size: int
+    total: int
+    cells: list[HeatmapCell]
@@ -21,3 +21,4 @@ class ClaimResponse(BaseModel):
     total_points: int
     location_id: uuid.UUID
     location_name: str
+    coupon_code: Optional[str] = None  # the issued code, for coupon rewards backed by a pool
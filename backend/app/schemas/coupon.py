@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class CouponPoolStats(BaseModel):
+    reward_template_id: uuid.UUID
+    total: int
+    issued: int
+    redeemed: int
+    available: int
+
+
+class CouponLoadResult(BaseModel):
+    loaded: int  # new codes (duplicates are skipped)
+    pool: CouponPoolStats
+
+
+class CouponGenerateRequest(BaseModel):
+    count: int = Field(..., ge=1, le=5_000_000)
+    length: int = Field(12, ge=8, le=32)
+    prefix: str = Field("", max_length=16, pattern=r"^[A-Za-z0-9-]*$")
+
+
+class CouponRedeemRequest(BaseModel):
+    reward_template_id: uuid.UUID
+    code: str = Field(..., min_length=1, max_length=64)
+
+
+class CouponRedemption(BaseModel):
+    code: str
+    reward_id: uuid.UUID
+    redeemed_at: datetime
+    already_redeemed: bool  # True when the code had been redeemed before this request
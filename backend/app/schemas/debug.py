@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class SlowQueryRead(BaseModel):
+    """One normalised statement from the slow-query log."""
+    model_config = ConfigDict(from_attributes=True)
+
+    fingerprint: str
+    sql: str
+    count: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    routes: dict[str, int]
+    last_seen: Optional[datetime]
+    plan: Optional[list] = None
+    plan_ms: Optional[float] = None
+    plan_at: Optional[datetime] = None
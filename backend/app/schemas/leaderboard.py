@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import uuid
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    user_id: uuid.UUID
+    display_name: str
+    avatar_url: Optional[str] = None
+    score: int
+
+
+class LeaderboardPage(BaseModel):
+    board: str  # "global", "city:<city>" or "season:<season>"
+    total: int  # players on the board
+    entries: list[LeaderboardEntry]
+
+
+class LeaderboardStanding(BaseModel):
+    board: str
+    total: int
+    rank: Optional[int]  # None until the player scores on this board
+    score: int
+    entries: list[LeaderboardEntry]  # the player and their neighbours
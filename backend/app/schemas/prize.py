@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import uuid
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class PrizeBase(BaseModel):
+    reward_type: str = Field(..., max_length=20, description="points | coupon | raffle | product")
+    reward_value: int = Field(..., ge=0)
+    reward_description: Optional[str] = Field(None, max_length=500)
+    weight: float = Field(..., gt=0, description="Relative odds; weights need not sum to anything")
+    stock: Optional[int] = Field(None, ge=0, description="Most times it can be drawn (unlimited if omitted)")
+
+
+class PrizeWrite(PrizeBase):
+    id: Optional[uuid.UUID] = Field(None, description="An existing prize to update in place (keeps its count)")
+
+
+class PrizeRead(PrizeBase):
+    id: uuid.UUID
+    awarded: int
+    probability: float  # share of draws while every prize is in stock
+
+
+class PrizeTableWrite(BaseModel):
+    prizes: list[PrizeWrite] = Field(..., max_length=1000, description="Empty to go back to the fixed reward")
+
+
+class PrizeTableRead(BaseModel):
+    reward_template_id: uuid.UUID
+    version: int
+    has_prizes: bool  # False while the template awards its fixed reward
+    prizes: list[PrizeRead]
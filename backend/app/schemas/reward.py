@@ -15,6 +15,8 @@ class RewardRead(BaseModel):
     reward_template_id: Optional[uuid.UUID]
     location_id: Optional[uuid.UUID]
     redeemed: bool
+    code: Optional[str] = None
+    redeemed_at: Optional[datetime] = None
     created_at: datetime
 
     model_config = {"from_attributes": True}
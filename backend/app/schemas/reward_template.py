@@ -1,22 +1,51 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from app.core.dates import as_utc
 
 
 class RewardTemplateBase(BaseModel):
     reward_type: str = Field(..., max_length=20, description="points | coupon | raffle | product")
     reward_value: int = Field(..., ge=0)
     reward_description: Optional[str] = Field(None, max_length=500)
+    bearing_degrees: float = Field(45.0, ge=0, le=360, description="AR bearing in degrees (0-360)")
+    elevation_degrees: float = Field(0.0, ge=-90, le=90, description="AR elevation in degrees (-90 to +90)")
     is_active: bool = True
+    starts_at: Optional[datetime] = Field(None, description="Campaign window start (open-ended if omitted)")
+    ends_at: Optional[datetime] = Field(None, description="Campaign window end (open-ended if omitted)")
+
+    @field_validator("starts_at", "ends_at")
+    @classmethod
+    def window_in_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # naive times are taken as UTC, so they compare with the aware ones from the database
+        return as_utc(value) if value is not None else None
+
+    def in_window(self, at: datetime) -> bool:
+        """Whether `at` falls inside the campaign window (same rule as `RewardTemplate.in_window`)."""
+        return (self.starts_at is None or self.starts_at <= at) and (self.ends_at is None or at < self.ends_at)
+
+    @model_validator(mode="after")
+    def check_window(self):
+        if self.starts_at and self.ends_at and self.ends_at <= self.starts_at:
+            raise ValueError("ends_at must be after starts_at")
+        return self
 
 
 class RewardTemplateCreate(RewardTemplateBase):
     location_id: uuid.UUID
 
+    @model_validator(mode="after")
+    def inactive_outside_window(self):
+        # the campaign scheduler activates it when the window opens; it never revisits a window already closed
+        if not self.in_window(datetime.now(timezone.utc)):
+            self.is_active = False
+        return self
+
 
 class RewardTemplateRead(RewardTemplateBase):
     id: uuid.UUID
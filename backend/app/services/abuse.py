@@ -0,0 +1,169 @@
+"""Claim rate limits and online abuse checks, evaluated in one Redis round trip.
+
+`check_claim` runs a Lua script that does, atomically and in order:
+
+1. the per-user cooldown, hourly and daily limits (`scan_*` / `max_*` settings);
+2. impossible travel – the speed implied by this claim and the user's last
+   successful claim, and again against the device's last claim (any
+   account), above `abuse_max_speed_kmh`. Jumps shorter than
+   `abuse_min_distance_m` never count, so GPS jitter between neighbouring
+   treasures does not trip it;
+3. device sharing – a device fingerprint already used by
+   `abuse_max_users_per_device` other accounts.
+
+The script only reads. `record_claim` queues the state updates (last
+positions, the device's account set) on the claim's success pipeline, so a
+rejected claim never moves the "last seen" point. Each check is a handful of
+O(1) key lookups whatever the history length.
+
+Rate-limit failures always reject. Travel and device verdicts reject or –
+with `abuse_action = "flag"` – let the claim through and append it to the
+`abuse:flags` stream for review.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+import redis.asyncio as redis
+from redis.exceptions import NoScriptError
+
+from app.core import settings
+from app.core.metrics import Counter
+
+FLAGS_KEY = "abuse:flags"
+FLAGS_MAX = 100_000  # flagged claims kept in the review stream
+RATE_LIMITS = ("cooldown", "hourly", "daily")
+ABUSE_REASONS = ("travel", "device_travel", "device_shared")
+
+CLAIM_ABUSE = Counter("claim_abuse_total", "Claims caught by the abuse checks.", ("reason", "action"))
+
+# KEYS: cooldown, hourly, daily, user last claim, device last claim, device accounts
+# ARGV: max hourly, max daily, now, lat, lon, max speed (m/s), min distance (m), user id,
+#       max accounts per device, has device (1/0)
+# Returns {reason, detail} – reason "ok" when every check passes. Lua numbers come back as
+# integers, so fractional details are returned as strings.
+GUARD_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return {'cooldown', tostring(redis.call('TTL', KEYS[1]))}
+end
+local hourly = tonumber(redis.call('GET', KEYS[2]) or '0')
+if hourly >= tonumber(ARGV[1]) then return {'hourly', tostring(hourly)} end
+local daily = tonumber(redis.call('GET', KEYS[3]) or '0')
+if daily >= tonumber(ARGV[2]) then return {'daily', tostring(daily)} end
+
+local now, lat, lon = tonumber(ARGV[3]), tonumber(ARGV[4]), tonumber(ARGV[5])
+local max_speed, min_distance = tonumber(ARGV[6]), tonumber(ARGV[7])
+
+local function speed_from(key)
+    local last = redis.call('HMGET', key, 'lat', 'lon', 'at')
+    if not last[3] then return nil end
+    local lat0, lon0 = math.rad(tonumber(last[1])), math.rad(tonumber(last[2]))
+    local lat1, lon1 = math.rad(lat), math.rad(lon)
+    local a = math.sin((lat1 - lat0) / 2) ^ 2
+        + math.cos(lat0) * math.cos(lat1) * math.sin((lon1 - lon0) / 2) ^ 2
+    local meters = 2 * 6371000 * math.asin(math.min(1, math.sqrt(a)))
+    if meters < min_distance then return nil end
+    local speed = meters / math.max(now - tonumber(last[3]), 1)
+    if speed > max_speed then return speed end
+    return nil
+end
+
+local speed = speed_from(KEYS[4])
+if speed then return {'travel', tostring(speed * 3.6)} end
+if ARGV[10] == '1' then
+    speed = speed_from(KEYS[5])
+    if speed then return {'device_travel', tostring(speed * 3.6)} end
+    if redis.call('SISMEMBER', KEYS[6], ARGV[8]) == 0 then
+        local accounts = redis.call('SCARD', KEYS[6])
+        if accounts >= tonumber(ARGV[9]) then return {'device_shared', tostring(accounts)} end
+    end
+end
+return {'ok', '0'}
+"""
+GUARD_SHA = hashlib.sha1(GUARD_SCRIPT.encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class Verdict:
+    reason: str  # "ok", one of RATE_LIMITS or one of ABUSE_REASONS
+    detail: float  # seconds left / count reached / implied km/h / accounts on the device
+
+    @property
+    def ok(self) -> bool:
+        return self.reason == "ok"
+
+
+def rate_keys(user_id: uuid.UUID, now: float) -> tuple[str, str, str]:
+    """(cooldown, hourly, daily) counter keys for a user."""
+    day = time.strftime("%Y-%m-%d", time.gmtime(now))
+    return f"claim_cooldown:{user_id}", f"claim_rate:{user_id}", f"claim_daily:{user_id}:{day}"
+
+
+def device_key(device_id: str) -> str:
+    # fingerprints can be 500 characters; key on a digest
+    return f"abuse:device:{hashlib.sha1(device_id.encode()).hexdigest()}"
+
+
+def user_key(user_id: uuid.UUID) -> str:
+    return f"abuse:user:{user_id}"
+
+
+async def check_claim(redis_client: redis.Redis, user_id: uuid.UUID, device_id: Optional[str],
+                      latitude: float, longitude: float, now: Optional[float] = None) -> Verdict:
+    """Run every rate-limit and abuse check for a claim in one round trip."""
+    now = now if now is not None else time.time()
+    device = device_key(device_id) if device_id else "abuse:device:-"
+    keys = (*rate_keys(user_id, now), user_key(user_id), device, f"{device}:users")
+    args = (
+        settings.max_scans_per_hour, settings.max_daily_scans, now, latitude, longitude,
+        settings.abuse_max_speed_kmh / 3.6, settings.abuse_min_distance_m, str(user_id),
+        settings.abuse_max_users_per_device, 1 if device_id else 0,
+    )
+    try:
+        reason, detail = await redis_client.evalsha(GUARD_SHA, len(keys), *keys, *args)
+    except NoScriptError:
+        reason, detail = await redis_client.eval(GUARD_SCRIPT, len(keys), *keys, *args)
+    return Verdict(reason, float(detail))
+
+
+def record_claim(pipe: redis.client.Pipeline, user_id: uuid.UUID, device_id: Optional[str],
+                 latitude: float, longitude: float, now: Optional[float] = None) -> None:
+    """Queue the counter and last-position updates for a successful claim on `pipe`."""
+    now = now if now is not None else time.time()
+    cooldown_key, rate_key, daily_key = rate_keys(user_id, now)
+    ttl = int(86400 * settings.abuse_state_ttl_days)
+    pipe.incr(rate_key)
+    pipe.expire(rate_key, 3600)  # 1 hour TTL
+    pipe.incr(daily_key)
+    pipe.expire(daily_key, 86400)  # 24 hour TTL
+    pipe.setex(cooldown_key, settings.scan_cooldown_seconds, "1")
+
+    last = {"lat": latitude, "lon": longitude, "at": now}
+    pipe.hset(user_key(user_id), mapping=last)
+    pipe.expire(user_key(user_id), ttl)
+    if device_id:
+        device = device_key(device_id)
+        pipe.hset(device, mapping=last)
+        pipe.expire(device, ttl)
+        pipe.sadd(f"{device}:users", str(user_id))
+        pipe.expire(f"{device}:users", ttl)
+
+
+def flag_claim(pipe: redis.client.Pipeline, verdict: Verdict, claim_id: uuid.UUID, user_id: uuid.UUID,
+               device_id: Optional[str], now: Optional[float] = None) -> None:
+    """Queue a let-through-but-suspicious claim onto the review stream."""
+    entry = {
+        "claim_id": str(claim_id),
+        "user_id": str(user_id),
+        "device_id": device_id or "",
+        "reason": verdict.reason,
+        "detail": json.dumps(verdict.detail),
+        "at": json.dumps(now if now is not None else time.time()),
+    }
+    pipe.xadd(FLAGS_KEY, entry, maxlen=FLAGS_MAX, approximate=True)
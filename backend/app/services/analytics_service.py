@@ -0,0 +1,201 @@
+"""Sponsor analytics – incremental claim rollups and rollup-only reads."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import settings
+from app.models.claim_log import ClaimLog
+from app.models.claim_rollup import ClaimRollup
+from app.models.location import Location
+from app.models.reward import Reward
+from app.models.rollup_watermark import RollupWatermark
+
+GRANULARITIES = ("hour", "day")
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def utc_bucket(granularity: str, column):
+    """
+    `date_trunc` in UTC regardless of the session TimeZone.
+
+    Arguments are inlined rather than bound so the expression renders identically
+    in SELECT and GROUP BY (Postgres treats `$1` and `$4` as different expressions).
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unsupported granularity: {granularity}")
+    utc = literal_column("'UTC'")
+    return func.timezone(utc, func.date_trunc(literal_column(f"'{granularity}'"), func.timezone(utc, column)))
+
+
+async def advance_watermark(
+    db: AsyncSession, name: str, lag_seconds: Optional[float] = None, initial=EPOCH
+) -> tuple[datetime, datetime]:
+    """
+    Lock the named watermark row and return the `(low, high]` claimed_at window
+    that still has to be folded in. The caller must set `watermark = high` in the
+    same transaction once the window is processed.
+
+    `high` trails `now()` by `lag_seconds` (default `analytics_rollup_lag_seconds`)
+    so that claims from transactions that have not committed yet are not
+    skipped forever. A missing row starts at `initial` (a datetime or SQL
+    expression): the epoch folds in all history, `func.now()` none of it.
+    """
+    await db.execute(
+        pg_insert(RollupWatermark)
+        .values(name=name, watermark=initial)
+        .on_conflict_do_nothing(index_elements=[RollupWatermark.name])
+    )
+    result = await db.execute(
+        select(RollupWatermark).where(RollupWatermark.name == name).with_for_update()
+    )
+    mark = result.scalar_one()
+
+    now = (await db.execute(select(func.now()))).scalar_one()
+    lag = settings.analytics_rollup_lag_seconds if lag_seconds is None else lag_seconds
+    high = now - timedelta(seconds=lag)
+    return mark.watermark, max(high, mark.watermark)
+
+
+async def refresh_claim_rollups(db: AsyncSession) -> int:
+    """
+    Fold claims inserted since the last run into the hourly and daily rollups.
+
+    Only the `(watermark, now - lag]` slice of `claim_logs` is scanned (via the
+    `claimed_at` index); existing buckets are incremented in place with
+    ON CONFLICT, never recomputed. Rewards redeemed in the same slice (via the
+    partial `redeemed_at` index) are added to the `redemptions` of the bucket
+    their claim fell in – a reward is created in its claim's transaction, so
+    `created_at` equals the claim's `claimed_at`. Returns the number of claims
+    folded in.
+    """
+    low, high = await advance_watermark(db, "claim_rollups")
+    if high <= low:
+        return 0
+
+    window = (ClaimLog.claimed_at > low, ClaimLog.claimed_at <= high)
+
+    for granularity in GRANULARITIES:
+        bucket = utc_bucket(granularity, ClaimLog.claimed_at)
+        source = (
+            select(
+                literal(granularity),
+                bucket,
+                ClaimLog.location_id,
+                Location.sponsor_id,
+                func.count(),
+                func.min(ClaimLog.claimed_at),
+                func.max(ClaimLog.claimed_at),
+            )
+            .join(Location, Location.id == ClaimLog.location_id)
+            .where(*window)
+            .group_by(bucket, ClaimLog.location_id, Location.sponsor_id)
+        )
+        stmt = pg_insert(ClaimRollup).from_select(
+            [
+                ClaimRollup.granularity,
+                ClaimRollup.bucket_start,
+                ClaimRollup.location_id,
+                ClaimRollup.sponsor_id,
+                ClaimRollup.claims,
+                ClaimRollup.first_claim_at,
+                ClaimRollup.last_claim_at,
+            ],
+            source,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ClaimRollup.granularity, ClaimRollup.bucket_start, ClaimRollup.location_id],
+            set_={
+                "claims": ClaimRollup.claims + stmt.excluded.claims,
+                "first_claim_at": func.least(ClaimRollup.first_claim_at, stmt.excluded.first_claim_at),
+                "last_claim_at": func.greatest(ClaimRollup.last_claim_at, stmt.excluded.last_claim_at),
+                "updated_at": func.now(),
+            },
+        )
+        await db.execute(stmt)
+
+        # claims only ever precede their redemptions, so the bucket is normally there already
+        bucket = utc_bucket(granularity, Reward.created_at)
+        source = (
+            select(
+                literal(granularity),
+                bucket,
+                Reward.location_id,
+                Location.sponsor_id,
+                func.count(),
+                func.min(Reward.created_at),
+                func.max(Reward.created_at),
+            )
+            .join(Location, Location.id == Reward.location_id)
+            .where(Reward.redeemed_at > low, Reward.redeemed_at <= high)
+            .group_by(bucket, Reward.location_id, Location.sponsor_id)
+        )
+        stmt = pg_insert(ClaimRollup).from_select(
+            [
+                ClaimRollup.granularity,
+                ClaimRollup.bucket_start,
+                ClaimRollup.location_id,
+                ClaimRollup.sponsor_id,
+                ClaimRollup.redemptions,
+                ClaimRollup.first_claim_at,
+                ClaimRollup.last_claim_at,
+            ],
+            source,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ClaimRollup.granularity, ClaimRollup.bucket_start, ClaimRollup.location_id],
+            set_={"redemptions": ClaimRollup.redemptions + stmt.excluded.redemptions, "updated_at": func.now()},
+        )
+        await db.execute(stmt)
+
+    folded = (await db.execute(select(func.count()).where(*window))).scalar() or 0
+
+    mark = await db.get(RollupWatermark, "claim_rollups")
+    mark.watermark = high
+    await db.flush()
+    return folded
+
+
+async def get_sponsor_analytics(
+    db: AsyncSession,
+    sponsor_id: uuid.UUID,
+    granularity: str,
+    start: datetime,
+    end: datetime,
+    location_id: Optional[uuid.UUID] = None,
+) -> list[dict]:
+    """
+    Return per-bucket claim and redemption totals for a sponsor between `start` and `end`.
+
+    Reads `claim_rollups` only – cost is proportional to the number of buckets
+    (times locations), independent of how many claims they summarise.
+    """
+    stmt = (
+        select(
+            ClaimRollup.bucket_start,
+            func.sum(ClaimRollup.claims).label("claims"),
+            func.sum(ClaimRollup.redemptions).label("redemptions"),
+            func.count(ClaimRollup.location_id).label("active_locations"),
+            func.min(ClaimRollup.first_claim_at).label("first_claim_at"),
+            func.max(ClaimRollup.last_claim_at).label("last_claim_at"),
+        )
+        .where(
+            ClaimRollup.sponsor_id == sponsor_id,
+            ClaimRollup.granularity == granularity,
+            ClaimRollup.bucket_start >= start,
+            ClaimRollup.bucket_start < end,
+        )
+        .group_by(ClaimRollup.bucket_start)
+        .order_by(ClaimRollup.bucket_start)
+    )
+    if location_id is not None:
+        stmt = stmt.where(ClaimRollup.location_id == location_id)
+
+    result = await db.execute(stmt)
+    return [dict(row._mapping) for row in result]
@@ -0,0 +1,97 @@
+"""Time-windowed campaigns – flipping `is_active` when reward template windows open and close.
+
+A template with `starts_at` / `ends_at` is a limited-time campaign. Rather
+than every nearby / claim query filtering on the window, the scheduler
+flips `is_active` on the template and its location as boundaries pass, so
+requests keep filtering on `is_active` alone (served by partial indexes on
+the active rows) and a 10k-location event costs them nothing extra.
+
+Each run handles the boundaries in `(last run, now]` – tracked with a
+`rollup_watermarks` row, whose lock also serialises concurrent schedulers –
+so a template someone deactivated by hand inside its window stays off. The
+very first run starts from now rather than the epoch for the same reason:
+windows that opened earlier were already applied when the templates were
+created or imported, and replaying them would switch hand-disabled ones back
+on. The
+claim path checks the loaded template's window too, which closes the gap of
+up to one scheduler interval around a boundary.
+"""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass, field
+
+from sqlalchemy import func, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.location import Location
+from app.models.reward_template import RewardTemplate
+from app.models.rollup_watermark import RollupWatermark
+from app.services.analytics_service import advance_watermark
+from app.services.live_map import location_event
+
+WATERMARK = "campaign_windows"
+LOCATION_BATCH = 5000  # location ids per UPDATE ... WHERE id IN (...)
+
+
+@dataclass
+class WindowChanges:
+    started: list[uuid.UUID] = field(default_factory=list)  # template ids activated
+    ended: list[uuid.UUID] = field(default_factory=list)  # template ids deactivated
+    events: list[dict] = field(default_factory=list)  # live-map events for the affected locations
+
+
+async def _set_locations_active(db: AsyncSession, location_ids: list[uuid.UUID], active: bool) -> list[dict]:
+    events = []
+    for start in range(0, len(location_ids), LOCATION_BATCH):
+        result = await db.execute(
+            update(Location)
+            .where(Location.id.in_(location_ids[start:start + LOCATION_BATCH]))
+            .values(is_active=active)
+            .returning(Location.id, Location.latitude, Location.longitude, Location.name, Location.radius_m,
+                       Location.city, Location.sponsor_id, Location.is_active)
+        )
+        event_type = "location.upserted" if active else "location.deactivated"
+        events.extend(location_event(event_type, row) for row in result)
+    return events
+
+
+async def apply_campaign_windows(db: AsyncSession) -> WindowChanges:
+    """
+    Activate templates whose window opened and deactivate those whose window
+    closed since the last run, along with their locations. The caller commits,
+    then publishes `events` (which also invalidates in-memory location snapshots).
+    """
+    low, high = await advance_watermark(db, WATERMARK, lag_seconds=0, initial=func.now())
+    changes = WindowChanges()
+
+    started = await db.execute(
+        update(RewardTemplate)
+        .where(
+            RewardTemplate.starts_at > low,
+            RewardTemplate.starts_at <= high,
+            or_(RewardTemplate.ends_at.is_(None), RewardTemplate.ends_at > high),
+        )
+        .values(is_active=True)
+        .returning(RewardTemplate.id, RewardTemplate.location_id)
+    )
+    started_rows = started.all()
+    ended = await db.execute(
+        update(RewardTemplate)
+        .where(RewardTemplate.ends_at > low, RewardTemplate.ends_at <= high)
+        .values(is_active=False)
+        .returning(RewardTemplate.id, RewardTemplate.location_id)
+    )
+    ended_rows = ended.all()
+
+    changes.started = [r.id for r in started_rows]
+    changes.ended = [r.id for r in ended_rows]
+    changes.events += await _set_locations_active(db, [r.location_id for r in started_rows], True)
+    changes.events += await _set_locations_active(db, [r.location_id for r in ended_rows], False)
+
+    mark = await db.get(RollupWatermark, WATERMARK)
+    mark.watermark = high
+    await db.flush()
+    return changes
+
@@ -1,5 +1,7 @@
 """Reward claim service – validation chain and reward granting."""
 
+import logging
+import time
 from datetime import datetime, timezone
 
 import redis.asyncio as redis
@@ -8,15 +10,33 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core import settings
+from app.core.tracing import span, traced
 from app.models.claim_log import ClaimLog
 from app.models.location import Location
 from app.models.reward import Reward
 from app.models.reward_template import RewardTemplate
 from app.models.user import User
 from app.schemas.claim import ClaimRequest, ClaimResponse
+from app.services.abuse import CLAIM_ABUSE, check_claim, flag_claim, record_claim
+from app.services.coupons import SOLD_OUT_KEY, issue_code
 from app.services.geo import haversine_distance
+from app.services.leaderboard import record_points
+from app.services.live_map import location_event, publish_location_events, user_claims_channel
+from app.services.notifications import record_position
+from app.services.prizes import draw_prize
+from app.services.unique_visitors import record_unique_visit
 
+logger = logging.getLogger(__name__)
 
+
+async def _sold_out(redis_client: redis.Redis, reward_template: RewardTemplate, location: Location) -> None:
+    """Fail the claim with 410, announcing the sell-out on the live map the first time."""
+    if await redis_client.set(SOLD_OUT_KEY.format(reward_template.id), "1", nx=True):
+        await publish_location_events(redis_client, [location_event("location.sold_out", location)])
+    raise HTTPException(status.HTTP_410_GONE, "This reward has sold out")
+
+
+@traced("claim.process_claim")
 async def process_claim(
     db: AsyncSession,
     redis_client: redis.Redis,
@@ -29,38 +49,43 @@ async def process_claim(
     1. Location exists, is active, has reward template
     2. Not already claimed by this user (once-only rule)
     3. GPS within radius
-    4. Rate limit (Redis)
-    5. Award reward
+    4. Rate limits, impossible travel and device sharing (one Redis round trip)
+    5. Award reward (drawn from the prize table if it has one; issuing a pooled coupon code for coupon rewards)
+    6. Commit, then record the claim in Redis (rate/abuse state, unique visitors, leaderboards, live streams)
     """
 
     # 1. Look up location and reward template
-    result = await db.execute(
-        select(Location).where(Location.id == location_id, Location.is_active == True)  # noqa: E712
-    )
+    with span("claim.load_location"):
+        result = await db.execute(
+            select(Location).where(Location.id == location_id, Location.is_active == True)  # noqa: E712
+        )
     location = result.scalar_one_or_none()
 
     if location is None:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Location not found or inactive")
 
     # Get reward template for this location
-    template_result = await db.execute(
-        select(RewardTemplate).where(
-            RewardTemplate.location_id == location.id,
-            RewardTemplate.is_active == True,  # noqa: E712
+    with span("claim.load_template"):
+        template_result = await db.execute(
+            select(RewardTemplate).where(
+                RewardTemplate.location_id == location.id,
+                RewardTemplate.is_active == True,  # noqa: E712
+            )
         )
-    )
     reward_template = template_result.scalar_one_or_none()
 
-    if reward_template is None:
+    # the window check covers the gap until the campaign scheduler flips is_active at a boundary
+    if reward_template is None or not reward_template.in_window(datetime.now(timezone.utc)):
         raise HTTPException(status.HTTP_404_NOT_FOUND, "No active reward available at this location")
 
     # 2. Check if already claimed (once-only rule)
-    claim_check = await db.execute(
-        select(ClaimLog).where(
-            ClaimLog.user_id == user.id,
-            ClaimLog.location_id == location.id,
+    with span("claim.check_duplicate"):
+        claim_check = await db.execute(
+            select(ClaimLog).where(
+                ClaimLog.user_id == user.id,
+                ClaimLog.location_id == location.id,
+            )
         )
-    )
     if claim_check.scalar_one_or_none() is not None:
         raise HTTPException(
             status.HTTP_409_CONFLICT,
@@ -78,27 +103,25 @@ async def process_claim(
             f"You are too far from the location ({distance:.0f}m away, max {location.radius_m}m)"
         )
 
-    # 4. Rate limiting (Redis) - use existing scan limits for now
-    rate_key = f"claim_rate:{user.id}"
-    daily_key = f"claim_daily:{user.id}:{datetime.now(timezone.utc).strftime('%Y-%m-%d')}"
-    cooldown_key = f"claim_cooldown:{user.id}"
-
-    # Cooldown check
-    if await redis_client.exists(cooldown_key):
+    # 4. Rate limits and abuse checks (one Redis round trip)
+    now = time.time()
+    with span("claim.redis.guard"):
+        verdict = await check_claim(redis_client, user.id, claim.device_id, claim.latitude, claim.longitude, now)
+    if verdict.reason == "cooldown":
         raise HTTPException(
             status.HTTP_429_TOO_MANY_REQUESTS,
             "Please wait before claiming another reward"
         )
-
-    # Hourly rate limit
-    hourly_count = await redis_client.get(rate_key)
-    if hourly_count and int(hourly_count) >= settings.max_scans_per_hour:
+    if verdict.reason == "hourly":
         raise HTTPException(status.HTTP_429_TOO_MANY_REQUESTS, "Hourly claim limit reached")
-
-    # Daily limit
-    daily_count = await redis_client.get(daily_key)
-    if daily_count and int(daily_count) >= settings.max_daily_scans:
+    if verdict.reason == "daily":
         raise HTTPException(status.HTTP_429_TOO_MANY_REQUESTS, "Daily claim limit reached")
+    if not verdict.ok:
+        CLAIM_ABUSE.inc((verdict.reason, settings.abuse_action))
+        logger.warning("Claim by %s at %s caught by %s check (%.0f)", user.id, location.id, verdict.reason,
+                       verdict.detail)
+        if settings.abuse_action == "reject":
+            raise HTTPException(status.HTTP_403_FORBIDDEN, "Claim rejected by anti-abuse checks")
 
     # ---- All checks passed – process the claim ----
 
@@ -112,37 +135,67 @@ async def process_claim(
     )
     db.add(claim_log)
 
+    # Templates with a prize table award a weighted draw instead of their fixed reward
+    prize = reward_template
+    if reward_template.has_prizes:
+        with span("claim.draw_prize"):
+            prize = await draw_prize(db, reward_template)
+        if prize is None:
+            await _sold_out(redis_client, reward_template, location)
+
     # Create reward
     reward = Reward(
         user_id=user.id,
-        type=reward_template.reward_type,
-        value=reward_template.reward_value,
-        description=reward_template.reward_description or f"+{reward_template.reward_value} points",
+        type=prize.reward_type,
+        value=prize.reward_value,
+        description=prize.reward_description or f"+{prize.reward_value} points",
         reward_template_id=reward_template.id,
         location_id=location.id,
     )
     db.add(reward)
 
     # Update user points (for point-type rewards)
-    if reward_template.reward_type == "points":
-        user.total_points += reward_template.reward_value
+    if prize.reward_type == "points":
+        user.total_points += prize.reward_value
+
+    with span("claim.flush"):
+        await db.flush()
+
+    # Coupon rewards with a loaded pool get the next free code; an empty pool fails the claim
+    if prize.reward_type == "coupon" and reward_template.coupon_pool:
+        with span("claim.issue_coupon"):
+            reward.code = await issue_code(db, reward_template.id, reward.id)
+        if reward.code is None:
+            await _sold_out(redis_client, reward_template, location)
 
-    await db.flush()
+    # Commit first: Redis cannot roll back, so it only ever hears of claims that were kept
+    with span("claim.commit"):
+        await db.commit()
 
-    # Update Redis rate counters
+    # Update Redis rate counters, abuse state, unique-visitor HLLs and leaderboards, and notify live streams
     pipe = redis_client.pipeline()
-    pipe.incr(rate_key)
-    pipe.expire(rate_key, 3600)  # 1 hour TTL
-    pipe.incr(daily_key)
-    pipe.expire(daily_key, 86400)  # 24 hour TTL
-    pipe.setex(cooldown_key, settings.scan_cooldown_seconds, "1")
-    await pipe.execute()
+    record_claim(pipe, user.id, claim.device_id, claim.latitude, claim.longitude, now)
+    if not verdict.ok:
+        flag_claim(pipe, verdict, claim_log.id, user.id, claim.device_id, now)
+    record_unique_visit(pipe, user.id, location.id, location.sponsor_id, reward_template.id)
+    if prize.reward_type == "points":
+        record_points(pipe, user.id, location.city, prize.reward_value)
+    record_position(pipe, user.id, claim.latitude, claim.longitude)
+    # the user's open proximity streams stop pointing at this treasure
+    pipe.publish(user_claims_channel(user.id), str(location.id))
+    with span("claim.redis.update_counters"):
+        try:
+            await pipe.execute()
+        except redis.RedisError:
+            # the claim stands; `rebuild_leaderboards` restores the boards from `rewards`
+            logger.exception("Claim %s committed but its Redis updates failed", claim_log.id)
 
     return ClaimResponse(
-        reward_type=reward_template.reward_type,
-        reward_value=reward_template.reward_value,
-        reward_description=reward_template.reward_description,
+        reward_type=prize.reward_type,
+        reward_value=prize.reward_value,
+        reward_description=prize.reward_description,
         total_points=user.total_points,
         location_id=location.id,
         location_name=location.name,
+        coupon_code=reward.code,
     )
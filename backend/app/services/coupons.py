@@ -0,0 +1,225 @@
+"""Coupon pools – bulk-loaded single-use codes, handed out at claim time and redeemed in store.
+
+Codes live in `coupon_codes`, one row each. Loading streams them with COPY
+into a temp table and inserts the distinct, not-yet-known ones in one
+statement, so millions of codes cost one round trip per `LOAD_CHUNK` rather
+than one per code.
+
+Handing out is a single UPDATE of the first unissued row taken with
+`FOR UPDATE SKIP LOCKED` through a partial index on the unissued rows:
+concurrent claims each skip rows the others hold instead of waiting on or
+colliding over them, and a rolled-back claim puts its code back.
+Redemption is one conditional UPDATE (`redeemed_at IS NULL`) chained to
+the reward through a CTE – atomic, idempotent, one round trip per checkout.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import secrets
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterable, AsyncIterator, Iterable, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import exists, func, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.bulk import copy_records
+from app.models.coupon_code import CouponCode
+from app.models.location import Location
+from app.models.reward import Reward
+from app.models.reward_template import RewardTemplate
+
+LOAD_CHUNK = 50_000  # codes per COPY
+MAX_CODE_LENGTH = 64
+CODE_ALPHABET = "23456789ABCDEFGHJKLMNPQRSTUVWXYZ"  # no 0/O or 1/I to misread at a till
+SOLD_OUT_KEY = "coupon:sold_out:{}"  # set once a pool runs dry so the sold-out event is published once
+
+# random byte -> alphabet letter; 256 is a multiple of the 32 letters, so every letter is equally likely
+_BYTE_TO_CODE_CHAR = bytes(CODE_ALPHABET.encode()[b % len(CODE_ALPHABET)] for b in range(256))
+
+
+@dataclass
+class Redemption:
+    reward_id: uuid.UUID
+    redeemed_at: datetime
+    already_redeemed: bool
+
+
+def generate_codes(count: int, length: int = 12, prefix: str = "") -> list[str]:
+    """`count` random codes (12 characters of a 32-letter alphabet is 60 bits: collisions are negligible)."""
+    letters = secrets.token_bytes(count * length).translate(_BYTE_TO_CODE_CHAR).decode("ascii")
+    return [prefix + letters[i:i + length] for i in range(0, count * length, length)]
+
+
+async def stream_codes(count: int, length: int = 12, prefix: str = "") -> AsyncIterator[str]:
+    """`generate_codes` a `LOAD_CHUNK` at a time in a worker thread, keeping the event loop free."""
+    for start in range(0, count, LOAD_CHUNK):
+        for code in await asyncio.to_thread(generate_codes, min(LOAD_CHUNK, count - start), length, prefix):
+            yield code
+
+
+def clean_code(raw: str) -> Optional[str]:
+    """Normalise one uploaded line; None for blanks. Raises ValueError for codes too long to store."""
+    code = raw.strip()
+    if not code:
+        return None
+    if len(code) > MAX_CODE_LENGTH:
+        raise ValueError(f"Coupon code longer than {MAX_CODE_LENGTH} characters: {code[:20]}…")
+    return code
+
+
+async def load_codes(db: AsyncSession, template_id: uuid.UUID, codes: AsyncIterable[str] | Iterable[str]) -> int:
+    """
+    COPY `codes` into the template's pool; duplicates (within the upload or
+    already pooled) are skipped. Marks the template as pool-backed and
+    returns the number of new codes. The caller commits.
+    """
+    # through SQLAlchemy, so the session's transaction has begun before the ON COMMIT DROP table exists
+    connection = await db.connection()
+    await connection.execute(text("CREATE TEMP TABLE IF NOT EXISTS coupon_staging (code text) ON COMMIT DROP"))
+    await connection.execute(text("TRUNCATE coupon_staging"))
+
+    chunk: list[tuple[str]] = []
+
+    async def flush() -> None:
+        await copy_records(connection, "coupon_staging", ["code"], chunk)
+        chunk.clear()
+
+    async def add(raw: str) -> None:
+        code = clean_code(raw)
+        if code is not None:
+            chunk.append((code,))
+            if len(chunk) >= LOAD_CHUNK:
+                await flush()
+
+    if hasattr(codes, "__aiter__"):
+        async for raw in codes:
+            await add(raw)
+    else:
+        for raw in codes:
+            await add(raw)
+    if chunk:
+        await flush()
+
+    result = await db.execute(
+        text(
+            "INSERT INTO coupon_codes (reward_template_id, code) "
+            "SELECT DISTINCT CAST(:template_id AS uuid), code FROM coupon_staging "
+            "ON CONFLICT (reward_template_id, code) DO NOTHING"
+        ),
+        {"template_id": str(template_id)},
+    )
+    await db.execute(update(RewardTemplate).where(RewardTemplate.id == template_id).values(coupon_pool=True))
+    return result.rowcount
+
+
+async def issue_code(db: AsyncSession, template_id: uuid.UUID, reward_id: uuid.UUID) -> Optional[str]:
+    """
+    Assign the next free code to `reward_id`; None when the pool is sold out.
+
+    Raises 503 when free codes remain but all are locked by in-flight claims
+    (which may yet roll back), so the last few codes are never reported
+    sold out by mistake.
+    """
+    next_free = (
+        select(CouponCode.id)
+        .where(CouponCode.reward_template_id == template_id, CouponCode.reward_id.is_(None))
+        .order_by(CouponCode.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        update(CouponCode)
+        .where(CouponCode.id == next_free)
+        .values(reward_id=reward_id, issued_at=func.now())
+        .returning(CouponCode.code)
+    )
+    code = result.scalar_one_or_none()
+    if code is not None:
+        return code
+
+    still_free = await db.execute(
+        select(exists().where(CouponCode.reward_template_id == template_id, CouponCode.reward_id.is_(None)))
+    )
+    if still_free.scalar():
+        raise HTTPException(
+            status.HTTP_503_SERVICE_UNAVAILABLE, "Coupons are being handed out, please retry", {"Retry-After": "1"}
+        )
+    return None
+
+
+def _owned_by(sponsor_id: uuid.UUID):
+    return CouponCode.reward_template_id.in_(
+        select(RewardTemplate.id).join(Location, Location.id == RewardTemplate.location_id)
+        .where(Location.sponsor_id == sponsor_id)
+    )
+
+
+async def redeem_code(db: AsyncSession, sponsor_id: uuid.UUID, template_id: uuid.UUID, code: str) -> Redemption:
+    """
+    Mark an issued code (and its reward) redeemed. Redeeming it again returns
+    the original redemption with `already_redeemed=True`. Unknown codes (or
+    another sponsor's) are 404; codes still in the pool, never issued, are 409.
+    """
+    redeemed = (
+        update(CouponCode)
+        .where(
+            CouponCode.reward_template_id == template_id,
+            CouponCode.code == code,
+            CouponCode.reward_id.is_not(None),
+            CouponCode.redeemed_at.is_(None),
+            _owned_by(sponsor_id),
+        )
+        .values(redeemed_at=func.now())
+        .returning(CouponCode.reward_id, CouponCode.redeemed_at)
+        .cte("redeemed")
+    )
+    result = await db.execute(
+        update(Reward)
+        .where(Reward.id == redeemed.c.reward_id)
+        .values(redeemed=True, redeemed_at=redeemed.c.redeemed_at)
+        .returning(Reward.id, Reward.redeemed_at)
+        .execution_options(synchronize_session=False)  # the ORM would drop RETURNING from this UPDATE ... FROM
+    )
+    row = result.one_or_none()
+    if row is not None:
+        return Redemption(row.id, row.redeemed_at, already_redeemed=False)
+
+    # not redeemed just now: work out why
+    result = await db.execute(
+        select(CouponCode.reward_id, CouponCode.redeemed_at).where(
+            CouponCode.reward_template_id == template_id, CouponCode.code == code, _owned_by(sponsor_id)
+        )
+    )
+    existing = result.one_or_none()
+    if existing is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Coupon code not found")
+    if existing.reward_id is None:
+        raise HTTPException(status.HTTP_409_CONFLICT, "Coupon code has not been issued to anyone")
+    return Redemption(existing.reward_id, existing.redeemed_at, already_redeemed=True)
+
+
+async def pool_stats(db: AsyncSession, template_id: uuid.UUID) -> tuple[int, int, int]:
+    """(total, issued, redeemed) codes in the template's pool."""
+    result = await db.execute(
+        select(func.count(), func.count(CouponCode.reward_id), func.count(CouponCode.redeemed_at))
+        .where(CouponCode.reward_template_id == template_id)
+    )
+    total, issued, redeemed = result.one()
+    return total, issued, redeemed
+
+
+async def ensure_sponsor_template(db: AsyncSession, sponsor_id: uuid.UUID, template_id: uuid.UUID) -> RewardTemplate:
+    """Return the template; 404 unless it exists and belongs to the sponsor."""
+    result = await db.execute(
+        select(RewardTemplate).join(Location, Location.id == RewardTemplate.location_id)
+        .where(RewardTemplate.id == template_id, Location.sponsor_id == sponsor_id)
+    )
+    template = result.scalar_one_or_none()
+    if template is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Reward template not found")
+    return template
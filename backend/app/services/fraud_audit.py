@@ -0,0 +1,133 @@
+"""Offline claim audit – per-user GPS-spoofing features over the claim history.
+
+Works on column arrays for a block of claims sorted by (user, time), so
+every feature is a vectorised pass plus one `np.add.reduceat` per user:
+
+- exact_coordinates: claims within ~10 cm of the location's own pin. Real
+  GPS fixes scatter by metres; spoofers paste the coordinates they see.
+- shared_coordinates: claims at a point (to 1e-6°) that other accounts also
+  claimed from – copied coordinates or one spoofing rig behind many accounts.
+- impossible_travel: consecutive claims implying more than
+  `abuse_max_speed_kmh` over more than `abuse_min_distance_m` (the online
+  check's thresholds, applied to history that predates it or was only
+  flagged).
+
+numpy is imported inside the functions that need it (see app.services.heatmap).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from app.core import settings
+
+if TYPE_CHECKING:
+    import numpy as np
+
+EXACT_DEGREES = 1e-6  # |claim - pin| below this on both axes counts as "exactly the pin" (~10 cm)
+COORD_SCALE = 1_000_000  # coordinates are compared at 1e-6° (~11 cm) for sharing
+MIN_CLAIMS = 3  # ratio-based reasons need at least this many claims
+EXACT_RATIO = 0.5
+SHARED_RATIO = 0.5
+MAX_CLAIM_SAMPLE = 50  # offending claim ids stored per review
+REASONS = ("exact_coordinates", "shared_coordinates", "impossible_travel")
+
+
+@dataclass
+class UserFlag:
+    user_index: int  # index into the block's distinct users
+    reason: str
+    score: float
+    claim_indices: np.ndarray  # rows (into the block) of the offending claims
+    details: dict
+
+
+def coordinate_keys(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Pack coordinates rounded to 1e-6° into one int64 each."""
+    import numpy as np
+
+    lat = np.rint(np.asarray(latitudes, dtype=np.float64) * COORD_SCALE).astype(np.int64) + 90 * COORD_SCALE
+    lon = np.rint(np.asarray(longitudes, dtype=np.float64) * COORD_SCALE).astype(np.int64) + 180 * COORD_SCALE
+    return lat * (360 * COORD_SCALE + 1) + lon
+
+
+def haversine_m(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    import numpy as np
+
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    a = np.sin((phi2 - phi1) / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(np.radians(lon2 - lon1) / 2) ** 2
+    return 2 * 6_371_000 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def audit_block(
+    users: np.ndarray,
+    times: np.ndarray,
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    pin_latitudes: np.ndarray,
+    pin_longitudes: np.ndarray,
+    shared_keys: np.ndarray,
+) -> tuple[np.ndarray, list[UserFlag]]:
+    """
+    Compute features and flags for a block of claims sorted by (user, time).
+
+    `users` are integer user codes (equal codes contiguous), `times` epoch
+    seconds, `pin_*` the claimed location's coordinates per row and
+    `shared_keys` the sorted `coordinate_keys` claimed by more than one user.
+    A user's claims must not span blocks. Returns `(starts, flags)` where
+    `starts[i]` is the first row of the block's i-th user.
+    """
+    import numpy as np
+
+    n = users.size
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), []
+    starts = np.flatnonzero(np.r_[True, users[1:] != users[:-1]])
+    counts = np.diff(np.r_[starts, n])
+
+    exact = (np.abs(latitudes - pin_latitudes) < EXACT_DEGREES) & (np.abs(longitudes - pin_longitudes) < EXACT_DEGREES)
+    keys = coordinate_keys(latitudes, longitudes)
+    shared = np.isin(keys, shared_keys, assume_unique=False) if shared_keys.size else np.zeros(n, dtype=bool)
+
+    # consecutive pairs of the same user; `travel[i]` marks the later claim of an impossible hop
+    travel = np.zeros(n, dtype=bool)
+    if n > 1:
+        same_user = users[1:] == users[:-1]
+        meters = haversine_m(latitudes[:-1], longitudes[:-1], latitudes[1:], longitudes[1:])
+        seconds = np.maximum(times[1:] - times[:-1], 1.0)
+        travel[1:] = (
+            same_user
+            & (meters > settings.abuse_min_distance_m)
+            & (meters / seconds > settings.abuse_max_speed_kmh / 3.6)
+        )
+
+    exact_n = np.add.reduceat(exact.astype(np.int64), starts)
+    shared_n = np.add.reduceat(shared.astype(np.int64), starts)
+    travel_n = np.add.reduceat(travel.astype(np.int64), starts)
+
+    flags: list[UserFlag] = []
+    enough = counts >= MIN_CLAIMS
+    candidates = {
+        "exact_coordinates": (exact, exact_n, np.flatnonzero(enough & (exact_n >= EXACT_RATIO * counts))),
+        "shared_coordinates": (shared, shared_n, np.flatnonzero(enough & (shared_n >= SHARED_RATIO * counts))),
+        "impossible_travel": (travel, travel_n, np.flatnonzero(travel_n > 0)),
+    }
+    for reason, (mask, per_user, flagged) in candidates.items():
+        for u in flagged:
+            start, end = starts[u], starts[u] + counts[u]
+            claims = int(counts[u])
+            score = float(per_user[u]) if reason == "impossible_travel" else float(per_user[u] / claims)
+            flags.append(UserFlag(
+                user_index=int(u),
+                reason=reason,
+                score=score,
+                claim_indices=start + np.flatnonzero(mask[start:end])[:MAX_CLAIM_SAMPLE],
+                details={
+                    "claims": claims,
+                    "exact_coordinates": int(exact_n[u]),
+                    "shared_coordinates": int(shared_n[u]),
+                    "impossible_travel": int(travel_n[u]),
+                },
+            ))
+    return starts, flags
@@ -1,6 +1,7 @@
 """Geo utility functions."""
 
 import math
+from typing import Optional
 
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -22,3 +23,42 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
 
     return R * c
+
+
+def bounding_box(lat: float, lon: float, radius_m: float) -> tuple[float, float, Optional[float], Optional[float]]:
+    """
+    `(min_lat, max_lat, min_lon, max_lon)` enclosing every point within
+    `radius_m` of the coordinate, for an index range scan ahead of an exact
+    Haversine check. The longitude bounds are None when the circle reaches a
+    pole or crosses the antimeridian (any longitude may then be in range).
+    """
+    R = 6_371_000
+    delta_lat = math.degrees(radius_m / R)
+    min_lat, max_lat = lat - delta_lat, lat + delta_lat
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), None, None
+
+    delta_lon = math.degrees(radius_m / (R * math.cos(math.radians(lat))))
+    min_lon, max_lon = lon - delta_lon, lon + delta_lon
+    if min_lon < -180 or max_lon > 180:
+        return min_lat, max_lat, None, None
+    return min_lat, max_lat, min_lon, max_lon
+
+
+def tile_for(lat: float, lon: float, zoom: int) -> tuple[int, int]:
+    """Slippy-map tile `(x, y)` containing the coordinate at `zoom` (same scheme as the heatmaps)."""
+    lat = max(min(lat, 85.05112878), -85.05112878)
+    n = 1 << zoom
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def initial_bearing(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Initial great-circle bearing in degrees (0 = north, clockwise) from point 1 towards point 2."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    delta_lambda = math.radians(lon2 - lon1)
+    x = math.sin(delta_lambda) * math.cos(phi2)
+    y = math.cos(phi1) * math.sin(phi2) - math.sin(phi1) * math.cos(phi2) * math.cos(delta_lambda)
+    return math.degrees(math.atan2(x, y)) % 360.0
@@ -0,0 +1,140 @@
+"""Leaderboards in Redis sorted sets – global, per city and per season.
+
+Each board is one ZSET of user id -> points. The claim path ZINCRBYs all
+three boards inside its existing MULTI/EXEC pipeline, run once the claim
+has committed, so a claim lands on every board or none and a rolled-back
+one on none; rank lookups are ZREVRANK (O(log n)) and pages are
+ZREVRANGE slices, so no view ever sorts `users`.
+
+Only `points` rewards score, matching `User.total_points`. A season is a
+calendar block of `leaderboard_season_months` months, named like `2026-S4`.
+`rebuild_leaderboards` recomputes every board from `rewards` in one
+aggregate query and swaps them in with RENAME.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Optional
+
+import redis.asyncio as redis
+from sqlalchemy import extract, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import settings
+from app.models.location import Location
+from app.models.reward import Reward
+
+KEY_PREFIX = "lb"
+REBUILD_BATCH = 10_000  # members per ZADD when rebuilding
+
+
+def season_for(moment: datetime) -> str:
+    index = (moment.month - 1) // settings.leaderboard_season_months + 1
+    return f"{moment.year}-S{index}"
+
+
+def current_season() -> str:
+    return season_for(datetime.now(timezone.utc))
+
+
+def normalize_city(city: str) -> str:
+    return " ".join(city.split()).lower()
+
+
+def board_key(board: str, name: Optional[str] = None) -> str:
+    """`lb:global`, `lb:city:<normalised city>` or `lb:season:<season>`."""
+    if board == "global":
+        return f"{KEY_PREFIX}:global"
+    if board == "city":
+        return f"{KEY_PREFIX}:city:{normalize_city(name)}"
+    if board == "season":
+        return f"{KEY_PREFIX}:season:{name}"
+    raise ValueError(f"Unknown leaderboard: {board}")
+
+
+def record_points(pipe: redis.client.Pipeline, user_id: uuid.UUID, city: str, points: int,
+                  at: Optional[datetime] = None) -> None:
+    """Queue the ZINCRBYs for one claim on `pipe` (use the claim's MULTI/EXEC pipeline)."""
+    member = str(user_id)
+    pipe.zincrby(board_key("global"), points, member)
+    pipe.zincrby(board_key("city", city), points, member)
+    pipe.zincrby(board_key("season", season_for(at or datetime.now(timezone.utc))), points, member)
+
+
+async def top(redis_client: redis.Redis, key: str, offset: int, limit: int) -> tuple[list[tuple[str, int, int]], int]:
+    """`([(user_id, rank, score), ...], board_size)` for ranks `offset + 1 .. offset + limit`."""
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.zrevrange(key, offset, offset + limit - 1, withscores=True)
+    pipe.zcard(key)
+    page, total = await pipe.execute()
+    return [(member, offset + i + 1, int(score)) for i, (member, score) in enumerate(page)], total
+
+
+async def around(
+    redis_client: redis.Redis, key: str, user_id: uuid.UUID, window: int
+) -> tuple[Optional[int], int, list[tuple[str, int, int]], int]:
+    """`(rank, score, neighbours, board_size)`: the user plus `window` places either side."""
+    member = str(user_id)
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.zrevrank(key, member)
+    pipe.zscore(key, member)
+    pipe.zcard(key)
+    rank, score, total = await pipe.execute()
+    if rank is None:
+        return None, 0, [], total
+    start = max(rank - window, 0)
+    page = await redis_client.zrevrange(key, start, rank + window, withscores=True)
+    entries = [(m, start + i + 1, int(s)) for i, (m, s) in enumerate(page)]
+    return rank + 1, int(score), entries, total
+
+
+# ---- Rebuild ----
+
+async def rebuild_leaderboards(db: AsyncSession, redis_client: redis.Redis) -> dict[str, int]:
+    """
+    Recompute every board from `rewards` and atomically replace the live ones; returns members per key.
+
+    Claims landing between the aggregate query and a board's RENAME are
+    overwritten, so run it when traffic is low (or re-run it).
+    """
+    months = settings.leaderboard_season_months
+    created_utc = func.timezone("UTC", Reward.created_at)  # seasons are cut in UTC, like `season_for`
+    season_index = func.floor((extract("month", created_utc) - 1) / months) + 1
+    stmt = (
+        select(
+            Reward.user_id,
+            Location.city,
+            extract("year", created_utc).label("year"),
+            season_index.label("season_index"),
+            func.sum(Reward.value).label("points"),
+        )
+        .join(Location, Location.id == Reward.location_id)
+        .where(Reward.type == "points")
+        .group_by(Reward.user_id, Location.city, "year", "season_index")
+    )
+
+    boards: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    for row in await db.execute(stmt):
+        member, points = str(row.user_id), int(row.points)
+        boards[board_key("global")][member] += points
+        boards[board_key("city", row.city)][member] += points
+        boards[board_key("season", f"{int(row.year)}-S{int(row.season_index)}")][member] += points
+
+    # stale boards (a city or season with no points left) are dropped with the rest
+    existing = [key async for key in redis_client.scan_iter(match=f"{KEY_PREFIX}:*", count=1000)]
+    sizes = {}
+    for key, scores in boards.items():
+        staging = f"{key}:rebuild"
+        await redis_client.delete(staging)
+        items = list(scores.items())
+        for start in range(0, len(items), REBUILD_BATCH):
+            await redis_client.zadd(staging, dict(items[start:start + REBUILD_BATCH]))
+        await redis_client.rename(staging, key)
+        sizes[key] = len(items)
+    stale = [key for key in existing if key not in boards and not key.endswith(":rebuild")]
+    if stale:
+        await redis_client.delete(*stale)
+    return sizes
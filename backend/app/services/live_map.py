@@ -0,0 +1,203 @@
+"""Live map updates – location events fanned out per geotile over Redis pub/sub.
+
+Write paths call `publish_location_events`, which PUBLISHes each event on the
+channel of the slippy tile (at `live_map_zoom`) containing the location. Each
+worker keeps one `LiveMapHub`: a single Redis pub/sub connection subscribed to
+the union of tiles its WebSocket clients watch, fanning every message out to
+the matching local subscribers.
+
+Subscribers have bounded queues. A client that can't keep up has its backlog
+replaced by one `resync` message (refetch `/map/locations`), so a slow phone
+never grows worker memory or stalls delivery to others.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import Iterable, Optional
+
+import redis.asyncio as redis
+
+from app.core import settings
+from app.core.metrics import Counter, Gauge
+from app.services.geo import tile_for
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "map"
+VERSION_KEY = "map:version"  # bumped with every published batch so in-memory snapshots know to reload
+EVENT_TYPES = ("location.upserted", "location.deactivated", "location.sold_out")
+RESYNC = json.dumps({"type": "resync"})
+
+LIVE_SUBSCRIBERS = Gauge("live_map_subscribers", "WebSocket clients connected to this worker's live map hub.")
+LIVE_CHANNELS = Gauge("live_map_channels", "Geotile channels this worker is subscribed to.")
+LIVE_DELIVERED = Counter("live_map_messages_delivered_total", "Live map messages queued for local subscribers.")
+LIVE_RESYNCS = Counter("live_map_resyncs_total", "Subscriber backlogs dropped in favour of a resync.")
+
+
+def tile_channel(x: int, y: int, zoom: Optional[int] = None) -> str:
+    return f"{CHANNEL_PREFIX}:{settings.live_map_zoom if zoom is None else zoom}:{x}:{y}"
+
+
+def user_claims_channel(user_id) -> str:
+    """Per-user channel carrying the ids of locations the user just claimed."""
+    return f"user:{user_id}:claims"
+
+
+def channel_for(latitude: float, longitude: float) -> str:
+    return tile_channel(*tile_for(latitude, longitude, settings.live_map_zoom))
+
+
+def channels_around(latitude: float, longitude: float, ring: int = 1) -> set[str]:
+    """The tile containing the coordinate plus `ring` tiles on every side."""
+    zoom = settings.live_map_zoom
+    n = 1 << zoom
+    cx, cy = tile_for(latitude, longitude, zoom)
+    return {
+        tile_channel((cx + dx) % n, cy + dy)
+        for dx in range(-ring, ring + 1)
+        for dy in range(-ring, ring + 1)
+        if 0 <= cy + dy < n
+    }
+
+
+def location_event(event_type: str, location) -> dict:
+    """Event payload for a `Location` (or any object with the same attributes)."""
+    return {
+        "type": event_type,
+        "location_id": str(location.id),
+        "latitude": location.latitude,
+        "longitude": location.longitude,
+        "name": location.name,
+        "radius_m": location.radius_m,
+        "city": location.city,
+        "sponsor_id": str(location.sponsor_id) if location.sponsor_id else None,
+        "is_active": location.is_active,
+    }
+
+
+async def publish_location_events(redis_client: redis.Redis, events: Iterable[dict]) -> int:
+    """PUBLISH events (from `location_event`) on their tile channels in one round trip."""
+    pipe = redis_client.pipeline(transaction=False)
+    count = 0
+    for event in events:
+        pipe.publish(channel_for(event["latitude"], event["longitude"]), json.dumps(event))
+        count += 1
+    if count:
+        pipe.incr(VERSION_KEY)
+        await pipe.execute()
+    return count
+
+
+class Subscriber:
+    """One connected client: the channels it watches and its bounded outbound queue."""
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize)
+        self.channels: set[str] = set()
+
+    def offer(self, message: str) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # drop the backlog: one resync replaces everything the client missed
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+            LIVE_RESYNCS.inc()
+
+
+class LiveMapHub:
+    """Per-worker fan-out from one Redis pub/sub connection to local subscribers."""
+
+    def __init__(self, redis_client: redis.Redis):
+        self.redis = redis_client
+        self.pubsub = redis_client.pubsub()
+        self.subscribers: dict[str, set[Subscriber]] = defaultdict(set)
+        self._lock = asyncio.Lock()
+        self._reader: Optional[asyncio.Task] = None
+
+    async def set_channels(self, subscriber: Subscriber, channels: set[str]) -> None:
+        """Point `subscriber` at exactly `channels`, (un)subscribing Redis only on first/last interest."""
+        async with self._lock:
+            added = channels - subscriber.channels
+            removed = subscriber.channels - channels
+            new_channels = [ch for ch in added if not self.subscribers.get(ch)]
+            for ch in added:
+                self.subscribers[ch].add(subscriber)
+            dead_channels = []
+            for ch in removed:
+                self.subscribers[ch].discard(subscriber)
+                if not self.subscribers[ch]:
+                    del self.subscribers[ch]
+                    dead_channels.append(ch)
+            subscriber.channels = set(channels)
+
+            if new_channels:
+                await self.pubsub.subscribe(*new_channels)
+            if dead_channels:
+                await self.pubsub.unsubscribe(*dead_channels)
+            LIVE_CHANNELS.set(len(self.subscribers))
+            if self._reader is None and new_channels:
+                self._reader = asyncio.create_task(self._read())
+
+    def attach(self, subscriber: Subscriber) -> None:
+        LIVE_SUBSCRIBERS.inc()
+
+    async def detach(self, subscriber: Subscriber) -> None:
+        await self.set_channels(subscriber, set())
+        LIVE_SUBSCRIBERS.dec()
+
+    def dispatch(self, channel: str, data: str) -> None:
+        for subscriber in self.subscribers.get(channel, ()):
+            subscriber.offer(data)
+            LIVE_DELIVERED.inc()
+
+    async def _read(self) -> None:
+        while True:
+            try:
+                message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # events may have been missed while disconnected: everyone refetches
+                logger.exception("Live map pub/sub read failed; asking subscribers to resync")
+                for subscribers in list(self.subscribers.values()):
+                    for subscriber in subscribers:
+                        subscriber.offer(RESYNC)
+                await asyncio.sleep(1.0)
+                continue
+            if message is not None and message["type"] == "message":
+                self.dispatch(message["channel"], message["data"])
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+        await self.pubsub.aclose()
+
+
+_hub: Optional[LiveMapHub] = None
+
+
+def get_hub() -> LiveMapHub:
+    """This worker's hub, created on first use."""
+    global _hub
+    if _hub is None:
+        from app.core.redis import redis_client
+
+        _hub = LiveMapHub(redis_client)
+    return _hub
+
+
+async def close_hub() -> None:
+    global _hub
+    if _hub is not None:
+        await _hub.close()
+        _hub = None
@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
+import uuid
 from typing import Optional
 
+from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.models.location import Location
-from app.services.geo import haversine_distance
+from app.services.geo import bounding_box, haversine_distance
 
 
 async def get_nearby_locations(
@@ -23,19 +25,24 @@ async def get_nearby_locations(
     Return active locations within `radius_km` of the given coordinate.
     Each result includes the computed distance in meters and reward template info.
 
-    Uses in-Python Haversine filtering (sufficient for MVP; replace with
-    PostGIS ST_DWithin for scale).
+    Only the lat/lon box around the circle is loaded (a range scan on the
+    partial `(latitude, longitude)` index of active rows); the exact
+    Haversine check then runs in Python on those candidates alone.
     """
-    stmt = select(Location).where(Location.is_active.is_(True)).options(
-        selectinload(Location.reward_template)
-    )
+    radius_m = radius_km * 1000
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_m)
+
+    stmt = select(Location).where(
+        Location.is_active.is_(True), Location.latitude.between(min_lat, max_lat)
+    ).options(selectinload(Location.reward_template))
+    if min_lon is not None:
+        stmt = stmt.where(Location.longitude.between(min_lon, max_lon))
     if city:
         stmt = stmt.where(Location.city == city)
 
     result = await db.execute(stmt)
     locations = result.scalars().all()
 
-    radius_m = radius_km * 1000
     nearby: list[dict] = []
 
     for loc in locations:
@@ -49,3 +56,10 @@ async def get_nearby_locations(
     # Sort by distance ascending
     nearby.sort(key=lambda x: x["distance_m"])
     return nearby
+
+
+async def ensure_sponsor_location(db: AsyncSession, sponsor_id: uuid.UUID, location_id: uuid.UUID) -> None:
+    """Raise 404 unless `location_id` exists and belongs to the sponsor."""
+    result = await db.execute(select(Location.sponsor_id).where(Location.id == location_id))
+    if result.scalar_one_or_none() != sponsor_id:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Location not found")
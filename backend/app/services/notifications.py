@@ -0,0 +1,182 @@
+"""Push notifications – last-known positions and pluggable send transports.
+
+Positions live in a Redis GEO set (`geo:users`) plus a `geo:users:seen`
+ZSET of when each was reported, so "who is near this point" is a
+GEOSEARCH rather than a scan of `users`. Positions are refreshed by claims,
+and by map fetches and proximity streams at most once per
+`push_position_interval_seconds`; `prune_positions` drops those older than
+`push_position_max_age_days`.
+
+A transport takes one batch of at most `push_batch_size` messages and
+reports, per token, whether it was sent, is dead (clear it) or should be
+retried. `FcmTransport` wraps `firebase_admin.messaging`; `StubTransport`
+records batches locally for tests and load runs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Optional, Protocol
+
+import redis.asyncio as redis
+
+from app.core import settings
+
+POSITIONS_KEY = "geo:users"
+SEEN_KEY = "geo:users:seen"
+MAX_THROTTLED_USERS = 100_000  # users whose last map-fetch position write one process remembers
+
+_map_positions: dict[uuid.UUID, float] = {}  # user id -> monotonic time of the last write, oldest first
+
+
+# ---- Last-known positions ----
+
+def record_position(pipe: redis.client.Pipeline, user_id: uuid.UUID, latitude: float, longitude: float,
+                    at: Optional[float] = None) -> None:
+    """Queue a position update on `pipe` (GEOADD rejects |lat| > 85.05, so clamp first)."""
+    member = str(user_id)
+    latitude = max(min(latitude, 85.05), -85.05)
+    pipe.geoadd(POSITIONS_KEY, (longitude, latitude, member))
+    pipe.zadd(SEEN_KEY, {member: at if at is not None else time.time()})
+
+
+def map_position_due(user_id: uuid.UUID, now: Optional[float] = None) -> bool:
+    """Whether a map fetch should write the user's position (per process, like the proximity stream's throttle)."""
+    now = time.monotonic() if now is None else now
+    last = _map_positions.pop(user_id, None)
+    if last is not None and now - last < settings.push_position_interval_seconds:
+        _map_positions[user_id] = last
+        return False
+    if len(_map_positions) >= MAX_THROTTLED_USERS:
+        del _map_positions[next(iter(_map_positions))]
+    _map_positions[user_id] = now
+    return True
+
+
+async def prune_positions(redis_client: redis.Redis, max_age_days: Optional[float] = None,
+                          batch: int = 10_000) -> int:
+    """Forget positions not refreshed within `max_age_days`; returns how many were dropped."""
+    cutoff = time.time() - 86400 * (max_age_days if max_age_days is not None else settings.push_position_max_age_days)
+    dropped = 0
+    while True:
+        stale = await redis_client.zrangebyscore(SEEN_KEY, "-inf", cutoff, start=0, num=batch)
+        if not stale:
+            return dropped
+        pipe = redis_client.pipeline()
+        pipe.zrem(POSITIONS_KEY, *stale)
+        pipe.zrem(SEEN_KEY, *stale)
+        await pipe.execute()
+        dropped += len(stale)
+
+
+# ---- Messages and transports ----
+
+@dataclass(frozen=True, slots=True)
+class PushMessage:
+    token: str
+    title: str
+    body: str
+    data: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class SendReport:
+    sent: int = 0
+    invalid: list[str] = field(default_factory=list)  # tokens the provider says are dead
+    retry: list[PushMessage] = field(default_factory=list)  # throttled / transient failures
+    failed: int = 0  # permanent failures for live tokens (bad payload etc.)
+    retry_after: Optional[float] = None  # seconds the provider asked us to wait
+
+
+class PushTransport(Protocol):
+    async def send(self, messages: list[PushMessage]) -> SendReport: ...
+
+
+class StubTransport:
+    """Records batches instead of sending; optionally throttles a fraction to exercise retries."""
+
+    def __init__(self, latency: float = 0.0, throttle_rate: float = 0.0, invalid_tokens: frozenset[str] = frozenset()):
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.invalid_tokens = invalid_tokens
+        self.batches: list[list[PushMessage]] = []
+        self.delivered: list[PushMessage] = []
+
+    async def send(self, messages: list[PushMessage]) -> SendReport:
+        self.batches.append(messages)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        report = SendReport()
+        for message in messages:
+            if message.token in self.invalid_tokens:
+                report.invalid.append(message.token)
+            elif random.random() < self.throttle_rate:
+                report.retry.append(message)
+                report.retry_after = 0.0
+            else:
+                report.sent += 1
+                self.delivered.append(message)
+        return report
+
+
+class FcmTransport:
+    """Firebase Cloud Messaging via `send_each_for_multicast` (HTTP v1, up to 500 tokens per call)."""
+
+    async def send(self, messages: list[PushMessage]) -> SendReport:
+        return await asyncio.to_thread(self._send, messages)
+
+    def _send(self, messages: list[PushMessage]) -> SendReport:
+        from firebase_admin import exceptions, messaging
+
+        from app.core.security import init_firebase
+
+        init_firebase()
+        report = SendReport()
+        # one multicast per distinct payload; a fan-out batch normally shares one
+        groups: dict[tuple, list[PushMessage]] = {}
+        for message in messages:
+            groups.setdefault((message.title, message.body, tuple(sorted(message.data.items()))), []).append(message)
+
+        for (title, body, data), group in groups.items():
+            response = messaging.send_each_for_multicast(messaging.MulticastMessage(
+                tokens=[m.token for m in group],
+                notification=messaging.Notification(title=title, body=body),
+                data=dict(data),
+            ))
+            for message, result in zip(group, response.responses):
+                error = result.exception
+                if result.success:
+                    report.sent += 1
+                elif isinstance(error, (messaging.UnregisteredError, messaging.SenderIdMismatchError)):
+                    report.invalid.append(message.token)
+                elif isinstance(error, (messaging.QuotaExceededError, exceptions.UnavailableError,
+                                        exceptions.InternalError, exceptions.DeadlineExceededError)):
+                    report.retry.append(message)
+                    retry_after = _retry_after(error)
+                    if retry_after is not None:
+                        report.retry_after = max(report.retry_after or 0.0, retry_after)
+                else:
+                    report.failed += 1
+        return report
+
+
+def _retry_after(error) -> Optional[float]:
+    response = getattr(error, "http_response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def make_transport(kind: Optional[str] = None) -> PushTransport:
+    kind = kind or settings.push_transport
+    if kind == "fcm":
+        return FcmTransport()
+    if kind == "stub":
+        return StubTransport()
+    raise ValueError(f"Unknown push transport: {kind}")
@@ -0,0 +1,174 @@
+"""Weighted prize tables – O(1) draws with Walker's alias method.
+
+A template with a prize table (`has_prizes`) awards one prize drawn by
+weight from `reward_prizes` instead of its fixed reward. Each process keeps
+an alias table per template: built once in O(n) (Vose's method) from the
+in-stock prizes and reused until the template's `prize_version` changes.
+Every edit of the table bumps it in SQL – it never goes back, even when a
+table is emptied – so a cached table can never pass for a later one. A draw
+is one random number and two list lookups however many prizes there are.
+
+Stock limits are enforced in the database: drawing a limited prize takes
+one conditional `awarded = awarded + 1 WHERE awarded < stock` in the claim's
+transaction, so concurrent claims can never over-award it and a rolled-back
+claim gives the unit back. Unlimited prizes (the common "89% points" case)
+skip that write entirely. When a limited prize turns out to be gone, it is
+dropped from this process's table and the draw repeats among the rest.
+"""
+
+from __future__ import annotations
+
+import random
+import uuid
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.reward_prize import RewardPrize
+from app.models.reward_template import RewardTemplate
+
+MAX_CACHED_TABLES = 10_000  # templates whose alias table one process keeps
+
+
+class AliasTable:
+    """Walker/Vose alias table over `weights` (non-negative, at least one positive)."""
+
+    __slots__ = ("prob", "alias", "n")
+
+    def __init__(self, weights: Sequence[float]):
+        n = len(weights)
+        total = float(sum(weights))
+        if n == 0 or total <= 0 or any(w < 0 for w in weights):
+            raise ValueError("Prize weights must be non-negative with a positive total")
+
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        while small and large:
+            s, big = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = big
+            scaled[big] += scaled[s] - 1.0
+            (small if scaled[big] < 1.0 else large).append(big)
+        # whatever is left is 1 up to rounding error
+        self.n = n
+
+    def sample(self, rng: random.Random = random) -> int:
+        """Index of one outcome: pick a column uniformly, then it or its alias (one random number)."""
+        u = rng.random() * self.n
+        column = int(u)
+        return column if u - column < self.prob[column] else self.alias[column]
+
+
+@dataclass(frozen=True)
+class Prize:
+    """Snapshot of a `RewardPrize` (safe to cache across sessions)."""
+    id: uuid.UUID
+    reward_type: str
+    reward_value: int
+    reward_description: Optional[str]
+    weight: float
+    limited: bool
+
+
+@dataclass(frozen=True)
+class PrizeTable:
+    version: int
+    prizes: tuple[Prize, ...]
+    alias: Optional[AliasTable]  # None when nothing is left in stock
+
+    @classmethod
+    def build(cls, version: int, prizes: Sequence[Prize]) -> PrizeTable:
+        prizes = tuple(p for p in prizes if p.weight > 0)
+        return cls(version, prizes, AliasTable([p.weight for p in prizes]) if prizes else None)
+
+    def without(self, prize_id: uuid.UUID) -> PrizeTable:
+        return PrizeTable.build(self.version, [p for p in self.prizes if p.id != prize_id])
+
+
+_tables: dict[uuid.UUID, PrizeTable] = {}
+
+
+async def prize_table(db: AsyncSession, template: RewardTemplate) -> PrizeTable:
+    """The template's cached alias table, rebuilt from the in-stock prizes when its version moved."""
+    cached = _tables.get(template.id)
+    if cached is not None and cached.version == template.prize_version:
+        return cached
+
+    result = await db.execute(
+        select(RewardPrize).where(RewardPrize.reward_template_id == template.id).order_by(RewardPrize.id)
+    )
+    table = PrizeTable.build(template.prize_version, [
+        Prize(p.id, p.reward_type, p.reward_value, p.reward_description, p.weight, p.stock is not None)
+        for p in result.scalars() if p.in_stock
+    ])
+    if cached is None and len(_tables) >= MAX_CACHED_TABLES:
+        del _tables[next(iter(_tables))]
+    _tables[template.id] = table
+    return table
+
+
+async def draw_prize(db: AsyncSession, template: RewardTemplate, rng: random.Random = random) -> Optional[Prize]:
+    """Draw one prize for a claim, taking a unit of stock if it is limited; None when all are gone."""
+    table = await prize_table(db, template)
+    while table.alias is not None:
+        prize = table.prizes[table.alias.sample(rng)]
+        if not prize.limited:
+            return prize
+        result = await db.execute(
+            update(RewardPrize)
+            .where(RewardPrize.id == prize.id, RewardPrize.awarded < RewardPrize.stock)
+            .values(awarded=RewardPrize.awarded + 1)
+            .returning(RewardPrize.id)
+        )
+        if result.scalar_one_or_none() is not None:
+            return prize
+        table = _tables[template.id] = table.without(prize.id)
+    return None
+
+
+async def replace_prizes(db: AsyncSession, template: RewardTemplate, items: Sequence[dict]) -> list[RewardPrize]:
+    """
+    Make `items` the template's prize table. Items carrying the `id` of an
+    existing prize update it in place (keeping its `awarded` count); other
+    existing prizes are removed. An empty list turns the template back into a
+    fixed reward. Bumps `prize_version` so every process rebuilds its table.
+    """
+    # bumping first also locks the template row: concurrent edits apply one after the other
+    bumped = await db.execute(
+        update(RewardTemplate)
+        .where(RewardTemplate.id == template.id)
+        .values(prize_version=RewardTemplate.prize_version + 1, has_prizes=bool(items))
+        .returning(RewardTemplate.prize_version)
+        .execution_options(synchronize_session=False)
+    )
+    set_committed_value(template, "prize_version", bumped.scalar_one())
+    set_committed_value(template, "has_prizes", bool(items))
+
+    result = await db.execute(select(RewardPrize).where(RewardPrize.reward_template_id == template.id))
+    existing = {p.id: p for p in result.scalars()}
+
+    prizes = []
+    for item in items:
+        fields = {k: v for k, v in item.items() if k != "id"}
+        prize = existing.pop(item.get("id"), None) if item.get("id") else None
+        if item.get("id") and prize is None:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, f"Prize {item['id']} is not part of this template")
+        if prize is None:
+            prize = RewardPrize(reward_template_id=template.id, awarded=0, **fields)
+            db.add(prize)
+        else:
+            for key, value in fields.items():
+                setattr(prize, key, value)
+        prizes.append(prize)
+    if existing:
+        await db.execute(delete(RewardPrize).where(RewardPrize.id.in_(list(existing))))
+
+    await db.flush()
+    return prizes
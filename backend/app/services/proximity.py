@@ -0,0 +1,257 @@
+"""Hot/cold proximity – nearest unclaimed treasure from an in-memory snapshot.
+
+Each worker keeps a `LocationIndex` of active, rewardable locations bucketed
+into a fixed-degree grid, so a position update is a ring search over a few
+cells plus haversine on the candidates – no Postgres, no Redis. The snapshot
+is swapped out wholesale when `live_map.VERSION_KEY` changes (checked every
+`proximity_refresh_seconds`) and at least every `FULL_RELOAD_SECONDS`.
+
+A walker's claimed set is loaded once per connection; claims made while
+connected arrive on the user's claims channel through the live map hub.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import redis.asyncio as redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import settings
+from app.core.metrics import Counter, Gauge
+from app.models.claim_log import ClaimLog
+from app.models.location import Location
+from app.models.reward_template import RewardTemplate
+from app.services.geo import haversine_distance, initial_bearing
+from app.services.live_map import VERSION_KEY
+
+logger = logging.getLogger(__name__)
+
+CELL_DEGREES = 0.01  # grid cell edge; ~1.1 km of latitude
+METERS_PER_DEGREE = 111_320.0
+FULL_RELOAD_SECONDS = 600.0  # reload even without a version bump (catches writes that didn't publish)
+
+PROXIMITY_WALKERS = Gauge("proximity_walkers", "Connected hot/cold proximity streams on this worker.")
+PROXIMITY_UPDATES = Counter("proximity_updates_total", "Position updates answered by the proximity stream.")
+PROXIMITY_DROPPED = Counter("proximity_updates_dropped_total", "Position updates ignored for arriving too fast.")
+PROXIMITY_INDEX_SIZE = Gauge(
+    "proximity_index_locations", "Locations in this worker's proximity snapshot.",
+    collect=lambda: {(): _index.index.size if _index is not None else 0},
+)
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedLocation:
+    id: str
+    latitude: float
+    longitude: float
+    radius_m: int
+
+
+@dataclass(frozen=True, slots=True)
+class Nearest:
+    location: IndexedLocation
+    distance_m: float
+
+
+def _cell(latitude: float, longitude: float) -> tuple[int, int]:
+    return math.floor(latitude / CELL_DEGREES), math.floor(longitude / CELL_DEGREES)
+
+
+class LocationIndex:
+    """Immutable grid of locations; rebuilt rather than mutated."""
+
+    def __init__(self, locations: Iterable[IndexedLocation] = ()):
+        cells: dict[tuple[int, int], list[IndexedLocation]] = defaultdict(list)
+        count = 0
+        for location in locations:
+            cells[_cell(location.latitude, location.longitude)].append(location)
+            count += 1
+        self.cells = dict(cells)
+        self.size = count
+
+    def nearest(
+        self, latitude: float, longitude: float, exclude: frozenset[str] | set[str] = frozenset(),
+        max_distance_m: float = 50_000.0,
+    ) -> Optional[Nearest]:
+        """Closest location within `max_distance_m` not in `exclude`, searching outward ring by ring."""
+        if not self.cells:
+            return None
+        ci, cj = _cell(latitude, longitude)
+        # smallest ground distance a cell can span within the search area (longitude cells shrink poleward)
+        widest_lat = min(abs(latitude) + max_distance_m / METERS_PER_DEGREE, 89.9)
+        cell_m = CELL_DEGREES * METERS_PER_DEGREE * max(math.cos(math.radians(widest_lat)), 0.01)
+        max_ring = int(max_distance_m / cell_m) + 1
+
+        # rank candidates by equirectangular distance (accurate to well under 0.1% at these ranges, no trig
+        # per candidate); only the winner gets a haversine
+        kx = METERS_PER_DEGREE * math.cos(math.radians(latitude))
+        max_d2 = max_distance_m * max_distance_m
+        best: Optional[IndexedLocation] = None
+        best_d2 = math.inf
+        for ring in range(max_ring + 1):
+            for cell in _ring_cells(ci, cj, ring):
+                for location in self.cells.get(cell, ()):
+                    dy = (location.latitude - latitude) * METERS_PER_DEGREE
+                    dx = (location.longitude - longitude) * kx
+                    d2 = dx * dx + dy * dy
+                    if d2 < best_d2 and d2 <= max_d2 and location.id not in exclude:
+                        best, best_d2 = location, d2
+            # anything in ring + 1 is at least `ring` whole cells away
+            if best is not None and best_d2 <= (ring * cell_m) ** 2:
+                break
+        if best is None:
+            return None
+        return Nearest(best, haversine_distance(latitude, longitude, best.latitude, best.longitude))
+
+
+def _ring_cells(ci: int, cj: int, ring: int) -> Iterable[tuple[int, int]]:
+    if ring == 0:
+        yield ci, cj
+        return
+    for dj in range(-ring, ring + 1):
+        yield ci - ring, cj + dj
+        yield ci + ring, cj + dj
+    for di in range(-ring + 1, ring):
+        yield ci + di, cj - ring
+        yield ci + di, cj + ring
+
+
+async def load_index(db: AsyncSession) -> LocationIndex:
+    """Snapshot of active locations that still hand out a reward."""
+    result = await db.execute(
+        select(Location.id, Location.latitude, Location.longitude, Location.radius_m)
+        .join(RewardTemplate, RewardTemplate.location_id == Location.id)
+        .where(Location.is_active.is_(True), RewardTemplate.is_active.is_(True))
+    )
+    return LocationIndex(IndexedLocation(str(row.id), row.latitude, row.longitude, row.radius_m) for row in result)
+
+
+async def load_claimed(db: AsyncSession, user_id: uuid.UUID) -> set[str]:
+    result = await db.execute(select(ClaimLog.location_id).where(ClaimLog.user_id == user_id))
+    return {str(location_id) for location_id in result.scalars()}
+
+
+class ProximityIndex:
+    """This worker's current `LocationIndex` and the task keeping it fresh."""
+
+    def __init__(self, redis_client: redis.Redis, session_factory):
+        self.redis = redis_client
+        self.session_factory = session_factory
+        self.index = LocationIndex()
+        self.version: Optional[str] = None
+        self.loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresher: Optional[asyncio.Task] = None
+
+    async def reload(self, version: Optional[str]) -> None:
+        async with self.session_factory() as db:
+            index = await load_index(db)
+        self.index, self.version, self.loaded_at = index, version, time.monotonic()
+
+    async def ensure_loaded(self) -> LocationIndex:
+        """Load the first snapshot (once, however many walkers connect at once) and start refreshing."""
+        if self._refresher is None:
+            async with self._lock:
+                if self._refresher is None:
+                    await self.reload(await self.redis.get(VERSION_KEY))
+                    self._refresher = asyncio.create_task(self._refresh())
+        return self.index
+
+    async def _refresh(self) -> None:
+        while True:
+            await asyncio.sleep(settings.proximity_refresh_seconds)
+            try:
+                version = await self.redis.get(VERSION_KEY)
+                if version != self.version or time.monotonic() - self.loaded_at > FULL_RELOAD_SECONDS:
+                    await self.reload(version)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Proximity snapshot refresh failed; keeping the previous one")
+
+    async def close(self) -> None:
+        if self._refresher is not None:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+
+
+class Walker:
+    """One player's stream: claimed set, last target and the hot/cold trend."""
+
+    def __init__(self, claimed: set[str]):
+        self.claimed = claimed
+        self.target: Optional[str] = None
+        self.last_distance: Optional[float] = None
+        self.last_update = 0.0
+
+    def throttled(self, now: float) -> bool:
+        """True when this update arrived sooner than `proximity_min_interval_ms` after the last answered one."""
+        if (now - self.last_update) * 1000 < settings.proximity_min_interval_ms:
+            PROXIMITY_DROPPED.inc()
+            return True
+        self.last_update = now
+        return False
+
+    def update(self, index: LocationIndex, latitude: float, longitude: float) -> dict:
+        PROXIMITY_UPDATES.inc()
+        found = index.nearest(latitude, longitude, self.claimed, settings.proximity_max_km * 1000)
+        if found is None:
+            self.target = self.last_distance = None
+            return {"type": "proximity", "location_id": None}
+
+        location, distance = found.location, found.distance_m
+        if location.id != self.target:
+            signal = "new"
+        elif distance < self.last_distance - settings.proximity_signal_meters:
+            signal = "hotter"
+        elif distance > self.last_distance + settings.proximity_signal_meters:
+            signal = "colder"
+        else:
+            signal = "steady"
+        if signal != "steady":
+            # trend is measured from the last reported change, so GPS jitter doesn't flip-flop
+            self.target, self.last_distance = location.id, distance
+
+        return {
+            "type": "proximity",
+            "location_id": location.id,
+            "distance_m": round(distance, 1),
+            "bearing_deg": round(initial_bearing(latitude, longitude, location.latitude, location.longitude), 1),
+            "signal": signal,
+            "in_range": distance <= location.radius_m,
+        }
+
+
+_index: Optional[ProximityIndex] = None
+
+
+def get_proximity_index() -> ProximityIndex:
+    """This worker's index, created on first use."""
+    global _index
+    if _index is None:
+        from app.core.database import async_session_factory
+        from app.core.redis import redis_client
+
+        _index = ProximityIndex(redis_client, async_session_factory)
+    return _index
+
+
+async def close_proximity_index() -> None:
+    global _index
+    if _index is not None:
+        await _index.close()
+        _index = None
+
@@ -0,0 +1,38 @@
+"""Analytics background tasks (periodic jobs on the `analytics` queue)."""
+
+from app.core import settings
+from app.core.database import async_session_factory
+from app.core.redis import redis_bytes_client
+from app.services.analytics_service import refresh_claim_rollups
+from app.services.heatmap import refresh_heatmap_tiles
+from app.services.unique_visitors import snapshot_unique_visitors
+from app.tasks.queue import task
+
+EVERY = settings.jobs_analytics_interval_seconds
+
+
+@task(queue="analytics", every=EVERY)
+async def refresh_rollups() -> int:
+    """Fold newly inserted claims into the hourly/daily rollups in one transaction."""
+    async with async_session_factory() as db:
+        folded = await refresh_claim_rollups(db)
+        await db.commit()
+    return folded
+
+
+@task(queue="analytics", every=EVERY)
+async def snapshot_unique_counters() -> int:
+    """Copy today's and yesterday's HyperLogLog counters from Redis to Postgres."""
+    async with async_session_factory() as db:
+        written = await snapshot_unique_visitors(db, redis_bytes_client)
+        await db.commit()
+    return written
+
+
+@task(queue="analytics", every=EVERY)
+async def refresh_heatmaps() -> int:
+    """Bin newly inserted claims into the precomputed heatmap tiles."""
+    async with async_session_factory() as db:
+        binned = await refresh_heatmap_tiles(db)
+        await db.commit()
+    return binned
@@ -0,0 +1,30 @@
+"""Campaign window scheduler (a periodic job on the default queue)."""
+
+import logging
+
+from app.core import settings
+from app.core.database import async_session_factory
+from app.core.redis import redis_client
+from app.services.campaigns import apply_campaign_windows
+from app.services.live_map import publish_location_events
+from app.tasks.queue import task
+
+logger = logging.getLogger(__name__)
+
+PUBLISH_BATCH = 1000  # events per pipelined PUBLISH round trip
+
+
+@task(every=settings.campaign_scheduler_seconds, max_attempts=1, timeout=600)
+async def flip_campaign_windows() -> int:
+    """Open and close campaign windows that passed since the last run; returns templates flipped."""
+    async with async_session_factory() as db:
+        changes = await apply_campaign_windows(db)
+        await db.commit()
+    # after the commit, so clients refetching on an event see the new state;
+    # each batch also bumps map:version, which reloads the proximity snapshots
+    for start in range(0, len(changes.events), PUBLISH_BATCH):
+        await publish_location_events(redis_client, changes.events[start:start + PUBLISH_BATCH])
+    flipped = len(changes.started) + len(changes.ended)
+    if flipped:
+        logger.info("Campaign windows: %d templates started, %d ended", len(changes.started), len(changes.ended))
+    return flipped
@@ -0,0 +1,220 @@
+"""Offline fraud audit over the whole claim history (features in app.services.fraud_audit).
+
+The user-id space is cut into equal UUID ranges – user ids are random
+UUIDv4, so the ranges fill evenly – and each range is audited in its own
+process: its claims are streamed in (user, time) order through a
+server-side cursor `STREAM_CHUNK` rows at a time into column arrays,
+location pins are joined from an in-memory table, and flagged users are
+upserted into `fraud_reviews` (keeping any review status already set).
+
+Peak memory per process is one range's claims at ~150 bytes a row
+(columns plus feature temporaries), so the range count is sized from the
+table estimate to keep each near `fraud_audit_partition_rows`; 100M claims
+at the default 2M is 50 ranges of ~300 MB, spread over
+`fraud_audit_workers` cores.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import settings
+from app.core.database import async_session_factory, engine
+from app.models.claim_log import ClaimLog
+from app.models.fraud_review import FraudReview
+from app.models.location import Location
+from app.services.fraud_audit import COORD_SCALE, REASONS, audit_block, coordinate_keys
+from app.tasks.queue import task
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNK = 50_000  # claim rows per server-side cursor round trip
+UPSERT_BATCH = 1000  # review rows per INSERT ... ON CONFLICT
+
+_shared_keys: Optional[np.ndarray] = None  # set in each worker process by `_init_worker`
+
+
+@dataclass
+class AuditReport:
+    partitions: int = 0
+    claims: int = 0
+    users: int = 0
+    flagged: dict[str, int] = field(default_factory=lambda: dict.fromkeys(REASONS, 0))
+    elapsed: float = 0.0
+
+
+def user_ranges(partitions: int) -> list[tuple[uuid.UUID, Optional[uuid.UUID]]]:
+    """Split the UUID space into `partitions` half-open `[low, high)` ranges (the last is open-ended)."""
+    bounds = [uuid.UUID(int=(i << 128) // partitions) for i in range(partitions)]
+    return list(zip(bounds, bounds[1:] + [None]))
+
+
+async def load_shared_points(db: AsyncSession) -> np.ndarray:
+    """Sorted `coordinate_keys` of every point (at 1e-6°) claimed from by more than one user."""
+    import numpy as np
+
+    # min <> max is a cheaper "more than one distinct user" than count(DISTINCT ...)
+    result = await db.execute(text(
+        "SELECT round(latitude * :scale) / :scale, round(longitude * :scale) / :scale FROM claim_logs "
+        "GROUP BY 1, 2 HAVING min(user_id::text) <> max(user_id::text)"
+    ), {"scale": COORD_SCALE})
+    rows = result.all()
+    lat = np.fromiter((r[0] for r in rows), dtype=np.float64, count=len(rows))
+    lon = np.fromiter((r[1] for r in rows), dtype=np.float64, count=len(rows))
+    return np.unique(coordinate_keys(lat, lon))
+
+
+async def estimate_claims(db: AsyncSession) -> int:
+    """Planner estimate of the claim_logs row count (a count(*) would scan the table)."""
+    estimate = (await db.execute(text("SELECT reltuples FROM pg_class WHERE relname = 'claim_logs'"))).scalar()
+    return max(int(estimate or 0), 0)
+
+
+async def _load_pins(db: AsyncSession) -> tuple[dict[uuid.UUID, int], np.ndarray, np.ndarray]:
+    import numpy as np
+
+    rows = (await db.execute(select(Location.id, Location.latitude, Location.longitude))).all()
+    index = {r.id: i for i, r in enumerate(rows)}
+    # a trailing NaN pin for locations created after the load: NaN never matches "exact"
+    lat = np.array([r.latitude for r in rows] + [np.nan], dtype=np.float64)
+    lon = np.array([r.longitude for r in rows] + [np.nan], dtype=np.float64)
+    return index, lat, lon
+
+
+async def _upsert_reviews(db: AsyncSession, rows: list[dict]) -> None:
+    for start in range(0, len(rows), UPSERT_BATCH):
+        stmt = pg_insert(FraudReview).values(rows[start:start + UPSERT_BATCH])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FraudReview.user_id, FraudReview.reason],
+            set_={
+                "score": stmt.excluded.score,
+                "claim_ids": stmt.excluded.claim_ids,
+                "details": stmt.excluded.details,
+                "audited_at": func.now(),
+            },
+        )
+        await db.execute(stmt)
+
+
+async def audit_range(db: AsyncSession, low: uuid.UUID, high: Optional[uuid.UUID],
+                      shared_keys: np.ndarray) -> AuditReport:
+    """Audit every claim of the users in `[low, high)` and upsert their flags."""
+    import numpy as np
+
+    report = AuditReport(partitions=1)
+    pin_index, pin_lat, pin_lon = await _load_pins(db)
+    missing = len(pin_index)
+
+    user_codes: dict[uuid.UUID, int] = {}
+    columns: dict[str, list[np.ndarray]] = {k: [] for k in ("claim", "user", "time", "lat", "lon", "pin")}
+    stmt = select(
+        ClaimLog.id, ClaimLog.user_id, ClaimLog.claimed_at, ClaimLog.latitude, ClaimLog.longitude,
+        ClaimLog.location_id,
+    ).where(ClaimLog.user_id >= low)
+    if high is not None:
+        stmt = stmt.where(ClaimLog.user_id < high)
+    stream = await db.stream(stmt.order_by(ClaimLog.user_id, ClaimLog.claimed_at).execution_options(
+        yield_per=STREAM_CHUNK
+    ))
+    async for rows in stream.partitions():
+        count = len(rows)
+        columns["claim"].append(np.frombuffer(b"".join(r[0].bytes for r in rows), dtype="V16"))
+        columns["user"].append(np.fromiter(
+            (user_codes.setdefault(r[1], len(user_codes)) for r in rows), dtype=np.int64, count=count
+        ))
+        columns["time"].append(np.fromiter((r[2].timestamp() for r in rows), dtype=np.float64, count=count))
+        columns["lat"].append(np.fromiter((r[3] for r in rows), dtype=np.float64, count=count))
+        columns["lon"].append(np.fromiter((r[4] for r in rows), dtype=np.float64, count=count))
+        columns["pin"].append(np.fromiter((pin_index.get(r[5], missing) for r in rows), dtype=np.int64, count=count))
+        report.claims += count
+
+    if not report.claims:
+        return report
+    arrays = {k: np.concatenate(v) for k, v in columns.items()}
+    del columns
+    report.users = len(user_codes)
+    users_by_code = list(user_codes)
+
+    starts, flags = audit_block(
+        arrays["user"], arrays["time"], arrays["lat"], arrays["lon"],
+        pin_lat[arrays["pin"]], pin_lon[arrays["pin"]], shared_keys,
+    )
+    rows = []
+    for flag in flags:
+        report.flagged[flag.reason] += 1
+        rows.append({
+            "user_id": users_by_code[int(arrays["user"][starts[flag.user_index]])],
+            "reason": flag.reason,
+            "score": flag.score,
+            "claim_ids": [uuid.UUID(bytes=arrays["claim"][i].tobytes()) for i in flag.claim_indices],
+            "details": flag.details,
+            "status": "open",
+        })
+    await _upsert_reviews(db, rows)
+    return report
+
+
+def _init_worker(shared_keys: np.ndarray) -> None:
+    global _shared_keys
+    _shared_keys = shared_keys
+
+
+def _audit_range_process(low: uuid.UUID, high: Optional[uuid.UUID]) -> AuditReport:
+    """Process-pool entry point: one range, one event loop, one short-lived connection pool."""
+    async def run() -> AuditReport:
+        try:
+            async with async_session_factory() as db:
+                report = await audit_range(db, low, high, _shared_keys)
+                await db.commit()
+            return report
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+@task(queue="analytics", every=settings.fraud_audit_interval_hours * 3600, max_attempts=1, timeout=12 * 3600)
+async def audit_claims(partitions: Optional[int] = None, workers: Optional[int] = None) -> AuditReport:
+    """Audit the whole claim history for spoofing patterns; flags land in `fraud_reviews`."""
+    started = time.perf_counter()
+    workers = workers or settings.fraud_audit_workers or os.cpu_count() or 1
+    async with async_session_factory() as db:
+        shared_keys = await load_shared_points(db)
+        if partitions is None:
+            partitions = max(workers, math.ceil(await estimate_claims(db) / settings.fraud_audit_partition_rows))
+
+    report = AuditReport()
+    loop = asyncio.get_running_loop()
+    # spawn, not fork: children must not inherit this process's event loop and pooled connections
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(shared_keys,)) as pool:
+        futures = [loop.run_in_executor(pool, _audit_range_process, low, high) for low, high in user_ranges(partitions)]
+        for future in asyncio.as_completed(futures):
+            part = await future
+            report.partitions += 1
+            report.claims += part.claims
+            report.users += part.users
+            for reason, flagged in part.flagged.items():
+                report.flagged[reason] += flagged
+            logger.info("Fraud audit: %d/%d ranges, %d claims", report.partitions, partitions, report.claims)
+
+    report.elapsed = time.perf_counter() - started
+    logger.info("Fraud audit of %d claims by %d users flagged %s in %.0fs",
+                report.claims, report.users, report.flagged, report.elapsed)
+    return report
@@ -0,0 +1,279 @@
+"""Push notification fan-out tasks.
+
+`notify_nearby_users` tells everyone last seen near a location that it
+exists. Recipients come from a GEOSEARCHSTORE over the last-known-position
+index into a scratch ZSET, which is then read in chunks: each chunk is
+filtered to fresh positions, resolved to FCM tokens with one primary-key
+query and cut into `push_batch_size` batches. A fixed pool of
+`push_concurrency` senders drains a bounded queue of batches, so reading
+recipients never runs far ahead of sending and memory stays flat however
+large the audience is.
+
+Throttled or transiently failed messages are retried with exponential
+backoff (honouring Retry-After) up to `push_max_attempts`; tokens the
+provider reports as dead are cleared from `users` at the end. Run it from
+a worker (`await notify_nearby_users.enqueue(location_id)`), not a request
+handler – a million recipients is ~2,000 batches.
+
+Run as a job, the recipient set is keyed by the job id and the offset sent
+through is checkpointed after every fully sent chunk. A job re-run after
+its worker died (or requeued from the dead letters) picks the same set up
+again and resumes from the checkpoint. At most the chunks that were in
+flight are pushed twice, never the whole audience.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+import redis.asyncio as redis
+from sqlalchemy import select, update
+
+from app.core import settings
+from app.core.database import async_session_factory
+from app.core.metrics import Counter, Histogram
+from app.core.redis import redis_client as default_redis
+from app.models.location import Location
+from app.models.user import User
+from app.services.notifications import (
+    POSITIONS_KEY,
+    SEEN_KEY,
+    PushMessage,
+    PushTransport,
+    make_transport,
+    prune_positions,
+)
+from app.tasks.queue import current_job_id, task
+
+logger = logging.getLogger(__name__)
+
+RECIPIENT_CHUNK = 5000  # members read from the scratch set (and tokens looked up) per round trip
+SCRATCH_TTL = 3600  # seconds before an abandoned recipient set expires
+MAX_BACKOFF = 60.0
+
+PUSH_MESSAGES = Counter("push_messages_total", "Push messages by final outcome.", ("outcome",))
+PUSH_BATCH_DURATION = Histogram(
+    "push_batch_duration_seconds", "Time to send one push batch (one attempt).",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+@dataclass
+class FanoutReport:
+    recipients: int = 0  # users with a fresh position in range
+    batches: int = 0
+    sent: int = 0
+    invalid: int = 0  # dead tokens cleared from users
+    failed: int = 0  # permanent failures plus messages still throttled after the last attempt
+    elapsed: float = 0.0
+
+
+def backoff(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Seconds to wait before retry `attempt` (1-based): full-jitter exponential, never below Retry-After."""
+    delay = random.uniform(0, min(MAX_BACKOFF, settings.push_backoff_seconds * 2 ** (attempt - 1)))
+    return max(delay, retry_after or 0.0)
+
+
+async def send_batch(transport: PushTransport, batch: list[PushMessage], report: FanoutReport,
+                     invalid: list[str]) -> None:
+    """Send one batch, retrying the throttled part of it."""
+    pending = batch
+    for attempt in range(1, settings.push_max_attempts + 1):
+        started = time.perf_counter()
+        try:
+            result = await transport.send(pending)
+        except Exception:
+            # the whole call failed (network, auth): retry everything in it
+            logger.exception("Push batch of %d failed (attempt %d)", len(pending), attempt)
+            retry, retry_after = pending, None
+        else:
+            report.sent += result.sent
+            report.failed += result.failed
+            invalid.extend(result.invalid)
+            PUSH_MESSAGES.inc(("sent",), result.sent)
+            PUSH_MESSAGES.inc(("invalid",), len(result.invalid))
+            PUSH_MESSAGES.inc(("failed",), result.failed)
+            retry, retry_after = result.retry, result.retry_after
+        PUSH_BATCH_DURATION.observe(time.perf_counter() - started)
+
+        if not retry:
+            return
+        pending = retry
+        if attempt < settings.push_max_attempts:
+            await asyncio.sleep(backoff(attempt, retry_after))
+
+    report.failed += len(pending)
+    PUSH_MESSAGES.inc(("gave_up",), len(pending))
+
+
+async def _fresh_members(redis_client: redis.Redis, members: list[str]) -> list[str]:
+    cutoff = time.time() - 86400 * settings.push_position_max_age_days
+    seen = await redis_client.zmscore(SEEN_KEY, members)
+    return [m for m, at in zip(members, seen) if at is not None and at >= cutoff]
+
+
+async def _tokens(user_ids: list[str]) -> list[str]:
+    async with async_session_factory() as db:
+        result = await db.execute(
+            select(User.fcm_token).where(
+                User.id.in_([uuid.UUID(u) for u in user_ids]),
+                User.fcm_token.is_not(None),
+                User.is_active.is_(True),
+            )
+        )
+        return list(dict.fromkeys(result.scalars()))  # two accounts on one device get one push
+
+
+async def clear_tokens(tokens: list[str], chunk: int = 1000) -> None:
+    async with async_session_factory() as db:
+        for start in range(0, len(tokens), chunk):
+            await db.execute(
+                update(User).where(User.fcm_token.in_(tokens[start:start + chunk])).values(fcm_token=None)
+            )
+        await db.commit()
+
+
+async def fan_out(
+    latitude: float,
+    longitude: float,
+    radius_m: float,
+    title: str,
+    body: str,
+    data: Optional[dict[str, str]] = None,
+    transport: Optional[PushTransport] = None,
+    redis_client: Optional[redis.Redis] = None,
+    run_id: Optional[str] = None,
+) -> FanoutReport:
+    """
+    Send one notification to every user last seen within `radius_m` of the point.
+
+    With a `run_id` the recipient set and progress are kept under it until
+    the run completes, and a second call with the same id resumes after the
+    last fully sent chunk.
+    """
+    started = time.perf_counter()
+    transport = transport or make_transport()
+    redis_client = redis_client or default_redis
+    report = FanoutReport()
+    invalid: list[str] = []
+
+    scratch = f"push:recipients:{run_id or uuid.uuid4().hex}"
+    progress_key = f"push:progress:{run_id}" if run_id else None
+    resume_from = 0
+    if run_id and await redis_client.exists(scratch):
+        total = await redis_client.zcard(scratch)
+        resume_from = int(await redis_client.get(progress_key) or 0)
+        logger.warning("Resuming push fan-out %s at %d of %d recipients", run_id, resume_from, total)
+    else:
+        total = await redis_client.geosearchstore(
+            scratch, POSITIONS_KEY, longitude=longitude, latitude=latitude, radius=radius_m, unit="m"
+        )
+    await redis_client.expire(scratch, SCRATCH_TTL)
+
+    batches: asyncio.Queue[Optional[tuple[int, list[PushMessage]]]] = asyncio.Queue(
+        maxsize=settings.push_concurrency * 2
+    )
+    unsettled: dict[int, int] = {}  # chunk offset -> batches not yet sent, oldest chunk first
+    checkpoint = asyncio.Lock()
+    recorded = resume_from
+
+    async def settle(offset: Optional[int] = None) -> None:
+        """Count a batch of chunk `offset` as sent; checkpoint past every chunk now fully sent."""
+        nonlocal recorded
+        if offset is not None:
+            unsettled[offset] -= 1
+        sent_through = None
+        while unsettled and unsettled[oldest := next(iter(unsettled))] == 0:
+            del unsettled[oldest]
+            sent_through = oldest + RECIPIENT_CHUNK
+        if progress_key and sent_through is not None:
+            async with checkpoint:  # senders finish out of order; never move the checkpoint back
+                if sent_through > recorded:
+                    await redis_client.set(progress_key, sent_through, ex=SCRATCH_TTL)
+                    await redis_client.expire(scratch, SCRATCH_TTL)  # outlives a long run
+                    recorded = sent_through
+
+    async def sender() -> None:
+        while (item := await batches.get()) is not None:
+            offset, batch = item
+            try:
+                await send_batch(transport, batch, report, invalid)
+            except Exception:  # a dead sender would eventually block the producer on a full queue
+                logger.exception("Dropping push batch of %d", len(batch))
+                report.failed += len(batch)
+            await settle(offset)
+
+    senders = [asyncio.create_task(sender()) for _ in range(settings.push_concurrency)]
+    completed = False
+    try:
+        for start in range(resume_from, total, RECIPIENT_CHUNK):
+            members = await redis_client.zrange(scratch, start, start + RECIPIENT_CHUNK - 1)
+            members = await _fresh_members(redis_client, members) if members else []
+            tokens = await _tokens(members) if members else []
+            report.recipients += len(members)
+            # counted before any is queued, so the chunk cannot look sent while it is still being cut up
+            unsettled[start] = (len(tokens) + settings.push_batch_size - 1) // settings.push_batch_size
+            if not tokens:
+                await settle()
+            for i in range(0, len(tokens), settings.push_batch_size):
+                batch = [PushMessage(token, title, body, data or {})
+                         for token in tokens[i:i + settings.push_batch_size]]
+                await batches.put((start, batch))  # blocks while every sender is busy: backpressure
+                report.batches += 1
+        for _ in senders:
+            await batches.put(None)
+        await asyncio.gather(*senders)
+        completed = True
+    finally:
+        for task in senders:
+            task.cancel()
+        if completed or not run_id:  # an interrupted run keeps its set and checkpoint to resume from
+            await redis_client.delete(scratch, *([progress_key] if progress_key else []))
+
+    if invalid:
+        await clear_tokens(invalid)
+        report.invalid = len(invalid)
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+# One attempt: a fan-out that raised needs a look before it goes on. Failures land on the dead-letter list;
+# a deliberate `--requeue-dead` (like a dead worker's requeue) resumes from the job's checkpoint.
+@task(queue="notifications", max_attempts=1, timeout=3600)
+async def notify_nearby_users(location_id: uuid.UUID | str, radius_km: Optional[float] = None,
+                              transport: Optional[PushTransport] = None) -> FanoutReport:
+    """Announce a (newly launched) location to players last seen near it."""
+    async with async_session_factory() as db:
+        location = await db.get(Location, uuid.UUID(str(location_id)))
+    if location is None or not location.is_active:
+        raise ValueError(f"Location {location_id} not found or inactive")
+
+    report = await fan_out(
+        location.latitude,
+        location.longitude,
+        (radius_km or settings.push_radius_km) * 1000,
+        title="New treasure nearby!",
+        body=f"{location.name} just appeared near you.",
+        data={"type": "location.launched", "location_id": str(location.id)},
+        transport=transport,
+        run_id=current_job_id.get(),
+    )
+    logger.info(
+        "Notified %d/%d users near %s in %.1fs (%d invalid tokens, %d failed)",
+        report.sent, report.recipients, location.id, report.elapsed, report.invalid, report.failed,
+    )
+    return report
+
+
+@task(queue="notifications", every=86400)
+async def prune_stale_positions() -> int:
+    """Daily: forget last-known positions too old to target."""
+    dropped = await prune_positions(default_redis)
+    logger.info("Pruned %d stale user positions", dropped)
+    return dropped
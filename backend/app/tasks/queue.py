@@ -0,0 +1,328 @@
+"""Lightweight Redis-backed job queue.
+
+Tasks are async functions registered with `@task`; `await fn.enqueue(...)`
+(or `enqueue_in(delay, ...)`) serialises the call as JSON onto a named
+queue, and `Worker` processes run them with a fixed concurrency pool.
+Calling a task directly still runs it inline.
+
+Redis layout:
+
+    jobs:queue:<queue>          LIST  ready jobs (LPUSH in, LMOVE out from the right)
+    jobs:delayed                ZSET  jobs (retries, enqueue_in) scored by run-at time
+    jobs:processing:<worker>    LIST  jobs a worker has taken but not finished
+    jobs:worker:<worker>        key   heartbeat; when it lapses the worker's jobs are requeued
+    jobs:dead:<queue>           LIST  jobs that exhausted their attempts (newest first, capped)
+    jobs:periodic:<task>:<slot> key   ensures one enqueue per period across all workers
+
+Delivery is at-least-once – a worker that dies mid-job has it re-run
+elsewhere – so tasks should be idempotent. Failures are retried with
+full-jitter exponential backoff until `max_attempts`, then dead-lettered.
+A running task can read its job id from `current_job_id`; the id stays the
+same when the job is re-run, so long jobs can checkpoint under it and resume.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import random
+import socket
+import time
+import traceback
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+import redis.asyncio as redis
+
+from app.core import settings
+from app.core.metrics import Counter, Gauge, Histogram
+from app.core.redis import redis_client as default_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "jobs"
+DELAYED_KEY = f"{KEY_PREFIX}:delayed"
+DEAD_LETTER_MAX = 10_000  # dead jobs kept per queue
+HEARTBEAT_SECONDS = 10
+HEARTBEAT_TTL = 30  # a worker silent this long is presumed dead
+PROMOTE_BATCH = 100  # due delayed jobs moved per round trip
+IDLE_POLL_SECONDS = 0.25  # consumer back-off when every queue is empty
+MAX_BACKOFF = 3600.0
+
+JOBS_ENQUEUED = Counter("jobs_enqueued_total", "Jobs enqueued (including delayed and retries).", ("queue",))
+JOBS_PROCESSED = Counter("jobs_processed_total", "Job executions by outcome (ok, retry, dead).", ("queue", "outcome"))
+JOB_DURATION = Histogram(
+    "job_duration_seconds", "Job execution time.", ("queue",),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0),
+)
+JOB_LATENCY = Histogram(
+    "job_queue_latency_seconds", "Time from a job becoming ready to a worker starting it.", ("queue",),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+JOBS_DEPTH = Gauge("jobs_queue_depth", "Ready jobs waiting per queue.", ("queue",))
+JOBS_DEAD = Gauge("jobs_dead_letters", "Dead-lettered jobs kept per queue.", ("queue",))
+
+current_job_id: ContextVar[Optional[str]] = ContextVar("current_job_id", default=None)  # set while a worker runs a job
+
+# KEYS[1] = delayed zset; ARGV[1] = now, ARGV[2] = batch, ARGV[3] = queue key prefix
+PROMOTE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, raw in ipairs(due) do
+    redis.call('ZREM', KEYS[1], raw)
+    redis.call('LPUSH', ARGV[3] .. cjson.decode(raw)['queue'], raw)
+end
+return #due
+"""
+
+
+def queue_key(queue: str) -> str:
+    return f"{KEY_PREFIX}:queue:{queue}"
+
+
+def dead_key(queue: str) -> str:
+    return f"{KEY_PREFIX}:dead:{queue}"
+
+
+# ---- Registry ----
+
+@dataclass
+class Task:
+    name: str
+    fn: Callable[..., Awaitable[Any]]
+    queue: str = "default"
+    max_attempts: int = 5
+    backoff: float = 5.0  # base seconds of the retry backoff
+    timeout: float = 300.0
+    every: Optional[float] = None  # seconds between periodic runs
+
+    async def __call__(self, *args, **kwargs):
+        return await self.fn(*args, **kwargs)
+
+    async def enqueue(self, *args, redis_client: Optional[redis.Redis] = None, **kwargs) -> str:
+        return await enqueue(self.name, args, kwargs, redis_client=redis_client)
+
+    async def enqueue_in(self, delay: float, *args, redis_client: Optional[redis.Redis] = None, **kwargs) -> str:
+        return await enqueue(self.name, args, kwargs, delay=delay, redis_client=redis_client)
+
+
+TASKS: dict[str, Task] = {}
+
+
+def task(name: Optional[str] = None, *, queue: str = "default", max_attempts: int = 5, backoff: float = 5.0,
+         timeout: float = 300.0, every: Optional[float] = None):
+    """Register an async function as a job. `every=` also schedules it periodically (args-less tasks only)."""
+    def decorator(fn):
+        registered = Task(name or f"{fn.__module__}.{fn.__qualname__}", fn, queue, max_attempts, backoff, timeout,
+                          every)
+        functools.update_wrapper(registered, fn)
+        TASKS[registered.name] = registered
+        return registered
+    return decorator
+
+
+def retry_delay(base: float, attempt: int) -> float:
+    """Full-jitter exponential backoff before retry `attempt` (1-based)."""
+    return random.uniform(0, min(MAX_BACKOFF, base * 2 ** (attempt - 1)))
+
+
+async def enqueue(name: str, args: tuple | list = (), kwargs: Optional[dict] = None, *, delay: float = 0.0,
+                  redis_client: Optional[redis.Redis] = None) -> str:
+    """Queue a call to the registered task `name`; returns the job id."""
+    registered = TASKS[name]
+    redis_client = redis_client or default_redis
+    now = time.time()
+    job = {
+        "id": uuid.uuid4().hex,
+        "task": name,
+        "queue": registered.queue,
+        "args": list(args),
+        "kwargs": kwargs or {},
+        "attempts": 0,
+        "ready_at": now + delay,
+    }
+    raw = json.dumps(job, default=str)
+    if delay > 0:
+        await redis_client.zadd(DELAYED_KEY, {raw: job["ready_at"]})
+    else:
+        await redis_client.lpush(queue_key(registered.queue), raw)
+    JOBS_ENQUEUED.inc((registered.queue,))
+    return job["id"]
+
+
+# ---- Worker ----
+
+class Worker:
+    """Runs jobs from `queues` (earlier queues first) with `concurrency` consumers."""
+
+    def __init__(self, queues: Optional[list[str]] = None, concurrency: Optional[int] = None,
+                 redis_client: Optional[redis.Redis] = None, worker_id: Optional[str] = None):
+        self.queues = queues or settings.jobs_queues
+        self.concurrency = concurrency or settings.jobs_concurrency
+        self.redis = redis_client or default_redis
+        self.id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.processing_key = f"{KEY_PREFIX}:processing:{self.id}"
+        self.heartbeat_key = f"{KEY_PREFIX}:worker:{self.id}"
+        self._promote = self.redis.register_script(PROMOTE_SCRIPT)
+        self._stopping = asyncio.Event()
+
+    # -- consuming --
+
+    async def _take(self) -> Optional[str]:
+        for queue in self.queues:
+            raw = await self.redis.lmove(queue_key(queue), self.processing_key, "RIGHT", "LEFT")
+            if raw is not None:
+                return raw
+        return None
+
+    async def _consume(self) -> None:
+        while not self._stopping.is_set():
+            raw = await self._take()
+            if raw is None:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), IDLE_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self.process(raw)
+
+    async def process(self, raw: str) -> str:
+        """Run one taken job and settle it: "ok", "retry" or "dead"."""
+        job = json.loads(raw)
+        queue = job["queue"]
+        registered = TASKS.get(job["task"])
+        started = time.time()
+        JOB_LATENCY.observe(max(started - job["ready_at"], 0.0), (queue,))
+
+        error: Optional[str] = None
+        if registered is None:
+            error = f"Unknown task {job['task']!r}"
+        else:
+            job_id = current_job_id.set(job["id"])
+            try:
+                await asyncio.wait_for(registered.fn(*job["args"], **job["kwargs"]), registered.timeout)
+            except Exception as exc:
+                error = "".join(traceback.format_exception_only(type(exc), exc)).strip()
+                logger.exception("Job %s (%s) failed on attempt %d", job["id"], job["task"], job["attempts"] + 1)
+            finally:
+                current_job_id.reset(job_id)
+        JOB_DURATION.observe(time.time() - started, (queue,))
+
+        pipe = self.redis.pipeline()
+        pipe.lrem(self.processing_key, 1, raw)
+        if error is None:
+            outcome = "ok"
+        else:
+            job["attempts"] += 1
+            job["error"] = error
+            max_attempts = registered.max_attempts if registered else 1
+            if job["attempts"] < max_attempts:
+                outcome = "retry"
+                job["ready_at"] = time.time() + retry_delay(registered.backoff, job["attempts"])
+                pipe.zadd(DELAYED_KEY, {json.dumps(job): job["ready_at"]})
+            else:
+                outcome = "dead"
+                job["failed_at"] = time.time()
+                pipe.lpush(dead_key(queue), json.dumps(job))
+                pipe.ltrim(dead_key(queue), 0, DEAD_LETTER_MAX - 1)
+        await pipe.execute()
+        JOBS_PROCESSED.inc((queue, outcome))
+        return outcome
+
+    # -- housekeeping --
+
+    async def promote_due(self) -> int:
+        """Move delayed jobs whose time has come onto their queues."""
+        return await self._promote(keys=[DELAYED_KEY], args=[time.time(), PROMOTE_BATCH, f"{KEY_PREFIX}:queue:"])
+
+    async def schedule_periodic(self) -> int:
+        """Enqueue each periodic task once per period, whichever worker gets there first."""
+        scheduled = 0
+        now = time.time()
+        for registered in TASKS.values():
+            if registered.every is None or registered.queue not in self.queues:
+                continue
+            slot = int(now // registered.every)
+            claim = f"{KEY_PREFIX}:periodic:{registered.name}:{slot}"
+            if await self.redis.set(claim, self.id, nx=True, ex=max(int(registered.every * 2), 1)):
+                await registered.enqueue(redis_client=self.redis)
+                scheduled += 1
+        return scheduled
+
+    async def recover_orphans(self) -> int:
+        """Requeue jobs held by workers whose heartbeat has lapsed."""
+        recovered = 0
+        async for key in self.redis.scan_iter(match=f"{KEY_PREFIX}:processing:*", count=100):
+            owner = key.rsplit(":", 1)[-1]
+            if owner == self.id or await self.redis.exists(f"{KEY_PREFIX}:worker:{owner}"):
+                continue
+            while (raw := await self.redis.rpop(key)) is not None:
+                await self.redis.rpush(queue_key(json.loads(raw)["queue"]), raw)  # front of the line
+                recovered += 1
+        if recovered:
+            logger.warning("Requeued %d jobs from dead workers", recovered)
+        return recovered
+
+    async def update_gauges(self) -> None:
+        pipe = self.redis.pipeline(transaction=False)
+        for queue in self.queues:
+            pipe.llen(queue_key(queue))
+            pipe.llen(dead_key(queue))
+        depths = await pipe.execute()
+        for i, queue in enumerate(self.queues):
+            JOBS_DEPTH.set(depths[2 * i], (queue,))
+            JOBS_DEAD.set(depths[2 * i + 1], (queue,))
+
+    async def _housekeeping(self) -> None:
+        last_heartbeat = last_recovery = 0.0
+        while not self._stopping.is_set():
+            try:
+                now = time.monotonic()
+                if now - last_heartbeat >= HEARTBEAT_SECONDS:
+                    await self.redis.set(self.heartbeat_key, "1", ex=HEARTBEAT_TTL)
+                    await self.update_gauges()
+                    last_heartbeat = now
+                if now - last_recovery >= HEARTBEAT_TTL:
+                    await self.recover_orphans()
+                    last_recovery = now
+                while await self.promote_due() == PROMOTE_BATCH:
+                    pass
+                await self.schedule_periodic()
+            except Exception:
+                logger.exception("Job worker housekeeping failed")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), 0.5)
+            except asyncio.TimeoutError:
+                pass
+
+    # -- lifecycle --
+
+    def stop(self) -> None:
+        """Finish the jobs in hand, then return from `run`."""
+        self._stopping.set()
+
+    async def run(self) -> None:
+        await self.redis.set(self.heartbeat_key, "1", ex=HEARTBEAT_TTL)
+        logger.info("Worker %s consuming %s with concurrency %d", self.id, ",".join(self.queues), self.concurrency)
+        try:
+            await asyncio.gather(self._housekeeping(), *(self._consume() for _ in range(self.concurrency)))
+        finally:
+            await self.redis.delete(self.heartbeat_key)
+
+
+async def requeue_dead(queue: str, limit: int = 100, redis_client: Optional[redis.Redis] = None) -> int:
+    """Give up to `limit` dead-lettered jobs a fresh set of attempts."""
+    redis_client = redis_client or default_redis
+    moved = 0
+    while moved < limit and (raw := await redis_client.rpop(dead_key(queue))) is not None:
+        job = json.loads(raw)
+        job.update(attempts=0, ready_at=time.time())
+        job.pop("error", None)
+        job.pop("failed_at", None)
+        await redis_client.lpush(queue_key(queue), json.dumps(job))
+        moved += 1
+    return moved
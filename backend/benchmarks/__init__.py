@@ -0,0 +1 @@
+"""Micro-benchmarks for the API hot paths (run with `python -m benchmarks`)."""
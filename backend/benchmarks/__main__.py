@@ -0,0 +1,61 @@
+"""Run the benchmark suite and compare against a stored baseline.
+
+Usage (from backend/):
+    python -m benchmarks                                   # run all, compare with baseline.json
+    python -m benchmarks --filter nearby --output out.json
+    python -m benchmarks --update-baseline                 # re-record baseline.json
+
+Exits 1 when any benchmark's median is more than --threshold slower than its
+baseline. Baselines are machine-specific: record them on the machine (or CI
+runner class) that will run the comparison.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from benchmarks import bench_claim, bench_geo, bench_metrics, bench_nearby, bench_proximity, bench_serialization  # noqa: F401 — registers benchmarks
+from benchmarks.harness import compare, run, write_document
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", default=None, help="Only run benchmarks whose name contains this")
+    parser.add_argument("--output", type=Path, default=None, help="Write results JSON here")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = +25%%)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = run(args.filter)
+    for r in results:
+        print(f"{r.name:<45} {r.median_ns / 1000:>12.2f} µs  (p95 {r.p95_ns / 1000:.2f} µs, {r.rounds} rounds)")
+
+    if args.output:
+        write_document(args.output, results)
+    if args.update_baseline:
+        write_document(args.baseline, results)
+        print(f"✅ Baseline written to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"⚠️  No baseline at {args.baseline}; run with --update-baseline first")
+        return 0
+
+    comparisons = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+    regressions = [c for c in comparisons if c.regressed]
+    for c in comparisons:
+        marker = "❌" if c.regressed else "  "
+        print(f"{marker} {c.name:<45} {c.ratio:>6.2f}x baseline")
+
+    if regressions:
+        print(f"❌ {len(regressions)} benchmark(s) regressed beyond +{args.threshold:.0%}")
+        return 1
+    print("✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+"""`process_claim` end to end with in-memory Postgres and Redis stand-ins."""
+
+from app.models import ClaimLog, Location, RewardTemplate
+from app.schemas.claim import ClaimRequest
+from app.services.claim_service import process_claim
+from benchmarks.fakes import FakeRedis, FakeSession, make_catalog, make_user
+from benchmarks.harness import benchmark
+
+
+@benchmark("claim.process_claim")
+def bench_process_claim():
+    (location,) = make_catalog(1)
+    db = FakeSession({Location: [location], RewardTemplate: [location.reward_template], ClaimLog: []})
+    redis = FakeRedis()
+    user = make_user()
+    claim = ClaimRequest(latitude=location.latitude, longitude=location.longitude, device_id="bench-device")
+
+    async def run():
+        # fresh counters each time so the cooldown never trips
+        redis.store.clear()
+        redis.expiry.clear()
+        await process_claim(db, redis, user, str(location.id), claim)
+    return run
@@ -0,0 +1,11 @@
+"""Geo utility benchmarks."""
+
+from app.services.geo import haversine_distance
+from benchmarks.harness import benchmark
+
+
+@benchmark("geo.haversine_distance")
+def bench_haversine():
+    def run():
+        haversine_distance(41.0370, 28.9850, 40.9903, 29.0291)
+    return run
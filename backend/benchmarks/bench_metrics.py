@@ -0,0 +1,44 @@
+"""Per-request cost of metrics recording."""
+
+from app.core.metrics import HTTP_DURATION, MetricsMiddleware
+from benchmarks.harness import benchmark
+
+SCOPE = {"type": "http", "method": "GET", "path": "/health"}
+START = {"type": "http.response.start", "status": 200, "headers": []}
+BODY = {"type": "http.response.body", "body": b"{}"}
+
+
+async def _endpoint(scope, receive, send):
+    await send(START)
+    await send(BODY)
+
+
+async def _receive():
+    return {"type": "http.request"}
+
+
+async def _send(message):
+    pass
+
+
+@benchmark("metrics.histogram_observe")
+def bench_observe():
+    def run():
+        HTTP_DURATION.observe(0.0042, ("GET", "/bench"))
+    return run
+
+
+@benchmark("metrics.asgi_baseline")
+def bench_bare_app():
+    async def run():
+        await _endpoint(dict(SCOPE), _receive, _send)
+    return run
+
+
+@benchmark("metrics.asgi_with_middleware")
+def bench_middleware():
+    app = MetricsMiddleware(_endpoint)
+
+    async def run():
+        await app(dict(SCOPE), _receive, _send)
+    return run
@@ -0,0 +1,22 @@
+"""`get_nearby_locations` over catalogs of increasing size."""
+
+from app.models import Location
+from app.services.location_service import get_nearby_locations
+from benchmarks.fakes import FakeSession, make_catalog
+from benchmarks.harness import benchmark
+
+CATALOG_SIZES = (100, 1_000, 10_000, 50_000)
+
+
+def _register(size: int):
+    @benchmark(f"nearby.get_nearby_locations[{size}]")
+    def bench():
+        db = FakeSession({Location: make_catalog(size)})
+
+        async def run():
+            await get_nearby_locations(db, 41.0370, 28.9850, radius_km=5.0)
+        return run
+
+
+for _size in CATALOG_SIZES:
+    _register(_size)
@@ -0,0 +1,30 @@
+"""Proximity stream: one position update against in-memory snapshots of increasing size."""
+
+import random
+
+from app.services.proximity import IndexedLocation, LocationIndex, Walker
+from benchmarks.fakes import make_catalog
+from benchmarks.harness import benchmark
+
+CATALOG_SIZES = (1_000, 50_000)
+
+
+def _register(size: int):
+    @benchmark(f"proximity.walker_update[{size}]")
+    def bench():
+        index = LocationIndex(
+            IndexedLocation(str(loc.id), loc.latitude, loc.longitude, loc.radius_m) for loc in make_catalog(size)
+        )
+        walker = Walker(set())
+        rng = random.Random(3)
+        positions = [(41.0370 + rng.uniform(-0.3, 0.3), 28.9850 + rng.uniform(-0.3, 0.3)) for _ in range(256)]
+        step = iter(range(1 << 62))
+
+        def run():
+            latitude, longitude = positions[next(step) & 255]
+            walker.update(index, latitude, longitude)
+        return run
+
+
+for _size in CATALOG_SIZES:
+    _register(_size)
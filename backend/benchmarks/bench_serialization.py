@@ -0,0 +1,47 @@
+"""Response construction + JSON encoding for the heaviest read endpoints."""
+
+from pydantic import TypeAdapter
+
+from app.api.locations import list_nearby_locations
+from app.api.rewards import get_my_rewards
+from app.models import Location, Reward
+from app.schemas.location import LocationWithDistance
+from app.schemas.reward import RewardSummary
+from benchmarks.fakes import FakeRedis, FakeSession, make_catalog, make_rewards, make_user
+from benchmarks.harness import benchmark
+
+MAP_RESULTS = 200
+WALLET_SIZE = 200
+
+
+@benchmark(f"serialize.map_locations[{MAP_RESULTS}]")
+def bench_map_locations():
+    # a ~1 km catalog so every location is inside the 5 km radius
+    catalog = make_catalog(MAP_RESULTS)
+    for location in catalog:
+        location.latitude = 41.0370 + (location.latitude - 41.0370) / 100
+        location.longitude = 28.9850 + (location.longitude - 28.9850) / 100
+    db = FakeSession({Location: catalog})
+    redis_client = FakeRedis()
+    user = make_user()
+    adapter = TypeAdapter(list[LocationWithDistance])
+
+    async def run():
+        items = await list_nearby_locations(
+            latitude=41.0370, longitude=28.9850, radius_km=5.0, city=None, user=user, db=db,
+            redis_client=redis_client,
+        )
+        adapter.dump_json(items)
+    return run
+
+
+@benchmark(f"serialize.my_rewards[{WALLET_SIZE}]")
+def bench_my_rewards():
+    user = make_user()
+    db = FakeSession({Reward: make_rewards(user, WALLET_SIZE)})
+    adapter = TypeAdapter(RewardSummary)
+
+    async def run():
+        summary = await get_my_rewards(user=user, db=db)
+        adapter.dump_json(summary)
+    return run
@@ -0,0 +1,234 @@
+"""In-process stand-ins for Postgres and Redis so hot paths can be timed in isolation."""
+
+from __future__ import annotations
+
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any
+
+from app.models import Location, Reward, RewardTemplate, User
+
+
+class FakeResult:
+    def __init__(self, rows: list[Any]):
+        self._rows = rows
+
+    def scalar_one_or_none(self):
+        return self._rows[0] if self._rows else None
+
+    def scalar_one(self):
+        return self._rows[0]
+
+    def scalar(self):
+        return self._rows[0] if self._rows else None
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class FakeSession:
+    """
+    Minimal AsyncSession stand-in.
+
+    `execute` ignores WHERE clauses and answers by the selected entity:
+    `select(Model)` returns the rows registered for that model, and
+    `select(func.count())` returns the number of rows of the FROM table.
+    """
+
+    def __init__(self, rows: dict[type, list[Any]]):
+        self.rows = rows
+        self._by_table = {model.__table__.name: items for model, items in rows.items()}
+
+    async def execute(self, stmt, *args, **kwargs) -> FakeResult:
+        entity = stmt.column_descriptions[0].get("entity")
+        if entity is not None:
+            return FakeResult(self.rows.get(entity, []))
+        table = stmt.get_final_froms()[0]
+        return FakeResult([len(self._by_table.get(table.name, []))])
+
+    def add(self, obj) -> None:
+        pass
+
+    async def flush(self) -> None:
+        pass
+
+    async def refresh(self, obj) -> None:
+        pass
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis"):
+        self._redis = redis
+        self._ops: list[tuple[str, tuple]] = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._ops.append((name, args))
+            return self
+        return queue
+
+    async def execute(self) -> list[Any]:
+        self._redis.round_trips += 1
+        return [self._redis._apply(name, args) for name, args in self._ops]
+
+
+class FakeRedis:
+    """
+    Dict-backed async Redis with the commands the claim path uses.
+
+    Counts round trips so benchmarks and load tests can report them.
+    """
+
+    def __init__(self):
+        self.store: dict[str, Any] = {}
+        self.expiry: dict[str, float] = {}
+        self.round_trips = 0
+
+    def _alive(self, key: str) -> bool:
+        deadline = self.expiry.get(key)
+        if deadline is not None and deadline < time.monotonic():
+            self.store.pop(key, None)
+            self.expiry.pop(key, None)
+        return key in self.store
+
+    def _apply(self, name: str, args: tuple) -> Any:
+        key = args[0] if args else None
+        if name == "exists":
+            return int(self._alive(key))
+        if name == "get":
+            return self.store.get(key) if self._alive(key) else None
+        if name == "incr":
+            value = int(self.store.get(key, 0) if self._alive(key) else 0) + 1
+            self.store[key] = str(value)
+            return value
+        if name == "expire":
+            if self._alive(key):
+                self.expiry[key] = time.monotonic() + args[1]
+                return 1
+            return 0
+        if name == "setex":
+            self.store[key] = args[2]
+            self.expiry[key] = time.monotonic() + args[1]
+            return True
+        if name == "pfadd":
+            members = self.store.setdefault(key, set())
+            before = len(members)
+            members.update(args[1:])
+            return int(len(members) > before)
+        if name == "pfcount":
+            return len(self.store.get(key, ()))
+        if name == "zincrby":
+            scores = self.store.setdefault(key, {})
+            scores[args[2]] = scores.get(args[2], 0) + args[1]
+            return scores[args[2]]
+        if name == "zadd":
+            self.store.setdefault(key, {}).update(args[1])
+            return len(args[1])
+        if name == "geoadd":
+            longitude, latitude, member = args[1]
+            self.store.setdefault(key, {})[member] = (longitude, latitude)
+            return 1
+        if name == "publish":
+            return 0  # no subscribers
+        if name == "hset":
+            self.store.setdefault(key, {})  # fields arrive as `mapping=`, which the fake does not keep
+            return 0
+        if name == "sadd":
+            members = self.store.setdefault(key, set())
+            before = len(members)
+            members.update(args[1:])
+            return len(members) - before
+        if name == "xadd":
+            self.store.setdefault(key, []).append(args[1])
+            return f"{len(self.store[key])}-0"
+        if name in ("evalsha", "eval"):
+            # the claim guard script: its checks run inside Redis, so the fake always passes
+            return ["ok", "0"]
+        raise NotImplementedError(f"FakeRedis does not implement {name}")
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    def __getattr__(self, name):
+        async def command(*args, **kwargs):
+            self.round_trips += 1
+            return self._apply(name, args)
+        return command
+
+
+# ---- Fixtures ----
+
+def make_catalog(n: int, seed: int = 1, centre: tuple[float, float] = (41.0370, 28.9850)) -> list[Location]:
+    """`n` active locations scattered ~±0.5° around `centre`, each with a points template."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    catalog = []
+    for i in range(n):
+        location = Location(
+            id=uuid.UUID(int=rng.getrandbits(128)),
+            sponsor_id=None,
+            name=f"Bench Spot {i}",
+            description=None,
+            latitude=centre[0] + rng.uniform(-0.5, 0.5),
+            longitude=centre[1] + rng.uniform(-0.5, 0.5),
+            address=None,
+            image_url=None,
+            radius_m=100,
+            city="Istanbul",
+            is_active=True,
+            created_at=now,
+        )
+        location.reward_template = make_template(location, rng)
+        catalog.append(location)
+    return catalog
+
+
+def make_template(location: Location, rng: random.Random) -> RewardTemplate:
+    return RewardTemplate(
+        id=uuid.UUID(int=rng.getrandbits(128)),
+        location_id=location.id,
+        reward_type="points",
+        reward_value=10,
+        reward_description=f"+10 points at {location.name}",
+        bearing_degrees=rng.uniform(0, 360),
+        elevation_degrees=0.0,
+        is_active=True,
+        created_at=location.created_at,
+    )
+
+
+def make_user() -> User:
+    return User(
+        id=uuid.uuid4(),
+        firebase_uid="bench-user",
+        email="bench@example.com",
+        display_name="Bench User",
+        role="user",
+        total_points=0,
+        is_active=True,
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+def make_rewards(user: User, n: int, seed: int = 1) -> list[Reward]:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    return [
+        Reward(
+            id=uuid.UUID(int=rng.getrandbits(128)),
+            user_id=user.id,
+            type="points",
+            value=10,
+            description="+10 points",
+            reward_template_id=uuid.UUID(int=rng.getrandbits(128)),
+            location_id=uuid.UUID(int=rng.getrandbits(128)),
+            redeemed=False,
+            created_at=now,
+        )
+        for _ in range(n)
+    ]
@@ -0,0 +1,144 @@
+"""Benchmark registry, timing loop, and baseline comparison."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Optional, Union
+
+MIN_ROUNDS = 5
+MIN_ROUND_TIME = 0.02  # seconds; `number` is calibrated so one round takes at least this long
+MIN_TOTAL_TIME = 0.5  # seconds spent measuring each benchmark
+
+BenchFn = Union[Callable[[], object], Callable[[], Awaitable[object]]]
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Callable[[], BenchFn]  # returns the zero-arg callable to time; setup cost is excluded
+    group: str
+
+
+@dataclass
+class Result:
+    name: str
+    median_ns: float
+    p95_ns: float
+    ops_per_sec: float
+    rounds: int
+    number: int
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline_ns: float
+    current_ns: float
+    ratio: float
+    regressed: bool
+
+
+REGISTRY: list[Benchmark] = []
+
+
+def benchmark(name: str):
+    """Register `setup` under `name`; the group is the module it lives in."""
+    def decorator(setup: Callable[[], BenchFn]) -> Callable[[], BenchFn]:
+        REGISTRY.append(Benchmark(name=name, setup=setup, group=setup.__module__.rsplit(".", 1)[-1]))
+        return setup
+    return decorator
+
+
+async def _time_round(fn: BenchFn, number: int, is_async: bool) -> float:
+    if is_async:
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            await fn()
+        return (time.perf_counter_ns() - start) / number
+    start = time.perf_counter_ns()
+    for _ in range(number):
+        fn()
+    return (time.perf_counter_ns() - start) / number
+
+
+async def measure(bench: Benchmark) -> Result:
+    """Calibrate iterations per round, then time rounds until MIN_TOTAL_TIME has elapsed."""
+    fn = bench.setup()
+    is_async = inspect.iscoroutinefunction(fn)
+
+    number = 1
+    while True:
+        per_op = await _time_round(fn, number, is_async)
+        if per_op * number >= MIN_ROUND_TIME * 1e9 or number >= 1_000_000:
+            break
+        number *= 10 if per_op * number < MIN_ROUND_TIME * 1e8 else 2
+
+    samples: list[float] = []
+    deadline = time.perf_counter() + MIN_TOTAL_TIME
+    while len(samples) < MIN_ROUNDS or time.perf_counter() < deadline:
+        samples.append(await _time_round(fn, number, is_async))
+
+    samples.sort()
+    median = statistics.median(samples)
+    return Result(
+        name=bench.name,
+        median_ns=median,
+        p95_ns=samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        ops_per_sec=1e9 / median if median else float("inf"),
+        rounds=len(samples),
+        number=number,
+    )
+
+
+def run(name_filter: Optional[str] = None) -> list[Result]:
+    selected = [b for b in REGISTRY if not name_filter or name_filter in b.name]
+    return [asyncio.run(measure(b)) for b in selected]
+
+
+def compare(results: list[Result], baseline: dict, threshold: float) -> list[Comparison]:
+    """Compare medians against a baseline document; `threshold=0.25` allows +25%."""
+    known = baseline.get("results", {})
+    comparisons = []
+    for result in results:
+        if result.name not in known:
+            continue
+        base = known[result.name]["median_ns"]
+        ratio = result.median_ns / base if base else float("inf")
+        comparisons.append(Comparison(result.name, base, result.median_ns, ratio, ratio > 1 + threshold))
+    return comparisons
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def to_document(results: list[Result]) -> dict:
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_rev": _git_rev(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "processor": platform.processor() or None,
+        },
+        "results": {r.name: asdict(r) for r in results},
+    }
+
+
+def write_document(path: Path, results: list[Result]) -> None:
+    path.write_text(json.dumps(to_document(results), indent=2) + "\n")
+
@@ -0,0 +1,115 @@
+"""Compare requests/second between the dev launcher (run.py) and serve.py.
+
+Usage (from backend/):
+    python -m benchmarks.launchers [--path /health] [--concurrency 64] [--duration 10] [--workers N]
+
+Each launcher is started as a subprocess on its own port, warmed up, then
+hammered by keep-alive httpx clients. `/health` needs neither Postgres nor
+Redis, so this isolates server overhead (event loop, HTTP parser, access
+logging, reloader, worker count); point --path at a real endpoint to include
+the app.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.loadtest import percentile
+
+BACKEND = Path(__file__).parent.parent
+
+# run.py calls uvicorn.run(reload=True) under `if __name__ == "__main__"`, so run it as a script
+LAUNCHERS = {
+    "run.py": lambda port, workers: [sys.executable, "-c",
+                                     "import sys, runpy, uvicorn; _run = uvicorn.run; "
+                                     f"uvicorn.run = lambda *a, **kw: _run(*a, **{{**kw, 'port': {port}}}); "
+                                     "runpy.run_path('run.py', run_name='__main__')"],
+    "serve.py": lambda port, workers: [sys.executable, "serve.py", "--port", str(port), "--workers", str(workers),
+                                       "--log-level", "warning"],
+}
+
+
+async def wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.perf_counter() < deadline:
+            try:
+                if (await client.get(url)).status_code < 500:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready within {timeout}s")
+
+
+async def hammer(url: str, concurrency: int, duration: float) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=10) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    await client.get(url)
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {"rps": len(latencies) / elapsed, "p50_ms": percentile(latencies, 0.5),
+            "p99_ms": percentile(latencies, 0.99), "errors": errors}
+
+
+async def bench(name: str, port: int, args: argparse.Namespace) -> dict:
+    env = {**os.environ, "WARM_POOLS": "false"}
+    proc = subprocess.Popen(LAUNCHERS[name](port, args.workers), cwd=BACKEND, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+    try:
+        url = f"http://127.0.0.1:{port}{args.path}"
+        await wait_ready(url)
+        await hammer(url, args.concurrency, 1.0)  # warm-up
+        return await hammer(url, args.concurrency, args.duration)
+    finally:
+        os.killpg(proc.pid, signal.SIGTERM)
+        proc.wait(timeout=60)
+
+
+async def main(args: argparse.Namespace) -> None:
+    results = {}
+    for offset, name in enumerate(LAUNCHERS):
+        results[name] = await bench(name, args.port + offset, args)
+        r = results[name]
+        print(f"{name:<10} {r['rps']:>10,.0f} req/s  p50 {r['p50_ms']:.2f} ms  p99 {r['p99_ms']:.2f} ms  "
+              f"errors={r['errors']}")
+    speedup = results["serve.py"]["rps"] / results["run.py"]["rps"]
+    print(f"✅ serve.py with {args.workers} worker(s): {speedup:.2f}x run.py throughput")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--port", type=int, default=18000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
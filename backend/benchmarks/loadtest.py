@@ -0,0 +1,285 @@
+"""Load-test the API with simulated claim storms, map polling and wallet opens.
+
+Usage (from backend/):
+    python -m benchmarks.loadtest                                   # in process, all scenarios
+    python -m benchmarks.loadtest --scenario hot_location --concurrency 200 --duration 30
+    python -m benchmarks.loadtest --url http://localhost:8000 --output load.json
+
+In-process mode drives `create_app()` through httpx's ASGITransport, so the
+numbers are what one worker (one event loop) sustains, and DB query counts and
+Redis round trips are measured per scenario. With `--url` the requests go to a
+running server instead; it must run with DEBUG=true and STUB_AUTH_TOKENS=true,
+and query / round-trip counts are not available.
+
+Either way the Postgres and Redis in settings are used for real: a hot
+location is upserted before the run, and every virtual user is created on its
+first request through the normal auth path.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+import httpx
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core import settings
+from app.core.database import async_session_factory, engine
+from app.core.security import STUB_TOKEN_PREFIX
+from app.models import Location, RewardTemplate
+
+HOT_LOCATION_ID = uuid.uuid5(uuid.NAMESPACE_URL, "hotncold:loadtest:hot-location")
+HOT_LATITUDE, HOT_LONGITUDE = 41.0370, 28.9850
+WALKING_SPEED = 1.4  # m/s
+METERS_PER_DEGREE = 111_320.0
+
+
+# ---- Instrumentation ----
+
+class Counters:
+    """DB statements and Redis round trips issued by the in-process app."""
+
+    def __init__(self):
+        self.db_queries = 0
+        self.redis_round_trips = 0
+
+    def install(self) -> None:
+        from redis.asyncio.client import Pipeline, Redis
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def _count_query(*_args):
+            self.db_queries += 1
+
+        execute_command = Redis.execute_command
+        pipeline_execute = Pipeline.execute
+
+        async def counted_command(client, *args, **kwargs):
+            # buffered pipeline commands are counted once, by `execute`
+            if not isinstance(client, Pipeline):
+                self.redis_round_trips += 1
+            return await execute_command(client, *args, **kwargs)
+
+        async def counted_pipeline(pipe, *args, **kwargs):
+            self.redis_round_trips += 1
+            return await pipeline_execute(pipe, *args, **kwargs)
+
+        Redis.execute_command = counted_command
+        Pipeline.execute = counted_pipeline
+
+    def reset(self) -> None:
+        self.db_queries = self.redis_round_trips = 0
+
+
+# ---- Recording ----
+
+@dataclass
+class Stats:
+    latencies_ms: list[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, math.ceil(q * len(sorted_values)) - 1)]
+
+
+@dataclass
+class Context:
+    client: httpx.AsyncClient
+    deadline: float
+    run_id: int
+    claimants: list[str]  # users that have claimed, shared across scenarios
+    stats: dict[str, Stats] = field(default_factory=lambda: defaultdict(Stats))
+
+    def new_uid(self) -> str:
+        return f"loadtest-{self.run_id}-{uuid.uuid4().hex[:12]}"
+
+    async def request(self, name: str, method: str, url: str, uid: str, **kwargs) -> Optional[httpx.Response]:
+        headers = {"Authorization": f"Bearer {STUB_TOKEN_PREFIX}{uid}"}
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=headers, **kwargs)
+        except httpx.HTTPError:
+            self.stats[name].errors += 1
+            return None
+        self.stats[name].latencies_ms.append((time.perf_counter() - started) * 1000)
+        self.stats[name].statuses[response.status_code] += 1
+        return response
+
+
+# ---- Scenarios ----
+
+def _jitter(rng: random.Random, meters: float) -> tuple[float, float]:
+    """A point within `meters` of the hot location."""
+    angle = rng.uniform(0, 2 * math.pi)
+    distance = meters * math.sqrt(rng.random())
+    dlat = distance * math.cos(angle) / METERS_PER_DEGREE
+    dlon = distance * math.sin(angle) / (METERS_PER_DEGREE * math.cos(math.radians(HOT_LATITUDE)))
+    return HOT_LATITUDE + dlat, HOT_LONGITUDE + dlon
+
+
+async def hot_location(ctx: Context, worker: int) -> None:
+    """A stream of new users each checking the map once and claiming the same location."""
+    rng = random.Random(worker)
+    while time.perf_counter() < ctx.deadline:
+        uid = ctx.new_uid()
+        lat, lon = _jitter(rng, 50)
+        await ctx.request("map", "GET", "/map/locations", uid,
+                          params={"latitude": lat, "longitude": lon, "radius_km": 1})
+        response = await ctx.request("claim", "POST", f"/locations/{HOT_LOCATION_ID}/claim", uid,
+                                     json={"latitude": lat, "longitude": lon, "device_id": f"device-{uid}"})
+        if response is not None and response.status_code == 200:
+            ctx.claimants.append(uid)
+
+
+async def map_polling(ctx: Context, worker: int, poll_interval: float = 5.0) -> None:
+    """One user walking a straight line, polling the map as if every `poll_interval` seconds."""
+    rng = random.Random(worker)
+    uid = f"loadtest-{ctx.run_id}-walker-{worker}"
+    lat, lon = _jitter(rng, 2000)
+    heading = rng.uniform(0, 2 * math.pi)
+    step = WALKING_SPEED * poll_interval / METERS_PER_DEGREE
+    while time.perf_counter() < ctx.deadline:
+        await ctx.request("map", "GET", "/map/locations", uid,
+                          params={"latitude": lat, "longitude": lon, "radius_km": 1})
+        lat += step * math.cos(heading)
+        lon += step * math.sin(heading) / math.cos(math.radians(lat))
+
+
+async def wallet_opens(ctx: Context, worker: int) -> None:
+    """Users repeatedly opening their wallet (hot-location claimants when there are any)."""
+    rng = random.Random(worker)
+    while time.perf_counter() < ctx.deadline:
+        uid = rng.choice(ctx.claimants) if ctx.claimants else f"loadtest-{ctx.run_id}-wallet-{worker}"
+        await ctx.request("wallet", "GET", "/users/me/rewards", uid)
+
+
+SCENARIOS: dict[str, Callable[[Context, int], Awaitable[None]]] = {
+    "hot_location": hot_location,
+    "map_polling": map_polling,
+    "wallet_opens": wallet_opens,
+}
+
+
+# ---- Runner ----
+
+async def prepare() -> None:
+    """Upsert the hot location and its reward template."""
+    location = {
+        "id": HOT_LOCATION_ID, "name": "Load test hot spot", "latitude": HOT_LATITUDE,
+        "longitude": HOT_LONGITUDE, "radius_m": 100, "city": "Loadtest", "is_active": True,
+    }
+    template = {
+        "id": uuid.uuid5(HOT_LOCATION_ID, "reward_template"), "location_id": HOT_LOCATION_ID,
+        "reward_type": "points", "reward_value": 10, "reward_description": "Load test reward", "is_active": True,
+    }
+    async with async_session_factory() as db:
+        for model, values in ((Location, location), (RewardTemplate, template)):
+            stmt = pg_insert(model).values(values)
+            await db.execute(stmt.on_conflict_do_update(index_elements=["id"], set_=values))
+        await db.commit()
+
+
+def summarize(name: str, ctx: Context, elapsed: float, counters: Optional[Counters]) -> dict:
+    endpoints = {}
+    total = 0
+    for endpoint, stats in ctx.stats.items():
+        latencies = sorted(stats.latencies_ms)
+        total += len(latencies)
+        endpoints[endpoint] = {
+            "requests": len(latencies),
+            "errors": stats.errors,
+            "rps": len(latencies) / elapsed,
+            "p50_ms": percentile(latencies, 0.50),
+            "p90_ms": percentile(latencies, 0.90),
+            "p99_ms": percentile(latencies, 0.99),
+            "max_ms": latencies[-1] if latencies else 0.0,
+            "statuses": {str(code): n for code, n in sorted(stats.statuses.items())},
+        }
+    summary = {"scenario": name, "duration_s": elapsed, "requests": total, "rps": total / elapsed, "endpoints": endpoints}
+    if counters is not None:
+        summary["db_queries_per_request"] = counters.db_queries / total if total else 0.0
+        summary["redis_round_trips_per_request"] = counters.redis_round_trips / total if total else 0.0
+    return summary
+
+
+def print_summary(summary: dict) -> None:
+    extra = ""
+    if "db_queries_per_request" in summary:
+        extra = (f", {summary['db_queries_per_request']:.1f} queries/req, "
+                 f"{summary['redis_round_trips_per_request']:.1f} redis round trips/req")
+    print(f"\n▶ {summary['scenario']}: {summary['requests']:,} requests, {summary['rps']:,.0f} req/s{extra}")
+    for endpoint, s in summary["endpoints"].items():
+        statuses = " ".join(f"{code}×{n}" for code, n in s["statuses"].items())
+        print(f"  {endpoint:<8} {s['rps']:>8,.0f} req/s  p50 {s['p50_ms']:.1f}  p90 {s['p90_ms']:.1f}  "
+              f"p99 {s['p99_ms']:.1f}  max {s['max_ms']:.1f} ms  [{statuses}] errors={s['errors']}")
+
+
+async def run_scenario(name: str, client: httpx.AsyncClient, args: argparse.Namespace,
+                       counters: Optional[Counters], run_id: int, claimants: list[str]) -> dict:
+    ctx = Context(client=client, deadline=time.perf_counter() + args.duration, run_id=run_id, claimants=claimants)
+    if counters:
+        counters.reset()
+    started = time.perf_counter()
+    await asyncio.gather(*(SCENARIOS[name](ctx, worker) for worker in range(args.concurrency)))
+    summary = summarize(name, ctx, time.perf_counter() - started, counters)
+    print_summary(summary)
+    return summary
+
+
+async def main(args: argparse.Namespace) -> None:
+    await prepare()
+
+    counters: Optional[Counters] = None
+    if args.url:
+        transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=args.concurrency))
+        base_url = args.url
+    else:
+        from app.main import create_app
+
+        # set after the engine exists so `debug` doesn't also switch on SQL echo
+        settings.debug = True
+        settings.stub_auth_tokens = True
+        counters = Counters()
+        counters.install()
+        transport = httpx.ASGITransport(app=create_app())
+        base_url = "http://loadtest"
+
+    # uids carry the run id so repeated runs claim as fresh users
+    run_id = int(time.time())
+    claimants: list[str] = []
+    summaries = []
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=30) as client:
+        for name in args.scenario or SCENARIOS:
+            summaries.append(await run_scenario(name, client, args, counters, run_id, claimants))
+    await engine.dispose()
+
+    if args.output:
+        document = {"mode": "http" if args.url else "in-process", "concurrency": args.concurrency, "scenarios": summaries}
+        args.output.write_text(json.dumps(document, indent=2) + "\n")
+        print(f"\n✅ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="Repeatable; default all")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per scenario")
+    parser.add_argument("--url", default=None, help="Target a running server instead of the in-process app")
+    parser.add_argument("--output", type=Path, default=None, help="Write results JSON here")
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
@@ -0,0 +1,93 @@
+"""Cold-start audit: time to import, start and serve the first request.
+
+Usage (from backend/):
+    python -m benchmarks.startup [--runs 5] [--importtime 25]
+
+Each run is a fresh interpreter (pool warm-up disabled, so no Postgres or
+Redis is needed). `--importtime` additionally lists the slowest imports from
+`python -X importtime`, cumulative, for finding what to defer next.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).parent.parent
+COLD_START_BUDGET_S = 3.0  # import + lifespan startup + first response
+DEFERRED_MODULES = ("firebase_admin", "google.auth", "numpy", "httpx")  # must not load with app.main
+
+_PROBE = f"""
+import asyncio, json, sys, time
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+loaded = [m for m in {DEFERRED_MODULES!r} if m in sys.modules]
+
+async def serve_first():
+    from httpx import ASGITransport, AsyncClient
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://probe") as client:
+            response = await client.get("/health")
+        return ready, time.perf_counter(), response.status_code
+
+ready, responded, status = asyncio.run(serve_first())
+print(json.dumps({{
+    "import_s": imported - started, "startup_s": ready - imported, "first_request_s": responded - ready,
+    "total_s": responded - started, "status": status, "deferred_loaded": loaded,
+}}))
+"""
+
+
+def measure_cold_start() -> dict:
+    """Phase timings from one fresh interpreter."""
+    env = {**os.environ, "WARM_POOLS": "false", "TRACING_ENABLED": "false"}
+    out = subprocess.run([sys.executable, "-c", _PROBE], cwd=BACKEND, env=env, capture_output=True, text=True,
+                         check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(limit: int) -> list[tuple[float, str]]:
+    """`(cumulative_ms, module)` for the slowest imports under `import app.main`."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"], cwd=BACKEND,
+                         capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative) / 1000, name.rstrip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--importtime", type=int, default=0, help="Also list the N slowest imports")
+    args = parser.parse_args()
+
+    runs = [measure_cold_start() for _ in range(args.runs)]
+    for phase in ("import_s", "startup_s", "first_request_s", "total_s"):
+        values = [r[phase] * 1000 for r in runs]
+        print(f"{phase[:-2]:<15} median {statistics.median(values):8.1f} ms   max {max(values):8.1f} ms")
+    loaded = sorted({m for r in runs for m in r["deferred_loaded"]})
+    if loaded:
+        print(f"⚠️  Deferred modules imported eagerly: {', '.join(loaded)}")
+
+    if args.importtime:
+        print("\nSlowest imports (cumulative):")
+        for ms, name in slowest_imports(args.importtime):
+            print(f"{ms:9.1f} ms  {name}")
+
+    budget_ok = statistics.median(r["total_s"] for r in runs) <= COLD_START_BUDGET_S
+    print(f"\n{'✅' if budget_ok else '❌'} Cold start budget {COLD_START_BUDGET_S:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark: uuid4 vs UUIDv7 primary keys (insert throughput and index size).
+
+Usage: python scripts/bench_uuid_pk.py [--rows 10000000] [--batch 50000]
+
+Creates two scratch tables shaped like `claim_logs`, loads the same number of
+rows into each with COPY, and reports rows/s plus the size of the primary-key
+index. The tables are dropped afterwards.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncpg
+from uuid_extensions import uuid7
+
+from app.core import settings
+
+TABLE_DDL = """
+CREATE TABLE {name} (
+    id uuid PRIMARY KEY,
+    user_id uuid NOT NULL,
+    location_id uuid NOT NULL,
+    latitude double precision NOT NULL,
+    longitude double precision NOT NULL,
+    claimed_at timestamptz NOT NULL
+)
+"""
+
+COLUMNS = ["id", "user_id", "location_id", "latitude", "longitude", "claimed_at"]
+
+
+async def load(conn: asyncpg.Connection, table: str, id_factory, rows: int, batch: int) -> float:
+    """COPY `rows` rows into `table` and return the elapsed wall time in seconds."""
+    user_id = uuid.uuid4()
+    location_id = uuid.uuid4()
+    now = datetime.now(timezone.utc)
+
+    started = time.perf_counter()
+    remaining = rows
+    while remaining > 0:
+        n = min(batch, remaining)
+        records = [(id_factory(), user_id, location_id, 41.0370, 28.9850, now) for _ in range(n)]
+        await conn.copy_records_to_table(table, records=records, columns=COLUMNS)
+        remaining -= n
+    return time.perf_counter() - started
+
+
+async def bench(rows: int, batch: int):
+    dsn = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
+    conn = await asyncpg.connect(dsn)
+
+    variants = [("bench_pk_uuid4", uuid.uuid4), ("bench_pk_uuid7", uuid7)]
+    try:
+        for table, id_factory in variants:
+            await conn.execute(f"DROP TABLE IF EXISTS {table}")
+            await conn.execute(TABLE_DDL.format(name=table))
+
+            elapsed = await load(conn, table, id_factory, rows, batch)
+            await conn.execute(f"VACUUM ANALYZE {table}")
+            index_bytes = await conn.fetchval("SELECT pg_relation_size($1::regclass)", f"{table}_pkey")
+            table_bytes = await conn.fetchval("SELECT pg_relation_size($1::regclass)", table)
+
+            print(
+                f"{table}: {rows:,} rows in {elapsed:.1f}s "
+                f"({rows / elapsed:,.0f} rows/s), "
+                f"pkey {index_bytes / 2**20:,.1f} MiB, heap {table_bytes / 2**20:,.1f} MiB"
+            )
+    finally:
+        for table, _ in variants:
+            await conn.execute(f"DROP TABLE IF EXISTS {table}")
+        await conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--batch", type=int, default=50_000)
+    args = parser.parse_args()
+
+    asyncio.run(bench(args.rows, args.batch))
@@ -0,0 +1,308 @@
+"""Generate a deterministic, production-shaped dataset for benchmarking.
+
+Usage:
+    python scripts/generate_dataset.py --truncate                       # 1M locations / 50M claims
+    python scripts/generate_dataset.py --users 10000 --locations 20000 --claims 200000 --truncate
+
+The same --seed and --anchor always produce the same rows (ids included), so
+every performance change can be measured against an identical dataset:
+
+- sponsors with a long-tail share of locations
+- locations spread over Turkish cities by population, clustered around
+  neighbourhood centres inside each city
+- one reward template per location (mostly points, some coupons/raffles)
+- users with a home city and a heavy-tailed number of claims, mostly at home
+- claim_logs + rewards over the last --days days, weighted towards recent days
+  and lunch/evening hours (Europe/Istanbul), with UUIDv7 ids matching claimed_at
+
+Everything is generated in NumPy and bulk-loaded with COPY, one block of users
+(and their claims) at a time, so memory stays bounded at any size.
+Requires an up-to-date schema (`alembic upgrade head`).
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from sqlalchemy import text
+
+from app.core.bulk import copy_records
+from app.core.database import engine
+
+# name, lat, lng, population weight, city spread (km)
+CITIES = [
+    ("Istanbul", 41.0370, 28.9850, 15.8, 18.0),
+    ("Ankara", 39.9334, 32.8597, 5.8, 12.0),
+    ("Izmir", 38.4237, 27.1428, 4.5, 10.0),
+    ("Bursa", 40.1885, 29.0610, 3.2, 8.0),
+    ("Antalya", 36.8969, 30.7133, 2.7, 8.0),
+    ("Konya", 37.8746, 32.4932, 2.3, 7.0),
+    ("Adana", 37.0000, 35.3213, 2.3, 7.0),
+    ("Gaziantep", 37.0662, 37.3833, 2.1, 6.0),
+    ("Kocaeli", 40.7654, 29.9408, 2.1, 7.0),
+    ("Mersin", 36.8121, 34.6415, 1.9, 6.0),
+    ("Kayseri", 38.7205, 35.4826, 1.4, 5.0),
+    ("Eskisehir", 39.7667, 30.5256, 0.9, 5.0),
+    ("Trabzon", 41.0027, 39.7168, 0.8, 4.0),
+    ("Samsun", 41.2867, 36.3300, 1.4, 5.0),
+    ("Diyarbakir", 37.9144, 40.2306, 1.8, 5.0),
+]
+REWARD_TYPES = np.array(["points", "coupon", "raffle"])
+REWARD_TYPE_P = [0.85, 0.10, 0.05]
+POINT_VALUES = np.array([5, 10, 10, 10, 20, 25, 50])
+HOME_CITY_SHARE = 0.9  # fraction of a user's claims made in their home city
+CLAIMS_PER_BLOCK = 500_000  # claims generated + loaded per user block
+KM_PER_DEG_LAT = 111.32
+UTC_OFFSET_HOURS = 3  # Europe/Istanbul has no DST
+
+USER_COLUMNS = ["id", "firebase_uid", "email", "display_name", "role", "total_points", "is_active"]
+SPONSOR_COLUMNS = ["id", "name", "contact_email", "is_active"]
+LOCATION_COLUMNS = ["id", "sponsor_id", "name", "description", "latitude", "longitude", "radius_m", "city", "is_active"]
+TEMPLATE_COLUMNS = [
+    "id", "location_id", "reward_type", "reward_value", "reward_description",
+    "bearing_degrees", "elevation_degrees", "is_active",
+]
+CLAIM_COLUMNS = ["id", "user_id", "location_id", "latitude", "longitude", "device_fingerprint", "claimed_at"]
+REWARD_COLUMNS = [
+    "id", "user_id", "type", "value", "description", "reward_template_id", "location_id", "redeemed", "redeemed_at",
+    "created_at",
+]
+
+
+# ---- Ids ----
+
+def _as_uuids(raw: np.ndarray) -> list[uuid.UUID]:
+    data = raw.tobytes()
+    return [uuid.UUID(bytes=data[i:i + 16]) for i in range(0, len(data), 16)]
+
+
+def uuid4s(rng: np.random.Generator, n: int) -> list[uuid.UUID]:
+    """Deterministic version-4 UUIDs drawn from `rng`."""
+    raw = rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    return _as_uuids(raw)
+
+
+def uuid7s(rng: np.random.Generator, unix_ms: np.ndarray) -> list[uuid.UUID]:
+    """Deterministic UUIDv7s whose timestamp field is `unix_ms`."""
+    raw = rng.integers(0, 256, size=(unix_ms.size, 16), dtype=np.uint8)
+    shifts = np.arange(40, -1, -8, dtype=np.uint64)
+    raw[:, :6] = ((unix_ms.astype(np.uint64)[:, None] >> shifts) & 0xFF).astype(np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x70
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    return _as_uuids(raw)
+
+
+# ---- Catalog ----
+
+def city_weights() -> np.ndarray:
+    w = np.array([c[3] for c in CITIES])
+    return w / w.sum()
+
+
+def generate_locations(rng: np.random.Generator, n: int, n_sponsors: int) -> dict:
+    """
+    Locations grouped by city (contiguous index ranges) with clustered density.
+
+    Each city gets ~n/200 neighbourhood centres spread over the city; every
+    location sits ~300 m from a centre, and centres get long-tail popularity.
+    """
+    per_city = rng.multinomial(n, city_weights())
+    lat = np.empty(n)
+    lng = np.empty(n)
+    city_idx = np.repeat(np.arange(len(CITIES)), per_city)
+
+    start = 0
+    for (_, c_lat, c_lng, _, spread_km), count in zip(CITIES, per_city):
+        if count == 0:
+            continue
+        n_centres = max(1, count // 200)
+        km_per_deg_lng = KM_PER_DEG_LAT * np.cos(np.radians(c_lat))
+        centre_lat = c_lat + rng.normal(0, spread_km / 2, n_centres) / KM_PER_DEG_LAT
+        centre_lng = c_lng + rng.normal(0, spread_km / 2, n_centres) / km_per_deg_lng
+        popularity = rng.pareto(1.5, n_centres) + 1
+        pick = rng.choice(n_centres, size=count, p=popularity / popularity.sum())
+        lat[start:start + count] = centre_lat[pick] + rng.normal(0, 0.3, count) / KM_PER_DEG_LAT
+        lng[start:start + count] = centre_lng[pick] + rng.normal(0, 0.3, count) / km_per_deg_lng
+        start += count
+
+    sponsor_share = rng.pareto(1.2, n_sponsors) + 1
+    reward_type = rng.choice(len(REWARD_TYPES), size=n, p=REWARD_TYPE_P)
+    return {
+        "count": n,
+        "per_city": per_city,
+        "city_start": np.r_[0, np.cumsum(per_city)[:-1]],
+        "city_idx": city_idx,
+        "lat": lat,
+        "lng": lng,
+        "sponsor_idx": rng.choice(n_sponsors, size=n, p=sponsor_share / sponsor_share.sum()),
+        "reward_type": reward_type,
+        "reward_value": np.where(reward_type == 0, rng.choice(POINT_VALUES, size=n), 1),
+        "bearing": rng.uniform(0, 360, n),
+        "ids": uuid4s(rng, n),
+        "template_ids": uuid4s(rng, n),
+    }
+
+
+def claims_per_user(rng: np.random.Generator, n_users: int, n_claims: int, n_locations: int) -> np.ndarray:
+    """Heavy-tailed claim counts (most users casual, a few power players) summing to ~n_claims."""
+    weights = rng.lognormal(mean=0.0, sigma=1.2, size=n_users)
+    counts = np.floor(weights / weights.sum() * n_claims).astype(np.int64)
+    counts[rng.choice(n_users, size=n_claims - counts.sum(), replace=True)] += 1
+    return np.minimum(counts, n_locations)
+
+
+def claim_times(rng: np.random.Generator, n: int, now: datetime, days: int) -> np.ndarray:
+    """Unix-ms timestamps: more recent days busier, peaks at 13:00 and 19:00 local time."""
+    day_offset = np.floor(days * rng.beta(2.0, 1.0, n))  # 0 = oldest day
+    peak = np.where(rng.random(n) < 0.45, 13.0, 19.0)
+    local_hour = np.clip(rng.normal(peak, 2.5), 7.0, 23.99)
+    start_of_window = (now - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
+    seconds = day_offset * 86400 + (local_hour - UTC_OFFSET_HOURS) * 3600
+    unix_ms = (start_of_window.timestamp() + seconds) * 1000
+    return np.minimum(unix_ms, now.timestamp() * 1000).astype(np.int64)
+
+
+# ---- Loading ----
+
+async def load(table: str, columns: list[str], records: list[tuple]) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("SET LOCAL synchronous_commit = off"))
+        await copy_records(conn, table, columns, records)
+
+
+async def generate(args: argparse.Namespace):
+    rng = np.random.default_rng(args.seed)
+    now = datetime.fromisoformat(args.anchor).replace(tzinfo=timezone.utc)
+    started = time.perf_counter()
+    loaded = 0
+
+    def progress(label: str, rows: int):
+        nonlocal loaded
+        loaded += rows
+        rate = loaded / (time.perf_counter() - started) * 60
+        print(f"… {label}: {loaded:,} rows total ({rate:,.0f} rows/min)")
+
+    if args.truncate:
+        async with engine.begin() as conn:
+            # derived tables too: left behind, their watermarks would skip every regenerated (past) claim
+            await conn.execute(text(
+                "TRUNCATE rewards, claim_logs, reward_templates, locations, sponsors, users, "
+                "claim_rollups, heatmap_tiles, rollup_watermarks, unique_visitor_snapshots, fraud_reviews "
+                "RESTART IDENTITY CASCADE"
+            ))
+
+    # Sponsors
+    sponsor_ids = uuid4s(rng, args.sponsors)
+    await load("sponsors", SPONSOR_COLUMNS, [
+        (sid, f"Synthetic Sponsor {i}", f"sponsor{i}@synthetic.hotncold.test", True)
+        for i, sid in enumerate(sponsor_ids)
+    ])
+    progress("sponsors", args.sponsors)
+
+    # Locations + templates
+    locs = generate_locations(rng, args.locations, args.sponsors)
+    city_names = [c[0] for c in CITIES]
+    for lo in range(0, locs["count"], args.batch):
+        hi = min(lo + args.batch, locs["count"])
+        await load("locations", LOCATION_COLUMNS, [
+            (locs["ids"][i], sponsor_ids[locs["sponsor_idx"][i]], f"{city_names[locs['city_idx'][i]]} Spot {i}",
+             None, float(locs["lat"][i]), float(locs["lng"][i]), 100, city_names[locs["city_idx"][i]], True)
+            for i in range(lo, hi)
+        ])
+        await load("reward_templates", TEMPLATE_COLUMNS, [
+            (locs["template_ids"][i], locs["ids"][i], str(REWARD_TYPES[locs["reward_type"][i]]),
+             int(locs["reward_value"][i]), None, float(locs["bearing"][i]), 0.0, True)
+            for i in range(lo, hi)
+        ])
+        progress("locations", 2 * (hi - lo))
+
+    # Users, claims and rewards – one block of users at a time
+    counts = claims_per_user(rng, args.users, args.claims, args.locations)
+    home_city = rng.choice(len(CITIES), size=args.users, p=city_weights())
+    block_ends = np.searchsorted(np.cumsum(counts), np.arange(CLAIMS_PER_BLOCK, counts.sum(), CLAIMS_PER_BLOCK))
+    bounds = np.unique(np.r_[0, block_ends, args.users])
+    city_w = city_weights()
+
+    for u0, u1 in zip(bounds[:-1], bounds[1:]):
+        user_idx = np.repeat(np.arange(u0, u1), counts[u0:u1])
+        n = user_idx.size
+
+        # pick a city (mostly home) and a location uniformly within it
+        away = rng.random(n) >= HOME_CITY_SHARE
+        city = np.where(away, rng.choice(len(CITIES), size=n, p=city_w), home_city[user_idx])
+        has_locations = locs["per_city"][city] > 0
+        city = np.where(has_locations, city, int(np.argmax(locs["per_city"])))
+        loc_idx = locs["city_start"][city] + (rng.random(n) * locs["per_city"][city]).astype(np.int64)
+
+        # once-only rule: drop repeat (user, location) pairs
+        _, first = np.unique(user_idx * args.locations + loc_idx, return_index=True)
+        first.sort()
+        user_idx, loc_idx = user_idx[first], loc_idx[first]
+        n = user_idx.size
+
+        unix_ms = claim_times(rng, n, now, args.days)
+        claim_ids = uuid7s(rng, unix_ms)
+        reward_ids = uuid7s(rng, unix_ms)
+        jitter = rng.normal(0, 20, (2, n)) / KM_PER_DEG_LAT / 1000  # ~20 m GPS noise
+        claim_lat = locs["lat"][loc_idx] + jitter[0]
+        claim_lng = locs["lng"][loc_idx] + jitter[1] / np.cos(np.radians(locs["lat"][loc_idx]))
+        claimed_at = [datetime.fromtimestamp(ms / 1000, tz=timezone.utc) for ms in unix_ms.tolist()]
+        rtype = locs["reward_type"][loc_idx]
+        rvalue = locs["reward_value"][loc_idx]
+        redeemed = (rtype != 0) & (rng.random(n) < 0.3)
+        # redeemed within two days of the claim; derived from the timestamps so the rng stream is unchanged
+        redeemed_ms = np.minimum(unix_ms + unix_ms % (2 * 86_400_000), now.timestamp() * 1000).astype(np.int64)
+        redeemed_at = [datetime.fromtimestamp(ms / 1000, tz=timezone.utc) if r else None
+                       for ms, r in zip(redeemed_ms.tolist(), redeemed.tolist())]
+        devices = rng.integers(0, 2**63, size=u1 - u0)
+
+        points = np.bincount(user_idx - u0, weights=np.where(rtype == 0, rvalue, 0), minlength=u1 - u0)
+        user_ids = uuid4s(rng, u1 - u0)
+        await load("users", USER_COLUMNS, [
+            (user_ids[j], f"synthetic-{u0 + j}", f"user{u0 + j}@synthetic.hotncold.test",
+             f"Player {u0 + j}", "user", int(points[j]), True)
+            for j in range(u1 - u0)
+        ])
+
+        for lo in range(0, n, args.batch):
+            hi = min(lo + args.batch, n)
+            await load("claim_logs", CLAIM_COLUMNS, [
+                (claim_ids[i], user_ids[user_idx[i] - u0], locs["ids"][loc_idx[i]],
+                 float(claim_lat[i]), float(claim_lng[i]), f"{devices[user_idx[i] - u0]:016x}", claimed_at[i])
+                for i in range(lo, hi)
+            ])
+            await load("rewards", REWARD_COLUMNS, [
+                (reward_ids[i], user_ids[user_idx[i] - u0], str(REWARD_TYPES[rtype[i]]), int(rvalue[i]),
+                 f"+{rvalue[i]} points" if rtype[i] == 0 else None, locs["template_ids"][loc_idx[i]],
+                 locs["ids"][loc_idx[i]], bool(redeemed[i]), redeemed_at[i], claimed_at[i])
+                for i in range(lo, hi)
+            ])
+        progress(f"users {u1:,}/{args.users:,}", (u1 - u0) + 2 * n)
+
+    await engine.dispose()
+    print(f"✅ Generated {loaded:,} rows in {time.perf_counter() - started:.0f}s (seed {args.seed})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=2_000_000)
+    parser.add_argument("--locations", type=int, default=1_000_000)
+    parser.add_argument("--claims", type=int, default=50_000_000)
+    parser.add_argument("--sponsors", type=int, default=500)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch", type=int, default=100_000, help="Rows per COPY")
+    parser.add_argument("--anchor", default="2026-10-01", help="End of the claim history (UTC date); part of the dataset identity")
+    parser.add_argument("--truncate", action="store_true", help="Empty all game tables first (destructive!)")
+    args = parser.parse_args()
+
+    asyncio.run(generate(args))
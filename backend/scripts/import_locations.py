@@ -0,0 +1,287 @@
+"""Bulk-import sponsor locations (and their reward templates) from CSV or GeoJSON.
+
+Usage:
+    python scripts/import_locations.py stores.csv --sponsor-id <uuid> [--city Istanbul]
+    python scripts/import_locations.py stores.geojson --sponsor-id <uuid> --reward-value 25
+
+Rows are read in a streaming fashion, validated with `LocationCreate`, and loaded
+in batches with COPY into a staging table followed by one upsert per table, so a
+batch costs a handful of round trips instead of two per location. After each
+batch commits, a `location.upserted` event per row is published so connected
+live-map clients see new and moved locations without polling.
+
+Ids are derived client-side from the sponsor and each row's `ref` (or
+name + coordinates when there is none), so re-running the same file updates
+rows in place instead of duplicating them; a row repeated within the file
+replaces the earlier one. Re-imports leave `is_active` alone, so locations
+deactivated since (by hand or by the campaign scheduler) stay inactive –
+unless the row's campaign window changed: then the template and its location
+are activated exactly when the new window contains the import time, as the
+scheduler only handles boundaries still ahead of it.
+
+CSV columns: ref, name, description, latitude|lat, longitude|lng|lon, address,
+image_url, radius_m, city, reward_type, reward_value, reward_description,
+bearing_degrees, elevation_degrees, starts_at, ends_at (ISO 8601 campaign
+window, UTC unless an offset is given). GeoJSON: Point features with the same keys
+as properties (`ref` may also be the feature `id`). `.geojsonl` / `.geojsons`
+files are read as one Feature per line.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import random
+import re
+import sys
+import time
+import uuid
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Iterator, TextIO
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pydantic import ValidationError
+from sqlalchemy import select, update
+
+from app.core.bulk import copy_upsert
+from app.core.database import engine
+from app.core.redis import redis_client
+from app.models.location import Location
+from app.models.reward_template import RewardTemplate
+from app.schemas.location import LocationCreate
+from app.schemas.reward_template import RewardTemplateBase
+from app.services.live_map import location_event, publish_location_events
+
+LOCATION_COLUMNS = [
+    "id", "sponsor_id", "name", "description", "latitude", "longitude",
+    "address", "image_url", "radius_m", "city", "is_active",
+]
+TEMPLATE_COLUMNS = [
+    "id", "location_id", "reward_type", "reward_value", "reward_description",
+    "bearing_degrees", "elevation_degrees", "starts_at", "ends_at", "is_active",
+]
+# columns a re-import overwrites: everything but the id and the activation state
+LOCATION_UPDATES = [c for c in LOCATION_COLUMNS if c not in ("id", "is_active")]
+TEMPLATE_UPDATES = [c for c in TEMPLATE_COLUMNS if c not in ("id", "is_active")]
+ALIASES = {"lat": "latitude", "lng": "longitude", "lon": "longitude"}
+FEATURES_START = re.compile(r'"features"\s*:\s*\[')
+
+
+# ---- Readers ----
+
+def iter_csv(fp: TextIO) -> Iterator[dict]:
+    yield from csv.DictReader(fp)
+
+
+def _feature_to_row(feature: dict) -> dict:
+    """Flatten a Point Feature; other geometries yield a row without coordinates (fails validation)."""
+    row = dict(feature.get("properties") or {})
+    row.setdefault("ref", feature.get("id"))
+    geometry = feature.get("geometry") or {}
+    if geometry.get("type") == "Point":
+        row["longitude"], row["latitude"] = geometry["coordinates"][:2]
+    return row
+
+
+def iter_geojson_lines(fp: TextIO) -> Iterator[dict]:
+    """GeoJSONSeq / newline-delimited Features."""
+    for line in fp:
+        line = line.strip().lstrip("\x1e")
+        if line:
+            yield _feature_to_row(json.loads(line))
+
+
+def iter_geojson(fp: TextIO, chunk_size: int = 1 << 16) -> Iterator[dict]:
+    """
+    Stream Features out of a FeatureCollection without loading the whole file.
+
+    Reads fixed-size chunks and `raw_decode`s one Feature object at a time from
+    the `features` array, keeping only the undecoded tail in memory.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    while True:
+        match = FEATURES_START.search(buf)
+        if match:
+            buf = buf[match.end():]
+            break
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            raise ValueError("No 'features' array found in GeoJSON input")
+        buf += chunk
+
+    eof = False
+    while True:
+        buf = buf.lstrip(" \t\r\n,")
+        if buf.startswith("]"):
+            return
+        try:
+            feature, end = decoder.raw_decode(buf)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = fp.read(chunk_size)
+            eof = not chunk
+            buf += chunk
+            continue
+        buf = buf[end:]
+        yield _feature_to_row(feature)
+
+
+def open_reader(path: Path, fp: TextIO) -> Iterator[dict]:
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return iter_csv(fp)
+    if suffix in (".geojsonl", ".geojsons", ".ndjson"):
+        return iter_geojson_lines(fp)
+    if suffix in (".geojson", ".json"):
+        return iter_geojson(fp)
+    raise SystemExit(f"Unsupported file type: {suffix}")
+
+
+# ---- Row mapping ----
+
+def _clean(row: dict) -> dict:
+    cleaned = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        key = ALIASES.get(key.strip().lower(), key.strip().lower())
+        if isinstance(value, str):
+            value = value.strip() or None
+        if value is not None:
+            cleaned[key] = value
+    return cleaned
+
+
+def build_records(row: dict, args: argparse.Namespace) -> tuple[tuple, tuple]:
+    """Validate one input row and return `(location_record, template_record)` for COPY."""
+    row = _clean(row)
+    row.setdefault("city", args.city)
+    row["sponsor_id"] = args.sponsor_id
+    location = LocationCreate(**row)
+
+    ref = row.get("ref") or f"{location.name}|{location.latitude:.6f}|{location.longitude:.6f}"
+    location_id = uuid.uuid5(args.sponsor_id, str(ref))
+    template_id = uuid.uuid5(location_id, "reward_template")
+
+    # deterministic per location so re-imports don't move the AR placement
+    placement = random.Random(location_id.int)
+    template = RewardTemplateBase(
+        reward_type=row.get("reward_type", args.reward_type),
+        reward_value=row.get("reward_value", args.reward_value),
+        reward_description=row.get("reward_description"),
+        bearing_degrees=row.get("bearing_degrees", placement.uniform(0.0, 360.0)),
+        elevation_degrees=row.get("elevation_degrees", 0.0),
+        starts_at=row.get("starts_at"),
+        ends_at=row.get("ends_at"),
+    )
+    # a location is only visible while its campaign runs (the scheduler flips both at later boundaries)
+    active = template.in_window(datetime.now(timezone.utc))
+    description = template.reward_description or f"+{template.reward_value} points at {location.name}"
+
+    location_record = (
+        location_id, args.sponsor_id, location.name, location.description,
+        location.latitude, location.longitude, location.address, location.image_url,
+        location.radius_m, location.city, active,
+    )
+    template_record = (
+        template_id, location_id, template.reward_type, template.reward_value, description,
+        template.bearing_degrees, template.elevation_degrees, template.starts_at, template.ends_at, active,
+    )
+    return location_record, template_record
+
+
+# ---- Loader ----
+
+async def flush(locations: dict[uuid.UUID, tuple], templates: dict[uuid.UUID, tuple]) -> None:
+    window = slice(TEMPLATE_COLUMNS.index("starts_at"), TEMPLATE_COLUMNS.index("is_active"))
+    async with engine.begin() as conn:
+        existing = await conn.execute(
+            select(RewardTemplate.id, RewardTemplate.starts_at, RewardTemplate.ends_at)
+            .where(RewardTemplate.id.in_(list(templates)))
+        )
+        moved = [templates[r.id] for r in existing if (r.starts_at, r.ends_at) != templates[r.id][window]]
+
+        await copy_upsert(conn, "locations", LOCATION_COLUMNS, locations.values(), ["id"], LOCATION_UPDATES)
+        await copy_upsert(conn, "reward_templates", TEMPLATE_COLUMNS, templates.values(), ["id"], TEMPLATE_UPDATES)
+        for active in (True, False):
+            records = [t for t in moved if t[-1] is active]
+            if records:
+                await conn.execute(
+                    update(RewardTemplate).where(RewardTemplate.id.in_([t[0] for t in records])).values(is_active=active)
+                )
+                await conn.execute(
+                    update(Location).where(Location.id.in_([t[1] for t in records])).values(is_active=active)
+                )
+
+        # events carry the stored state: re-imports may have left is_active as it was
+        rows = (await conn.execute(
+            select(Location.id, Location.latitude, Location.longitude, Location.name, Location.radius_m,
+                   Location.city, Location.sponsor_id, Location.is_active)
+            .where(Location.id.in_(list(locations)))
+        )).all()
+    try:
+        await publish_location_events(redis_client, (
+            location_event("location.upserted" if row.is_active else "location.deactivated", row) for row in rows
+        ))
+    except Exception as exc:  # the rows are committed; clients catch up on their next full fetch
+        print(f"⚠️  Could not publish live map events: {exc}", file=sys.stderr)
+
+
+async def import_locations(args: argparse.Namespace):
+    started = time.perf_counter()
+    loaded = skipped = 0
+    # keyed by id: a row repeated within a batch replaces the earlier one (an upsert can't touch a row twice)
+    locations: dict[uuid.UUID, tuple] = {}
+    templates: dict[uuid.UUID, tuple] = {}
+
+    with args.path.open(encoding="utf-8", newline="") as fp:
+        for lineno, row in enumerate(open_reader(args.path, fp), start=1):
+            try:
+                location_record, template_record = build_records(row, args)
+            except ValidationError as exc:
+                skipped += 1
+                problems = "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors())
+                print(f"⚠️  Row {lineno} skipped: {problems}", file=sys.stderr)
+                continue
+            except (ValueError, TypeError) as exc:
+                skipped += 1
+                print(f"⚠️  Row {lineno} skipped: {exc}", file=sys.stderr)
+                continue
+            locations[location_record[0]] = location_record
+            templates[template_record[0]] = template_record
+
+            if len(locations) >= args.batch:
+                if not args.dry_run:
+                    await flush(locations, templates)
+                loaded += len(locations)
+                locations.clear()
+                templates.clear()
+                elapsed = time.perf_counter() - started
+                print(f"… {loaded:,} locations ({loaded / elapsed:,.0f}/s)")
+
+    if locations and not args.dry_run:
+        await flush(locations, templates)
+    loaded += len(locations)
+    await engine.dispose()
+    await redis_client.aclose()
+
+    verb = "Validated" if args.dry_run else "Imported"
+    print(f"✅ {verb} {loaded:,} locations in {time.perf_counter() - started:.1f}s ({skipped:,} rows skipped)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--sponsor-id", type=uuid.UUID, required=True)
+    parser.add_argument("--city", default=None, help="Default city for rows without one")
+    parser.add_argument("--reward-type", default="points")
+    parser.add_argument("--reward-value", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=5000)
+    parser.add_argument("--dry-run", action="store_true", help="Validate only, write nothing")
+    args = parser.parse_args()
+
+    asyncio.run(import_locations(args))
@@ -0,0 +1,48 @@
+"""Load coupon codes into a reward template's pool (COPY; duplicates are skipped).
+
+Usage:
+    python scripts/load_coupons.py <template_id> codes.txt       # one code per line
+    python scripts/load_coupons.py <template_id> --generate 1000000 [--length 12] [--prefix SPRING-]
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.database import async_session_factory, engine
+from app.core.redis import redis_client
+from app.services.coupons import SOLD_OUT_KEY, load_codes, pool_stats, stream_codes
+
+
+async def main(args: argparse.Namespace):
+    template_id = uuid.UUID(args.template_id)
+    async with async_session_factory() as db:
+        if args.generate:
+            loaded = await load_codes(db, template_id, stream_codes(args.generate, args.length, args.prefix))
+        else:
+            with open(args.file, encoding="utf-8-sig") as codes:
+                loaded = await load_codes(db, template_id, codes)
+        total, issued, redeemed = await pool_stats(db, template_id)
+        await db.commit()
+    await redis_client.delete(SOLD_OUT_KEY.format(template_id))
+    print(f"✅ Loaded {loaded:,} new codes – pool has {total:,} ({total - issued:,} available, {redeemed:,} redeemed)")
+    await engine.dispose()
+    await redis_client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("template_id")
+    parser.add_argument("file", nargs="?")
+    parser.add_argument("--generate", type=int, default=None, metavar="COUNT")
+    parser.add_argument("--length", type=int, default=12)
+    parser.add_argument("--prefix", default="")
+    args = parser.parse_args()
+    if not args.generate and not args.file:
+        parser.error("give a file of codes or --generate COUNT")
+
+    asyncio.run(main(args))
@@ -0,0 +1,50 @@
+"""Push a "new treasure nearby" notification to players last seen near a location.
+
+Usage:
+    python scripts/notify_nearby.py <location_id> [--radius-km 3] [--transport fcm|stub]
+    python scripts/notify_nearby.py <location_id> --enqueue  # hand it to a job worker instead
+    python scripts/notify_nearby.py --prune  # forget positions older than PUSH_POSITION_MAX_AGE_DAYS
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.database import engine
+from app.core.redis import redis_client
+from app.services.notifications import make_transport, prune_positions
+from app.tasks.notifications import notify_nearby_users
+
+
+async def main(args: argparse.Namespace):
+    if args.prune:
+        dropped = await prune_positions(redis_client)
+        print(f"✅ Pruned {dropped:,} stale positions")
+    elif args.enqueue:
+        job_id = await notify_nearby_users.enqueue(args.location_id, args.radius_km)
+        print(f"✅ Queued notification job {job_id}")
+    else:
+        report = await notify_nearby_users(args.location_id, args.radius_km, make_transport(args.transport))
+        print(
+            f"✅ Sent {report.sent:,} pushes to {report.recipients:,} nearby players in {report.batches:,} batches "
+            f"({report.elapsed:.1f}s, {report.invalid:,} dead tokens cleared, {report.failed:,} failed)"
+        )
+    await engine.dispose()
+    await redis_client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("location_id", nargs="?")
+    parser.add_argument("--radius-km", type=float, default=None)
+    parser.add_argument("--transport", choices=["fcm", "stub"], default=None)
+    parser.add_argument("--prune", action="store_true")
+    parser.add_argument("--enqueue", action="store_true", help="queue the fan-out for a worker (scripts/worker.py)")
+    args = parser.parse_args()
+    if not args.prune and not args.location_id:
+        parser.error("location_id is required unless --prune is given")
+
+    asyncio.run(main(args))
@@ -0,0 +1,83 @@
+"""Aggregate request profiles by route, or mint an X-Profile token.
+
+Usage:
+    python scripts/profile_report.py token [--ttl 3600]
+    python scripts/profile_report.py report [--dir profiles] [--route /map/locations] [--top 25]
+                                            [--sort cumulative|tottime|ncalls] [--output merged.prof]
+
+`token` prints a header value: `curl -H "X-Profile: <token>" ...` profiles that
+request (the server needs PROFILING_ENABLED=true and the same SECRET_KEY).
+`report` merges every captured profile per route and prints the hottest
+functions; `--output` writes the merged pstats for snakeviz / flameprof.
+"""
+
+import argparse
+import json
+import pstats
+import statistics
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core import settings
+from app.core.profiling import sign_profile_token
+
+
+def load_profiles(directory: Path) -> dict[str, list[dict]]:
+    """`{"METHOD /route": [meta, ...]}` for every profile with both files present."""
+    by_route: dict[str, list[dict]] = defaultdict(list)
+    for sidecar in sorted(directory.glob("*.json")):
+        meta = json.loads(sidecar.read_text())
+        meta["prof_path"] = sidecar.with_suffix(".prof")
+        if meta["prof_path"].exists():
+            by_route[f"{meta['method']} {meta['route']}"].append(meta)
+    return by_route
+
+
+def report(args: argparse.Namespace) -> None:
+    by_route = load_profiles(args.dir)
+    if args.route:
+        by_route = {key: metas for key, metas in by_route.items() if key.split(" ", 1)[1] == args.route}
+    if not by_route:
+        print(f"⚠️  No profiles found in {args.dir}")
+        return
+
+    print(f"{'route':<50} {'profiles':>8} {'p50 ms':>10} {'max ms':>10}")
+    for key, metas in sorted(by_route.items(), key=lambda item: -len(item[1])):
+        durations = [m["duration_ms"] for m in metas]
+        print(f"{key:<50} {len(metas):>8} {statistics.median(durations):>10.1f} {max(durations):>10.1f}")
+
+    for key, metas in by_route.items():
+        stats = pstats.Stats(*(str(m["prof_path"]) for m in metas))
+        print(f"\n▶ {key} ({len(metas)} profiles)")
+        stats.strip_dirs().sort_stats(args.sort).print_stats(args.top)
+        if args.output:
+            # one merged file per route when several routes are reported
+            output = args.output if len(by_route) == 1 else args.output.with_name(
+                f"{args.output.stem}-{key.replace(' ', '_').replace('/', '_').strip('_')}{args.output.suffix}"
+            )
+            stats.dump_stats(output)
+            print(f"✅ Merged profile written to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    token = commands.add_parser("token", help="Print a signed X-Profile header value")
+    token.add_argument("--ttl", type=int, default=3600, help="Seconds the token stays valid")
+
+    rep = commands.add_parser("report", help="Aggregate captured profiles by route")
+    rep.add_argument("--dir", type=Path, default=Path(settings.profile_dir))
+    rep.add_argument("--route", default=None, help="Only this route template, e.g. /map/locations")
+    rep.add_argument("--top", type=int, default=25)
+    rep.add_argument("--sort", default="cumulative", choices=["cumulative", "tottime", "ncalls"])
+    rep.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    if args.command == "token":
+        print(sign_profile_token(args.ttl))
+    else:
+        report(args)
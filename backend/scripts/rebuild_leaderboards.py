@@ -0,0 +1,38 @@
+"""Recompute the Redis leaderboards (global, per city, per season) from `rewards`.
+
+Usage: python scripts/rebuild_leaderboards.py
+
+Boards are built under staging keys and swapped in with RENAME, so readers
+never see a half-built board. Claims made while it runs can be overwritten:
+run it when traffic is low, e.g. after restoring Redis or changing
+LEADERBOARD_SEASON_MONTHS.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.database import async_session_factory, engine
+from app.core.redis import redis_client
+from app.services.leaderboard import rebuild_leaderboards
+
+
+async def main():
+    started = time.perf_counter()
+    async with async_session_factory() as db:
+        sizes = await rebuild_leaderboards(db, redis_client)
+    await engine.dispose()
+    await redis_client.aclose()
+
+    for key, members in sorted(sizes.items()):
+        print(f"  {key:<40} {members:>10,} players")
+    print(f"✅ Rebuilt {len(sizes)} leaderboards in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description=__doc__.splitlines()[0]).parse_args()
+    asyncio.run(main())
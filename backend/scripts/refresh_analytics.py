@@ -0,0 +1,38 @@
+"""Fold new claims into the sponsor analytics rollups and heatmaps, and snapshot unique-visitor HLLs.
+
+Usage: python scripts/refresh_analytics.py [--interval SECONDS]
+
+Without --interval it runs once (suitable for cron); with it, it loops.
+Job workers (scripts/worker.py) already run these every JOBS_ANALYTICS_INTERVAL_SECONDS.
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.tasks.analytics import refresh_heatmaps, refresh_rollups, snapshot_unique_counters
+
+
+async def main(interval: float | None):
+    while True:
+        folded = await refresh_rollups()
+        binned = await refresh_heatmaps()
+        snapshots = await snapshot_unique_counters()
+        print(
+            f"✅ Folded {folded} claims into analytics rollups, binned {binned} into heatmaps, "
+            f"saved {snapshots} unique-visitor snapshots"
+        )
+        if interval is None:
+            return
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--interval", type=float, default=None)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.interval))
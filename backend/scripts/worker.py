@@ -0,0 +1,80 @@
+"""Run a background job worker (see app/tasks/queue.py).
+
+Usage:
+    python scripts/worker.py [--queues notifications,default,analytics] [--concurrency 8] [--metrics-port 9100]
+    python scripts/worker.py --requeue-dead notifications  # retry dead-lettered jobs, then exit
+
+Queues are polled in the order given. SIGTERM / SIGINT let the jobs in hand
+finish before exiting; jobs of a worker that is killed outright are requeued
+by the others once its heartbeat lapses.
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core import settings
+from app.core.database import engine
+from app.core.metrics import render
+from app.core.redis import redis_client
+from app.tasks import analytics, campaigns, fraud, notifications  # noqa: F401  (registers their tasks)
+from app.tasks.queue import TASKS, Worker, requeue_dead
+
+
+async def serve_metrics(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Minimal HTTP responder: every request gets the Prometheus exposition."""
+    try:
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        body = render().encode()
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/plain; version=0.0.4\r\n"
+            + f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def main(args: argparse.Namespace):
+    if args.requeue_dead:
+        moved = await requeue_dead(args.requeue_dead, args.limit)
+        print(f"✅ Requeued {moved:,} dead jobs on {args.requeue_dead}")
+        await redis_client.aclose()
+        return
+
+    worker = Worker(args.queues.split(",") if args.queues else None, args.concurrency)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+
+    server = None
+    if args.metrics_port:
+        server = await asyncio.start_server(serve_metrics, "0.0.0.0", args.metrics_port)
+    print(f"✅ Worker {worker.id}: {len(TASKS)} tasks, queues {','.join(worker.queues)}, "
+          f"concurrency {worker.concurrency}")
+    try:
+        await worker.run()
+    finally:
+        if server is not None:
+            server.close()
+        await engine.dispose()
+        await redis_client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queues", default=None, help="comma-separated, in priority order (default JOBS_QUEUES)")
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--metrics-port", type=int, default=settings.jobs_metrics_port)
+    parser.add_argument("--requeue-dead", metavar="QUEUE", default=None)
+    parser.add_argument("--limit", type=int, default=1000, help="max jobs moved by --requeue-dead")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(main(args))
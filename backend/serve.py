@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Production entry point: multi-worker uvicorn with uvloop and httptools.
+
+Usage: python serve.py [--workers N] [--host 0.0.0.0] [--port 8000]
+
+Worker count, backlog, keep-alive and drain timeout come from settings
+(WEB_CONCURRENCY, SERVER_*), with CLI flags taking precedence. Forwarded
+client addresses are only trusted from SERVER_FORWARDED_ALLOW_IPS. Each worker
+warms its DB and Redis pools in the lifespan before accepting connections.
+On SIGTERM/SIGINT uvicorn stops accepting, lets in-flight requests (claims
+included) finish for up to SERVER_GRACEFUL_TIMEOUT seconds, then runs the
+lifespan shutdown. Use run.py for development (auto-reload, one process).
+"""
+
+import argparse
+import os
+
+import uvicorn
+
+from app.core import settings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=settings.web_concurrency or os.cpu_count() or 1)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop="uvloop",
+        http="httptools",
+        backlog=settings.server_backlog,
+        timeout_keep_alive=settings.server_keepalive_seconds,
+        timeout_graceful_shutdown=settings.server_graceful_timeout,
+        access_log=settings.server_access_log,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.server_forwarded_allow_ips,
+        log_level=args.log_level,
+    )
+
+
+if __name__ == "__main__":
+    main()
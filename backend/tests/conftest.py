@@ -1,14 +1,18 @@
 """Shared test fixtures."""
 
 import asyncio
+import os
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 
+from app.core import settings
 from app.core.database import Base, get_db
 from app.core.deps import get_current_user
 from app.core.redis import get_redis
@@ -48,6 +52,27 @@ def mock_redis():
     return r
 
 
+# ---- Live Postgres (tests using it skip when none is reachable) ----
+@pytest_asyncio.fixture
+async def live_db():
+    """Session factory on TEST_DATABASE_URL (default: DATABASE_URL), with any missing tables created."""
+    import app.models  # noqa: F401 – registers every table on Base.metadata
+
+    engine = create_async_engine(
+        os.environ.get("TEST_DATABASE_URL", settings.database_url),
+        poolclass=NullPool,
+        connect_args={"timeout": 2},
+    )
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    except (DBAPIError, OSError, asyncio.TimeoutError):
+        await engine.dispose()
+        pytest.skip("Postgres not reachable")
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
 # ---- App with dependency overrides ----
 @pytest_asyncio.fixture
 async def client(fake_user, mock_redis):
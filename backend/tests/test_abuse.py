@@ -0,0 +1,96 @@
+"""Tests for the single-round-trip claim rate limits and abuse checks (script tests need a reachable Redis)."""
+
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+import pytest_asyncio
+import redis.asyncio as redis
+
+from app.core import settings
+from app.services.abuse import check_claim, device_key, rate_keys, record_claim, user_key
+
+ISTANBUL = (41.0082, 28.9784)
+ANKARA = (39.9334, 32.8597)
+NOW = 1_790_000_000.0
+
+
+@pytest_asyncio.fixture
+async def live_redis():
+    client = redis.from_url(settings.redis_url, decode_responses=True)
+    try:
+        await client.ping()
+    except (redis.ConnectionError, OSError):
+        await client.aclose()
+        pytest.skip("Redis not reachable")
+    yield client
+    await client.aclose()
+
+
+@pytest_asyncio.fixture
+async def claimer(live_redis):
+    """Records successful claims for fresh users/devices and cleans their keys up afterwards."""
+    keys = []
+
+    async def claim(user_id, device_id, position, at):
+        verdict = await check_claim(live_redis, user_id, device_id, *position, now=at)
+        if verdict.ok:
+            pipe = live_redis.pipeline()
+            record_claim(pipe, user_id, device_id, *position, now=at)
+            await pipe.execute()
+            await live_redis.delete(rate_keys(user_id, at)[0])  # skip the cooldown between steps
+        keys.extend([*rate_keys(user_id, at), user_key(user_id)])
+        if device_id:
+            keys.extend([device_key(device_id), f"{device_key(device_id)}:users"])
+        return verdict
+
+    yield claim
+    await live_redis.delete(*keys)
+
+
+class TestRecordClaim:
+    def test_no_device_state_without_fingerprint(self):
+        pipe = MagicMock()
+        user_id = uuid.uuid4()
+        record_claim(pipe, user_id, None, *ISTANBUL, now=NOW)
+        assert [c.args[0] for c in pipe.hset.call_args_list] == [user_key(user_id)]
+        pipe.sadd.assert_not_called()
+
+    def test_device_keys_are_bounded(self):
+        assert len(device_key("x" * 500)) == len("abuse:device:") + 40
+
+
+@pytest.mark.asyncio
+class TestGuardScript:
+    async def test_teleport_is_impossible_travel(self, claimer):
+        user_id = uuid.uuid4()
+        assert (await claimer(user_id, None, ISTANBUL, NOW)).ok
+        verdict = await claimer(user_id, None, ANKARA, NOW + 600)  # ~350 km in 10 minutes
+        assert verdict.reason == "travel" and verdict.detail > 2000
+        assert (await claimer(user_id, None, ANKARA, NOW + 6 * 3600)).ok  # a plausible drive
+
+    async def test_nearby_jitter_is_ignored(self, claimer):
+        user_id = uuid.uuid4()
+        assert (await claimer(user_id, None, ISTANBUL, NOW)).ok
+        assert (await claimer(user_id, None, (ISTANBUL[0] + 0.005, ISTANBUL[1]), NOW + 1)).ok
+
+    async def test_device_travel_spans_accounts(self, claimer):
+        device = f"device-{uuid.uuid4()}"
+        assert (await claimer(uuid.uuid4(), device, ISTANBUL, NOW)).ok
+        assert (await claimer(uuid.uuid4(), device, ANKARA, NOW + 60)).reason == "device_travel"
+
+    async def test_shared_device(self, claimer):
+        device = f"device-{uuid.uuid4()}"
+        users = [uuid.uuid4() for _ in range(settings.abuse_max_users_per_device + 1)]
+        for user_id in users[:-1]:
+            assert (await claimer(user_id, device, ISTANBUL, NOW)).ok
+        verdict = await claimer(users[-1], device, ISTANBUL, NOW)
+        assert verdict.reason == "device_shared" and verdict.detail == settings.abuse_max_users_per_device
+        assert (await claimer(users[0], device, ISTANBUL, NOW)).ok  # existing accounts keep working
+
+    async def test_cooldown_comes_first(self, live_redis, claimer):
+        user_id = uuid.uuid4()
+        await claimer(user_id, None, ISTANBUL, NOW)
+        await live_redis.setex(rate_keys(user_id, NOW)[0], 60, "1")
+        verdict = await check_claim(live_redis, user_id, None, *ANKARA, now=NOW + 1)
+        assert verdict.reason == "cooldown"
@@ -0,0 +1,18 @@
+"""Tests for the benchmark baseline comparison."""
+
+from benchmarks.harness import Result, compare
+
+
+def _result(name: str, median_ns: float) -> Result:
+    return Result(name=name, median_ns=median_ns, p95_ns=median_ns, ops_per_sec=1e9 / median_ns, rounds=5, number=1)
+
+
+class TestCompare:
+    def test_flags_only_regressions_beyond_threshold(self):
+        baseline = {"results": {"a": {"median_ns": 100.0}, "b": {"median_ns": 100.0}}}
+        comparisons = {c.name: c for c in compare([_result("a", 120.0), _result("b", 130.0)], baseline, 0.25)}
+        assert not comparisons["a"].regressed
+        assert comparisons["b"].regressed
+
+    def test_new_benchmarks_are_skipped(self):
+        assert compare([_result("new", 100.0)], {"results": {}}, 0.25) == []
@@ -0,0 +1,154 @@
+"""Tests for time-windowed campaigns (the scheduler tests need a reachable Postgres)."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from pydantic import ValidationError
+from sqlalchemy import delete, select
+
+from app.models.location import Location
+from app.models.reward_template import RewardTemplate
+from app.models.rollup_watermark import RollupWatermark
+from app.schemas.reward_template import RewardTemplateCreate
+from app.services.campaigns import WATERMARK, apply_campaign_windows
+from app.tasks.queue import TASKS
+
+NOW = datetime(2026, 10, 19, 12, tzinfo=timezone.utc)
+
+
+def template(**window) -> RewardTemplate:
+    return RewardTemplate(location_id=uuid.uuid4(), reward_type="points", reward_value=10, **window)
+
+
+class TestWindow:
+    def test_open_ended(self):
+        assert template().in_window(NOW)
+
+    def test_bounds_are_half_open(self):
+        t = template(starts_at=NOW, ends_at=NOW + timedelta(hours=1))
+        assert t.in_window(NOW)
+        assert not t.in_window(NOW - timedelta(seconds=1))
+        assert not t.in_window(NOW + timedelta(hours=1))
+
+
+class TestSchema:
+    def test_rejects_inverted_window(self):
+        with pytest.raises(ValidationError):
+            RewardTemplateCreate(location_id=uuid.uuid4(), reward_type="points", reward_value=1,
+                                 starts_at=NOW, ends_at=NOW)
+
+    def test_future_campaign_starts_inactive(self):
+        future = datetime.now(timezone.utc) + timedelta(days=1)
+        created = RewardTemplateCreate(location_id=uuid.uuid4(), reward_type="points", reward_value=1,
+                                       starts_at=future)
+        assert created.is_active is False
+
+    def test_ended_campaign_inactive(self):
+        created = RewardTemplateCreate(location_id=uuid.uuid4(), reward_type="points", reward_value=1,
+                                       ends_at=datetime.now(timezone.utc) - timedelta(days=1))
+        assert created.is_active is False
+
+    def test_naive_times_are_utc(self):
+        created = RewardTemplateCreate(location_id=uuid.uuid4(), reward_type="points", reward_value=1,
+                                       starts_at=datetime(2099, 1, 1), ends_at="2099-01-02T03:00:00+03:00")
+        assert created.starts_at == datetime(2099, 1, 1, tzinfo=timezone.utc)
+        assert created.ends_at == datetime(2099, 1, 2, tzinfo=timezone.utc)
+        assert created.is_active is False
+
+
+def test_scheduler_is_a_periodic_job():
+    import app.tasks.campaigns  # noqa: F401  (registers the task)
+
+    assert TASKS["app.tasks.campaigns.flip_campaign_windows"].every is not None
+
+
+@pytest_asyncio.fixture
+async def campaigns(live_db):
+    """Adds windowed templates (each on its own location); restores the scheduler watermark afterwards."""
+    async with live_db() as db:
+        saved = await db.get(RollupWatermark, WATERMARK)
+        saved = saved.watermark if saved else None
+    locations = []
+
+    async def add(active, **window) -> RewardTemplate:
+        location = Location(name="Campaign", latitude=41.0, longitude=29.0, city="Test", is_active=active)
+        async with live_db() as db:
+            db.add(location)
+            await db.flush()
+            created = RewardTemplate(location_id=location.id, reward_type="points", reward_value=5,
+                                     is_active=active, **window)
+            db.add(created)
+            await db.commit()
+        locations.append(location.id)
+        return created
+
+    async def set_watermark(at):
+        async with live_db() as db:
+            await db.execute(delete(RollupWatermark).where(RollupWatermark.name == WATERMARK))
+            if at is not None:
+                db.add(RollupWatermark(name=WATERMARK, watermark=at))
+            await db.commit()
+
+    yield live_db, add, set_watermark
+
+    async with live_db() as db:
+        await db.execute(delete(RewardTemplate).where(RewardTemplate.location_id.in_(locations)))
+        await db.execute(delete(Location).where(Location.id.in_(locations)))
+        await db.commit()
+    await set_watermark(saved)
+
+
+async def _run(factory):
+    async with factory() as db:
+        changes = await apply_campaign_windows(db)
+        await db.commit()
+    return changes
+
+
+async def _active(factory, created) -> tuple[bool, bool]:
+    async with factory() as db:
+        result = await db.execute(
+            select(RewardTemplate.is_active, Location.is_active)
+            .join(Location, Location.id == RewardTemplate.location_id)
+            .where(RewardTemplate.id == created.id)
+        )
+        return tuple(result.one())
+
+
+@pytest.mark.asyncio
+class TestScheduler:
+    async def test_first_run_starts_from_now(self, campaigns):
+        factory, add, set_watermark = campaigns
+        now = datetime.now(timezone.utc)
+        switched_off = await add(False, starts_at=now - timedelta(days=3))  # disabled by hand inside its window
+        await set_watermark(None)
+
+        changes = await _run(factory)
+        assert switched_off.id not in changes.started
+        assert await _active(factory, switched_off) == (False, False)
+        async with factory() as db:
+            assert (await db.get(RollupWatermark, WATERMARK)).watermark > now
+
+    async def test_flips_boundaries_since_the_last_run(self, campaigns):
+        factory, add, set_watermark = campaigns
+        now = datetime.now(timezone.utc)
+        opened = await add(False, starts_at=now - timedelta(minutes=30))
+        closed = await add(True, starts_at=now - timedelta(days=1), ends_at=now - timedelta(minutes=10))
+        opened_and_closed = await add(False, starts_at=now - timedelta(minutes=30), ends_at=now - timedelta(minutes=5))
+        before_last_run = await add(False, starts_at=now - timedelta(hours=2))
+        upcoming = await add(False, starts_at=now + timedelta(hours=1))
+        await set_watermark(now - timedelta(hours=1))
+
+        changes = await _run(factory)
+        assert opened.id in changes.started and closed.id in changes.ended
+        assert opened_and_closed.id not in changes.started
+        assert {before_last_run.id, upcoming.id}.isdisjoint(changes.started + changes.ended)
+        assert await _active(factory, opened) == (True, True)
+        assert await _active(factory, closed) == (False, False)
+        assert await _active(factory, before_last_run) == (False, False)
+        assert {e["location_id"] for e in changes.events} >= {str(opened.location_id), str(closed.location_id)}
+
+        again = await _run(factory)
+        assert {opened.id, closed.id}.isdisjoint(again.started + again.ended)
@@ -0,0 +1,77 @@
+"""Tests for the claim path's ordering of the database commit and Redis updates (need a reachable Postgres)."""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+import redis.asyncio as redis
+from sqlalchemy import delete, select
+
+from app.models import ClaimLog, Location, Reward, RewardTemplate, User
+from app.schemas.claim import ClaimRequest
+from app.services import claim_service
+from app.services.abuse import Verdict
+
+POSITION = (41.0082, 28.9784)
+
+
+@pytest_asyncio.fixture
+async def treasure(live_db, monkeypatch):
+    """A points location and a player; the Redis abuse check always passes."""
+    monkeypatch.setattr(claim_service, "check_claim", AsyncMock(return_value=Verdict("ok", 0.0)))
+    location = Location(id=uuid.uuid4(), name="Fountain", latitude=POSITION[0], longitude=POSITION[1], city="Test")
+    user = User(id=uuid.uuid4(), firebase_uid=f"test-{uuid.uuid4()}", email=f"{uuid.uuid4()}@example.com")
+    async with live_db() as db:
+        db.add_all([location, user])
+        await db.flush()
+        db.add(RewardTemplate(location_id=location.id, reward_type="points", reward_value=25))
+        await db.commit()
+
+    yield live_db, location, user
+
+    async with live_db() as db:
+        for model in (ClaimLog, Reward):
+            await db.execute(delete(model).where(model.location_id == location.id))
+        await db.execute(delete(RewardTemplate).where(RewardTemplate.location_id == location.id))
+        await db.execute(delete(Location).where(Location.id == location.id))
+        await db.execute(delete(User).where(User.id == user.id))
+        await db.commit()
+
+
+def _redis(execute) -> MagicMock:
+    client = MagicMock()
+    client.pipeline.return_value.execute = AsyncMock(side_effect=execute)
+    return client
+
+
+async def _claim(factory, location, user, redis_client):
+    async with factory() as db:
+        player = await db.get(User, user.id)
+        return await claim_service.process_claim(
+            db, redis_client, player, str(location.id), ClaimRequest(latitude=POSITION[0], longitude=POSITION[1])
+        )
+
+
+@pytest.mark.asyncio
+class TestClaimCommit:
+    async def test_redis_hears_of_the_claim_after_it_committed(self, treasure):
+        factory, location, user = treasure
+        committed = []
+
+        async def execute():
+            async with factory() as other:  # a separate connection only sees committed rows
+                result = await other.execute(select(ClaimLog).where(ClaimLog.location_id == location.id))
+                committed.append(result.scalar_one_or_none() is not None)
+            return []
+
+        response = await _claim(factory, location, user, _redis(execute))
+        assert response.total_points == 25
+        assert committed == [True]
+
+    async def test_redis_failure_does_not_fail_a_committed_claim(self, treasure):
+        factory, location, user = treasure
+        response = await _claim(factory, location, user, _redis(redis.ConnectionError("down")))
+        assert response.reward_value == 25
+        async with factory() as db:
+            assert (await db.get(User, user.id)).total_points == 25
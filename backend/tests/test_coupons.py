@@ -0,0 +1,209 @@
+"""Tests for coupon pools (issuing, redemption and loading need a reachable Postgres)."""
+
+import asyncio
+import io
+import uuid
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import delete, select
+
+from app.api.coupons import upload_lines
+from app.models import CouponCode, Location, Reward, RewardTemplate, Sponsor, User
+from app.services.coupons import (
+    CODE_ALPHABET, clean_code, generate_codes, issue_code, load_codes, pool_stats, redeem_code, stream_codes,
+)
+
+
+class TestCodes:
+    def test_generated_codes(self):
+        codes = list(generate_codes(1000, length=10, prefix="SPRING-"))
+        assert len(set(codes)) == 1000
+        assert all(c.startswith("SPRING-") and len(c) == 17 for c in codes)
+        assert set("".join(c[7:] for c in codes)) <= set(CODE_ALPHABET)
+
+    @pytest.mark.asyncio
+    async def test_streamed_in_chunks(self, monkeypatch):
+        monkeypatch.setattr("app.services.coupons.LOAD_CHUNK", 7)
+        codes = [code async for code in stream_codes(20, length=8)]
+        assert len(set(codes)) == 20 and all(len(c) == 8 for c in codes)
+
+    def test_clean_code(self):
+        assert clean_code("  ABC123\r") == "ABC123"
+        assert clean_code("   ") is None
+        with pytest.raises(ValueError):
+            clean_code("X" * 65)
+
+
+@pytest.mark.asyncio
+async def test_upload_lines_survive_chunk_boundaries(monkeypatch):
+    monkeypatch.setattr("app.api.coupons.READ_CHUNK", 4)
+    upload = UploadFile(io.BytesIO("﻿AAA111\nBBB222\r\nCCC333".encode("utf-8")))
+    assert [line.strip() async for line in upload_lines(upload)] == ["AAA111", "BBB222", "CCC333"]
+
+
+@pytest.mark.asyncio
+async def test_players_cannot_redeem(client):
+    response = await client.post(
+        "/sponsor/coupons/redeem", json={"reward_template_id": str(uuid.uuid4()), "code": "ABC"}
+    )
+    assert response.status_code == 403
+
+
+@pytest_asyncio.fixture
+async def pool(live_db):
+    """A sponsor's coupon template and a player, removed again afterwards."""
+    sponsor = Sponsor(id=uuid.uuid4(), name="Test Sponsor", contact_email="coupons@example.com")
+    location = Location(id=uuid.uuid4(), sponsor_id=sponsor.id, name="Test Shop", latitude=41.0, longitude=29.0, city="Test")
+    template = RewardTemplate(id=uuid.uuid4(), location_id=location.id, reward_type="coupon", reward_value=10)
+    user = User(id=uuid.uuid4(), firebase_uid=f"test-{uuid.uuid4()}", email=f"{uuid.uuid4()}@example.com")
+    async with live_db() as db:
+        db.add_all([sponsor, user])
+        await db.flush()
+        db.add(location)
+        await db.flush()
+        db.add(template)
+        await db.commit()
+
+    yield live_db, sponsor, template, user
+
+    async with live_db() as db:
+        await db.execute(delete(CouponCode).where(CouponCode.reward_template_id == template.id))
+        await db.execute(delete(Reward).where(Reward.user_id == user.id))
+        await db.execute(delete(RewardTemplate).where(RewardTemplate.id == template.id))
+        await db.execute(delete(Location).where(Location.id == location.id))
+        await db.execute(delete(Sponsor).where(Sponsor.id == sponsor.id))
+        await db.execute(delete(User).where(User.id == user.id))
+        await db.commit()
+
+
+async def _reward(db, template, user) -> uuid.UUID:
+    reward = Reward(user_id=user.id, type="coupon", value=10, reward_template_id=template.id)
+    db.add(reward)
+    await db.flush()
+    return reward.id
+
+
+@pytest.mark.asyncio
+class TestLoadCodes:
+    async def test_loads_on_a_fresh_session_and_skips_duplicates(self, pool):
+        factory, _, template, _ = pool
+        async with factory() as db:
+            assert await load_codes(db, template.id, ["AAA111", "BBB222", "AAA111", "  "]) == 2
+            await db.commit()
+        async with factory() as db:
+            assert await load_codes(db, template.id, _aiter(["BBB222", "CCC333"])) == 1
+            await db.commit()
+            assert await pool_stats(db, template.id) == (3, 0, 0)
+            assert (await db.get(RewardTemplate, template.id)).coupon_pool
+
+    async def test_loads_across_copy_chunks(self, pool, monkeypatch):
+        monkeypatch.setattr("app.services.coupons.LOAD_CHUNK", 3)
+        factory, _, template, _ = pool
+        async with factory() as db:
+            assert await load_codes(db, template.id, stream_codes(10, length=8)) == 10
+            await db.commit()
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+@pytest.mark.asyncio
+class TestIssueCode:
+    async def test_concurrent_claims_get_distinct_codes(self, pool):
+        factory, _, template, user = pool
+        async with factory() as db:
+            await load_codes(db, template.id, ["AAA111", "BBB222", "CCC333"])
+            await db.commit()
+
+        first, second = factory(), factory()
+        try:
+            # the first claim holds its code's row lock until it commits; the second must skip past it
+            code_a = await issue_code(first, template.id, await _reward(first, template, user))
+            code_b = await issue_code(second, template.id, await _reward(second, template, user))
+            assert {code_a, code_b} <= {"AAA111", "BBB222", "CCC333"} and code_a != code_b
+            await asyncio.gather(first.commit(), second.commit())
+        finally:
+            await first.close()
+            await second.close()
+
+        async with factory() as db:
+            assert await pool_stats(db, template.id) == (3, 2, 0)
+
+    async def test_last_code_locked_is_retryable_then_sold_out(self, pool):
+        factory, _, template, user = pool
+        async with factory() as db:
+            await load_codes(db, template.id, ["AAA111"])
+            await db.commit()
+
+        first, second = factory(), factory()
+        try:
+            assert await issue_code(first, template.id, await _reward(first, template, user)) == "AAA111"
+            reward_id = await _reward(second, template, user)
+            with pytest.raises(HTTPException) as exc:
+                await issue_code(second, template.id, reward_id)
+            assert exc.value.status_code == 503 and exc.value.headers == {"Retry-After": "1"}
+            await first.commit()
+            assert await issue_code(second, template.id, reward_id) is None
+        finally:
+            await first.close()
+            await second.close()
+
+
+@pytest.mark.asyncio
+class TestRedeemCode:
+    async def _issued(self, factory, template, user, code="AAA111") -> uuid.UUID:
+        async with factory() as db:
+            await load_codes(db, template.id, [code])
+            reward_id = await _reward(db, template, user)
+            await issue_code(db, template.id, reward_id)
+            await db.commit()
+        return reward_id
+
+    async def test_second_redeem_returns_the_first(self, pool):
+        factory, sponsor, template, user = pool
+        reward_id = await self._issued(factory, template, user)
+
+        async with factory() as db:
+            first = await redeem_code(db, sponsor.id, template.id, "AAA111")
+            await db.commit()
+        async with factory() as db:
+            again = await redeem_code(db, sponsor.id, template.id, "AAA111")
+            reward = await db.get(Reward, reward_id)
+
+        assert (first.reward_id, first.already_redeemed) == (reward_id, False)
+        assert (again.reward_id, again.redeemed_at, again.already_redeemed) == (reward_id, first.redeemed_at, True)
+        assert reward.redeemed and reward.redeemed_at == first.redeemed_at
+
+    async def test_concurrent_redeems_redeem_once(self, pool):
+        factory, sponsor, template, user = pool
+        await self._issued(factory, template, user)
+
+        async def redeem():
+            async with factory() as db:
+                redemption = await redeem_code(db, sponsor.id, template.id, "AAA111")
+                await db.commit()
+                return redemption
+
+        results = await asyncio.gather(redeem(), redeem())
+        assert sorted(r.already_redeemed for r in results) == [False, True]
+
+    async def test_rejected(self, pool):
+        factory, sponsor, template, user = pool
+        await self._issued(factory, template, user)
+        async with factory() as db:
+            await load_codes(db, template.id, ["POOLED"])
+            await db.commit()
+
+        async with factory() as db:
+            for code, status_code in [("NOPE", 404), ("POOLED", 409)]:
+                with pytest.raises(HTTPException) as exc:
+                    await redeem_code(db, sponsor.id, template.id, code)
+                assert exc.value.status_code == status_code
+            with pytest.raises(HTTPException) as exc:  # another sponsor's
+                await redeem_code(db, uuid.uuid4(), template.id, "AAA111")
+            assert exc.value.status_code == 404
+            assert (await db.execute(select(CouponCode.redeemed_at).where(CouponCode.code == "AAA111"))).scalar() is None
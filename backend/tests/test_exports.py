@@ -0,0 +1,98 @@
+"""Tests for sponsor claim exports."""
+
+import csv
+import gzip
+import io
+import json
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services.export_service import EXPORT_COLUMNS, visitor_id, visitor_key
+
+CLAIMED_AT = datetime(2026, 10, 1, 12, 30, tzinfo=timezone.utc)
+
+
+class TestVisitorId:
+    def test_stable_within_sponsor(self):
+        sponsor, user = uuid.uuid4(), uuid.uuid4()
+        assert visitor_id(visitor_key(sponsor), user) == visitor_id(visitor_key(sponsor), user)
+
+    def test_differs_across_sponsors(self):
+        user = uuid.uuid4()
+        assert visitor_id(visitor_key(uuid.uuid4()), user) != visitor_id(visitor_key(uuid.uuid4()), user)
+
+    def test_does_not_leak_user_id(self):
+        user = uuid.uuid4()
+        assert user.hex not in visitor_id(visitor_key(uuid.uuid4()), user)
+
+
+@pytest.mark.asyncio
+async def test_export_requires_sponsor(client):
+    response = await client.get("/sponsor/exports/claims")
+    assert response.status_code == 403
+
+
+class FakeExportSession:
+    """Stands in for the export's own session: `stream` yields `partitions` of claim rows."""
+
+    def __init__(self, partitions):
+        self.partitions_ = partitions
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def stream(self, stmt):
+        return self
+
+    async def partitions(self):
+        for partition in self.partitions_:
+            yield partition
+
+
+@pytest.fixture
+def claims(monkeypatch, fake_user):
+    fake_user.role = "sponsor"
+    fake_user.sponsor_id = uuid.uuid4()
+    location_id = uuid.uuid4()
+    rows = [
+        (uuid.uuid4(), CLAIMED_AT, location_id, f"Spot, {i}", "Istanbul", 41.0 + i, 29.0, uuid.uuid4())
+        for i in range(3)
+    ]
+    monkeypatch.setattr("app.services.export_service.async_session_factory",
+                        lambda: FakeExportSession([rows[:2], rows[2:]]))
+    return rows
+
+
+@pytest.mark.asyncio
+class TestExportBody:
+    async def test_ndjson(self, client, claims):
+        response = await client.get("/sponsor/exports/claims")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert [r["claim_id"] for r in records] == [str(c[0]) for c in claims]
+        assert set(records[0]) == set(EXPORT_COLUMNS)
+        assert records[0]["claimed_at"] == CLAIMED_AT.isoformat()
+        assert records[2]["latitude"] == 43.0
+        assert str(claims[0][7]) not in response.text  # only pseudonymous visitor ids
+
+    async def test_csv(self, client, claims):
+        response = await client.get("/sponsor/exports/claims", params={"format": "csv"})
+        rows = list(csv.reader(io.StringIO(response.text)))
+        assert rows[0] == EXPORT_COLUMNS
+        assert len(rows) == 4
+        assert rows[1][:5] == [str(claims[0][0]), CLAIMED_AT.isoformat(), str(claims[0][2]), "Spot, 0", "Istanbul"]
+
+    async def test_gzip_round_trip(self, client, claims):
+        plain = await client.get("/sponsor/exports/claims", params={"format": "csv"})
+        response = await client.get("/sponsor/exports/claims", params={"format": "csv", "gzip": "true"})
+        assert response.headers["content-type"] == "application/gzip"
+        assert 'claims-' in response.headers["content-disposition"] and '.csv.gz"' in response.headers["content-disposition"]
+        body = gzip.decompress(response.content).decode()
+        # visitor ids are keyed per sponsor, so the two downloads match byte for byte
+        assert body == plain.text
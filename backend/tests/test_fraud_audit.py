@@ -0,0 +1,61 @@
+"""Tests for the offline claim audit features."""
+
+import uuid
+
+import numpy as np
+
+from app.services.fraud_audit import audit_block, coordinate_keys
+from app.tasks.fraud import user_ranges
+
+ISTANBUL = (41.0082, 28.9784)
+ANKARA = (39.9334, 32.8597)
+
+
+def block(claims):
+    """`claims` are (user, time, lat, lon, pin_lat, pin_lon) tuples, already sorted."""
+    columns = [np.array(c, dtype=np.int64 if i == 0 else np.float64) for i, c in enumerate(zip(*claims))]
+    return columns
+
+
+def reasons(flags):
+    return {(f.user_index, f.reason) for f in flags}
+
+
+class TestAuditBlock:
+    def test_pin_perfect_claims(self):
+        pin = ISTANBUL
+        honest = [(0, t, pin[0] + 0.0001 * t, pin[1], *pin) for t in range(1, 5)]
+        spoofer = [(1, t, *pin, *pin) for t in range(1, 5)]
+        users, times, lat, lon, pin_lat, pin_lon = block(honest + spoofer)
+        starts, flags = audit_block(users, times, lat, lon, pin_lat, pin_lon, np.array([], dtype=np.int64))
+        assert list(starts) == [0, 4]
+        assert reasons(flags) == {(1, "exact_coordinates")}
+        (flag,) = flags
+        assert flag.score == 1.0 and list(flag.claim_indices) == [4, 5, 6, 7]
+
+    def test_shared_coordinates(self):
+        spot = (41.0100001, 28.9800001)
+        claims = [(0, t, *spot, *ISTANBUL) for t in range(3)] + [(1, 100.0, 41.02, 28.99, *ISTANBUL)] * 3
+        users, times, lat, lon, pin_lat, pin_lon = block(claims)
+        shared = np.unique(coordinate_keys(np.array([spot[0]]), np.array([spot[1]])))
+        _, flags = audit_block(users, times, lat, lon, pin_lat, pin_lon, shared)
+        assert reasons(flags) == {(0, "shared_coordinates")}
+
+    def test_impossible_travel_is_per_user(self):
+        claims = [
+            (0, 0.0, *ISTANBUL, *ISTANBUL),
+            (0, 600.0, *ANKARA, *ANKARA),  # ~350 km in 10 minutes
+            (1, 601.0, *ISTANBUL, *ISTANBUL),  # a different user: not a hop from Ankara
+            (1, 6 * 3600.0, *ANKARA, *ANKARA),  # a plausible drive
+        ]
+        users, times, lat, lon, pin_lat, pin_lon = block(claims)
+        _, flags = audit_block(users, times, lat, lon, pin_lat + 1, pin_lon, np.array([], dtype=np.int64))
+        assert reasons(flags) == {(0, "impossible_travel")}
+        assert list(flags[0].claim_indices) == [1]
+
+
+def test_user_ranges_cover_the_uuid_space():
+    ranges = user_ranges(4)
+    assert ranges[0][0] == uuid.UUID(int=0) and ranges[-1][1] is None
+    assert all(high == ranges[i + 1][0] for i, (_, high) in enumerate(ranges[:-1]))
+    assert ranges[2][0] == uuid.UUID("80000000-0000-0000-0000-000000000000")
@@ -1,7 +1,9 @@
 """Tests for geo utility functions."""
 
+import math
+
 import pytest
-from app.services.geo import haversine_distance
+from app.services.geo import bounding_box, haversine_distance
 
 
 class TestHaversine:
@@ -22,3 +24,21 @@ class TestHaversine:
         """Two points ~100m apart"""
         dist = haversine_distance(41.0370, 28.9850, 41.0379, 28.9850)
         assert 90 < dist < 110
+
+
+class TestBoundingBox:
+    @pytest.mark.parametrize("lat, lon", [(41.0370, 28.9850), (-33.87, 151.21), (69.65, 18.96)])
+    def test_contains_the_circle(self, lat, lon):
+        min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, 5000)
+        for bearing in range(0, 360, 15):
+            b = math.radians(bearing)
+            # step just inside the radius along each bearing
+            d_lat = math.degrees(4999 * math.cos(b) / 6_371_000)
+            d_lon = math.degrees(4999 * math.sin(b) / (6_371_000 * math.cos(math.radians(lat))))
+            assert min_lat <= lat + d_lat <= max_lat
+            assert min_lon <= lon + d_lon <= max_lon
+        assert haversine_distance(lat, lon, max_lat, lon) == pytest.approx(5000, rel=1e-6)
+
+    def test_unbounded_longitude_near_pole_and_antimeridian(self):
+        assert bounding_box(89.99, 0.0, 5000)[2:] == (None, None)
+        assert bounding_box(-16.5, 179.99, 5000)[2:] == (None, None)
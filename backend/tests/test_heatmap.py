@@ -0,0 +1,46 @@
+"""Tests for heatmap tile binning."""
+
+import math
+
+import numpy as np
+
+from app.services.heatmap import CELLS, GRID_SIZE, bin_points, decode_grid, encode_grid
+
+
+def slippy_tile(lat: float, lon: float, zoom: int) -> tuple[int, int]:
+    """Reference scalar implementation of the OSM tile formula."""
+    n = 2 ** zoom
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return x, y
+
+
+class TestBinPoints:
+    def test_matches_osm_tile_formula(self):
+        """Taksim Square at several zooms"""
+        for zoom in (10, 12, 14, 16):
+            tiles = bin_points(np.array([41.0370]), np.array([28.9850]), zoom)
+            assert list(tiles) == [slippy_tile(41.0370, 28.9850, zoom)]
+
+    def test_counts_are_preserved(self):
+        rng = np.random.default_rng(7)
+        lat = rng.normal(41.03, 0.02, 10_000)
+        lon = rng.normal(28.98, 0.02, 10_000)
+        tiles = bin_points(lat, lon, 14)
+        assert sum(int(g.sum()) for g in tiles.values()) == 10_000
+        assert all(g.shape == (CELLS,) for g in tiles.values())
+
+    def test_same_cell_is_counted_together(self):
+        tiles = bin_points(np.array([41.0370, 41.0370, 41.0370]), np.array([28.9850] * 3), 16)
+        (grid,) = tiles.values()
+        assert grid.max() == 3
+        assert np.count_nonzero(grid) == 1
+
+    def test_empty_input(self):
+        assert bin_points(np.array([]), np.array([]), 12) == {}
+
+
+def test_grid_round_trip():
+    grid = np.zeros(GRID_SIZE * GRID_SIZE, dtype=np.uint32)
+    grid[[0, 5, CELLS - 1]] = [1, 42, 7]
+    assert np.array_equal(decode_grid(encode_grid(grid)), grid)
@@ -0,0 +1,142 @@
+"""Tests for the Redis job queue (end-to-end tests need a reachable Redis)."""
+
+import asyncio
+import json
+import time
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+import redis.asyncio as redis
+
+from app.core import settings
+from app.tasks import queue
+from app.tasks.queue import DELAYED_KEY, TASKS, Worker, dead_key, queue_key, retry_delay, task
+
+
+@pytest_asyncio.fixture
+async def live_redis():
+    client = redis.from_url(settings.redis_url, decode_responses=True)
+    try:
+        await client.ping()
+    except (redis.ConnectionError, OSError):
+        await client.aclose()
+        pytest.skip("Redis not reachable")
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+def registry():
+    """Tasks registered inside a test are dropped afterwards."""
+    before = dict(TASKS)
+    yield
+    TASKS.clear()
+    TASKS.update(before)
+
+
+def job(name, attempts=0, queue_name="default"):
+    return json.dumps({"id": uuid.uuid4().hex, "task": name, "queue": queue_name, "args": [1], "kwargs": {},
+                       "attempts": attempts, "ready_at": time.time()})
+
+
+def mock_worker():
+    client = MagicMock()
+    pipe = client.pipeline.return_value
+    pipe.execute = AsyncMock(return_value=[])
+    return Worker(["default"], 1, redis_client=client, worker_id="test"), pipe
+
+
+class TestRegistry:
+    def test_backoff_is_jittered_and_capped(self):
+        assert all(0 <= retry_delay(5.0, 3) <= 20.0 for _ in range(100))
+        assert all(retry_delay(5.0, 50) <= queue.MAX_BACKOFF for _ in range(100))
+
+    @pytest.mark.asyncio
+    async def test_task_stays_directly_callable(self, registry):
+        @task("test.double")
+        async def double(x):
+            """Twice x."""
+            return 2 * x
+
+        assert TASKS["test.double"] is double
+        assert double.__doc__ == "Twice x."
+        assert await double(21) == 42
+
+
+@pytest.mark.asyncio
+class TestProcess:
+    async def test_success_acknowledges(self, registry):
+        calls = []
+
+        @task("test.ok")
+        async def ok(x):
+            calls.append(x)
+
+        worker, pipe = mock_worker()
+        assert await worker.process(job("test.ok")) == "ok"
+        assert calls == [1]
+        pipe.lrem.assert_called_once()
+        pipe.zadd.assert_not_called()
+
+    async def test_job_id_visible_to_the_task(self, registry):
+        seen = []
+
+        @task("test.whoami")
+        async def whoami(x):
+            seen.append(queue.current_job_id.get())
+
+        worker, _ = mock_worker()
+        raw = job("test.whoami")
+        await worker.process(raw)
+        assert seen == [json.loads(raw)["id"]]
+        assert queue.current_job_id.get() is None
+
+    async def test_failure_is_retried_later(self, registry):
+        @task("test.flaky", max_attempts=3)
+        async def flaky(x):
+            raise RuntimeError("boom")
+
+        worker, pipe = mock_worker()
+        assert await worker.process(job("test.flaky")) == "retry"
+        (key, mapping), _ = pipe.zadd.call_args
+        retried = json.loads(next(iter(mapping)))
+        assert key == DELAYED_KEY
+        assert retried["attempts"] == 1 and "boom" in retried["error"]
+
+    async def test_last_attempt_is_dead_lettered(self, registry):
+        @task("test.broken", max_attempts=3, timeout=0.01)
+        async def broken(x):
+            await asyncio.sleep(1)
+
+        worker, pipe = mock_worker()
+        assert await worker.process(job("test.broken", attempts=2)) == "dead"
+        assert pipe.lpush.call_args.args[0] == dead_key("default")
+        assert "TimeoutError" in json.loads(pipe.lpush.call_args.args[1])["error"]
+
+
+@pytest.mark.asyncio
+async def test_worker_round_trip(live_redis, registry):
+    name = f"test.{uuid.uuid4().hex}"
+    q = f"test-{uuid.uuid4().hex}"
+    done = asyncio.Event()
+    seen = []
+
+    @task(name, queue=q, max_attempts=2, backoff=0.01)
+    async def flaky(value):
+        seen.append(value)
+        if len(seen) == 1:
+            raise RuntimeError("first try fails")
+        done.set()
+
+    worker = Worker([q], 2, redis_client=live_redis)
+    runner = asyncio.create_task(worker.run())
+    try:
+        await flaky.enqueue_in(0.05, "hello", redis_client=live_redis)
+        await asyncio.wait_for(done.wait(), 10)
+        assert seen == ["hello", "hello"]
+    finally:
+        worker.stop()
+        await runner
+        await live_redis.delete(queue_key(q), dead_key(q), worker.processing_key)
@@ -0,0 +1,82 @@
+"""Tests for Redis sorted-set leaderboards (ranking tests need a reachable Redis)."""
+
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+import pytest_asyncio
+import redis.asyncio as redis
+
+from app.core import settings
+from app.services.leaderboard import around, board_key, record_points, season_for, top
+
+
+@pytest_asyncio.fixture
+async def live_redis():
+    client = redis.from_url(settings.redis_url, decode_responses=True)
+    try:
+        await client.ping()
+    except (redis.ConnectionError, OSError):
+        await client.aclose()
+        pytest.skip("Redis not reachable")
+    yield client
+    await client.aclose()
+
+
+class TestKeys:
+    def test_quarterly_seasons(self):
+        assert season_for(datetime(2026, 1, 1, tzinfo=timezone.utc)) == "2026-S1"
+        assert season_for(datetime(2026, 3, 31, tzinfo=timezone.utc)) == "2026-S1"
+        assert season_for(datetime(2026, 10, 19, tzinfo=timezone.utc)) == "2026-S4"
+
+    def test_city_names_are_normalised(self):
+        assert board_key("city", "  Istanbul ") == board_key("city", "istanbul") == "lb:city:istanbul"
+
+    def test_unknown_board(self):
+        with pytest.raises(ValueError):
+            board_key("weekly")
+
+    def test_record_points_hits_all_three_boards(self):
+        pipe = MagicMock()
+        user_id = uuid.uuid4()
+        record_points(pipe, user_id, "Istanbul", 25, at=datetime(2026, 10, 19, tzinfo=timezone.utc))
+        keys = [c.args[0] for c in pipe.zincrby.call_args_list]
+        assert keys == ["lb:global", "lb:city:istanbul", "lb:season:2026-S4"]
+        assert all(c.args[1:] == (25, str(user_id)) for c in pipe.zincrby.call_args_list)
+
+
+@pytest.mark.asyncio
+async def test_top_and_around(live_redis):
+    key = board_key("city", f"test-{uuid.uuid4().hex}")
+    users = [uuid.uuid4() for _ in range(20)]
+    try:
+        pipe = live_redis.pipeline()
+        for points, user_id in enumerate(users, start=1):
+            pipe.zincrby(key, points, str(user_id))
+        await pipe.execute()
+
+        page, total = await top(live_redis, key, 0, 3)
+        assert total == 20
+        assert page == [(str(users[19]), 1, 20), (str(users[18]), 2, 19), (str(users[17]), 3, 18)]
+
+        rank, score, neighbours, _ = await around(live_redis, key, users[9], 2)
+        assert (rank, score) == (11, 10)
+        assert [r for _, r, _ in neighbours] == [9, 10, 11, 12, 13]
+
+        rank, score, neighbours, _ = await around(live_redis, key, uuid.uuid4(), 2)
+        assert (rank, score, neighbours) == (None, 0, [])
+    finally:
+        await live_redis.delete(key)
+
+
+@pytest.mark.asyncio
+async def test_city_board_requires_city(client):
+    response = await client.get("/leaderboards", params={"board": "city"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_rejects_malformed_season(client):
+    response = await client.get("/leaderboards", params={"board": "season", "season": "autumn"})
+    assert response.status_code == 400
@@ -0,0 +1,187 @@
+"""Tests for live map tiles, subscriber backpressure and hub fan-out."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.api.live import requested_channels
+from app.services.geo import tile_for
+from app.services.live_map import (
+    RESYNC,
+    LiveMapHub,
+    Subscriber,
+    channel_for,
+    channels_around,
+    location_event,
+    publish_location_events,
+)
+
+
+class TestTiles:
+    def test_tile_for_origin(self):
+        assert tile_for(0.0, 0.0, 1) == (1, 1)
+        assert tile_for(0.0, 0.0, 0) == (0, 0)
+
+    def test_tile_for_istanbul(self):
+        # Taksim at zoom 14, same tile the heatmap grid uses
+        assert tile_for(41.0370, 28.9850, 14) == (9511, 6140)
+
+    def test_tile_for_clamps_poles_and_antimeridian(self):
+        assert tile_for(90.0, 180.0, 4) == (15, 0)
+        assert tile_for(-90.0, -180.0, 4) == (0, 15)
+
+    def test_channels_around_is_3x3(self):
+        channels = channels_around(41.0370, 28.9850)
+        assert len(channels) == 9
+        assert channel_for(41.0370, 28.9850) in channels
+
+
+class TestRequestedChannels:
+    def test_position(self):
+        assert requested_channels({"latitude": 41.0370, "longitude": 28.9850}) == channels_around(41.0370, 28.9850)
+
+    def test_explicit_tiles(self):
+        assert requested_channels({"tiles": [[9511, 6140]]}) == {"map:14:9511:6140"}
+
+    def test_rejects_too_many_tiles(self):
+        with pytest.raises(ValueError):
+            requested_channels({"tiles": [[0, 0]] * 26})
+
+    def test_rejects_tile_outside_zoom(self):
+        with pytest.raises(ValueError):
+            requested_channels({"tiles": [[1 << 14, 0]]})
+
+
+class TestSubscriber:
+    def test_overflow_replaces_backlog_with_resync(self):
+        subscriber = Subscriber(maxsize=3)
+        for i in range(3):
+            subscriber.offer(str(i))
+        subscriber.offer("3")
+        assert subscriber.queue.qsize() == 1
+        assert subscriber.queue.get_nowait() == RESYNC
+
+
+class TestPublish:
+    @pytest.mark.asyncio
+    async def test_events_go_to_their_tile_channel(self):
+        pipe = MagicMock()
+        pipe.execute = AsyncMock()
+        redis_client = MagicMock()
+        redis_client.pipeline.return_value = pipe
+        location = SimpleNamespace(
+            id="loc-1", latitude=41.0370, longitude=28.9850, name="Taksim", radius_m=100,
+            city="Istanbul", sponsor_id=None, is_active=True,
+        )
+
+        count = await publish_location_events(redis_client, [location_event("location.upserted", location)])
+
+        assert count == 1
+        channel, payload = pipe.publish.call_args.args
+        assert channel == "map:14:9511:6140"
+        assert json.loads(payload)["type"] == "location.upserted"
+        pipe.execute.assert_awaited_once()
+
+
+class TestHub:
+    @pytest.mark.asyncio
+    async def test_redis_subscriptions_are_refcounted(self):
+        async def get_message(**kwargs):
+            await asyncio.sleep(0.01)
+            return None
+
+        pubsub = MagicMock(subscribe=AsyncMock(), unsubscribe=AsyncMock(), aclose=AsyncMock())
+        pubsub.get_message = get_message
+        hub = LiveMapHub(MagicMock(pubsub=MagicMock(return_value=pubsub)))
+        a, b = Subscriber(10), Subscriber(10)
+
+        await hub.set_channels(a, {"map:14:1:1"})
+        await hub.set_channels(b, {"map:14:1:1", "map:14:1:2"})
+        assert pubsub.subscribe.await_count == 2  # 1:1 once, then only the new 1:2
+
+        hub.dispatch("map:14:1:1", "event")
+        assert a.queue.get_nowait() == b.queue.get_nowait() == "event"
+
+        await hub.detach(a)
+        pubsub.unsubscribe.assert_not_awaited()  # b still watches 1:1
+        await hub.detach(b)
+        assert set(pubsub.unsubscribe.await_args.args) == {"map:14:1:1", "map:14:1:2"}
+
+        await hub.close()
+
+
+class TestLiveSocket:
+    def test_rejects_unauthenticated(self):
+        from starlette.testclient import TestClient
+        from starlette.websockets import WebSocketDisconnect
+
+        from app.main import app
+
+        with pytest.raises(WebSocketDisconnect) as exc:
+            with TestClient(app).websocket_connect("/map/live") as ws:
+                ws.receive_text()
+        assert exc.value.code == 1008
+
+    def test_subscribe_and_receive(self, monkeypatch, fake_user):
+        from starlette.testclient import TestClient
+
+        from app.api import live
+        from app.main import app
+
+        async def authenticate(websocket):
+            return fake_user
+
+        event = {"type": "location.upserted"}
+
+        async def set_channels(subscriber, channels):
+            subscriber.offer(json.dumps(event))  # as if an event arrived on the new tiles
+
+        hub = MagicMock(set_channels=AsyncMock(side_effect=set_channels), detach=AsyncMock())
+        monkeypatch.setattr(live, "authenticate_websocket", authenticate)
+        monkeypatch.setattr(live, "get_hub", lambda: hub)
+
+        with TestClient(app).websocket_connect("/map/live") as ws:
+            ws.send_json({"latitude": 41.0370, "longitude": 28.9850})
+            received = [ws.receive_json(), ws.receive_json()]
+            assert {"type": "subscribed", "tiles": 9} in received
+            assert event in received
+            assert len(hub.set_channels.await_args.args[1]) == 9
+
+            ws.send_json({"tiles": "nope"})
+            assert ws.receive_json()["type"] == "error"
+        hub.detach.assert_awaited_once()
+
+    def test_proximity_stream(self, monkeypatch, fake_user):
+        from starlette.testclient import TestClient
+
+        from app.api import live
+        from app.main import app
+        from app.services.proximity import IndexedLocation, LocationIndex
+
+        async def authenticate(websocket):
+            return fake_user
+
+        async def load_claimed(db, user_id):
+            return set()
+
+        proximity = MagicMock(ensure_loaded=AsyncMock(),
+                              index=LocationIndex([IndexedLocation("target", 41.0400, 28.9850, 50)]))
+        monkeypatch.setattr(live, "authenticate_websocket", authenticate)
+        monkeypatch.setattr(live, "get_proximity_index", lambda: proximity)
+        monkeypatch.setattr(live, "load_claimed", load_claimed)
+        monkeypatch.setattr(live, "async_session_factory", MagicMock())
+        monkeypatch.setattr(live, "get_hub", lambda: MagicMock(set_channels=AsyncMock(), detach=AsyncMock()))
+        redis_client = MagicMock()
+        redis_client.pipeline.return_value.execute = AsyncMock()
+        monkeypatch.setattr(live, "redis_client", redis_client)
+
+        with TestClient(app).websocket_connect("/map/proximity") as ws:
+            ws.send_json({"latitude": 41.0300, "longitude": 28.9850})
+            update = ws.receive_json()
+            assert update["location_id"] == "target"
+            assert update["signal"] == "new"
+            assert update["distance_m"] == pytest.approx(1112, abs=5)
+        redis_client.pipeline.return_value.geoadd.assert_called_once()  # last-known position for pushes
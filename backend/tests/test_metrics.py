@@ -0,0 +1,57 @@
+"""Tests for the metrics registry and /metrics endpoint."""
+
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+from app.core import settings
+from app.core.metrics import Histogram, REGISTRY
+
+TOKEN = "scrape-token"
+
+
+@pytest_asyncio.fixture
+async def scraper(monkeypatch):
+    """A client on an app built with a metrics token (the default app has no /metrics route)."""
+    from app.main import create_app
+
+    monkeypatch.setattr(settings, "metrics_token", TOKEN)
+    transport = ASGITransport(app=create_app())
+    async with AsyncClient(transport=transport, base_url="http://test",
+                           headers={"Authorization": f"Bearer {TOKEN}"}) as ac:
+        yield ac
+
+
+class TestHistogram:
+    def test_buckets_are_cumulative(self):
+        hist = Histogram("test_latency_seconds", "Test.", ("route",), buckets=(0.1, 1.0))
+        REGISTRY.remove(hist)
+        for value in (0.05, 0.1, 0.5, 3.0):
+            hist.observe(value, ("/x",))
+        lines = hist.samples()
+        assert 'test_latency_seconds_bucket{route="/x",le="0.1"} 2' in lines
+        assert 'test_latency_seconds_bucket{route="/x",le="1"} 3' in lines
+        assert 'test_latency_seconds_bucket{route="/x",le="+Inf"} 4' in lines
+        assert 'test_latency_seconds_count{route="/x"} 4' in lines
+
+
+class TestMetricsEndpoint:
+    async def test_not_served_without_a_token(self, client):
+        assert (await client.get("/metrics")).status_code == 404
+
+    async def test_scrape_needs_the_token(self, scraper):
+        assert (await scraper.get("/metrics", headers={"Authorization": "Bearer wrong"})).status_code == 401
+        assert (await scraper.get("/metrics", headers={"Authorization": ""})).status_code == 401
+
+    async def test_records_route_template(self, scraper):
+        await scraper.get("/health")
+        response = await scraper.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'http_requests_total{method="GET",route="/health",status="200"}' in response.text
+        assert "db_pool_saturation" in response.text
+
+    async def test_unknown_paths_share_one_series(self, scraper):
+        await scraper.get("/no-such-path-123")
+        response = await scraper.get("/metrics")
+        assert "no-such-path-123" not in response.text
+        assert 'route="<unmatched>",status="404"' in response.text
@@ -0,0 +1,180 @@
+"""Tests for the push notification fan-out pipeline."""
+
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core import settings
+from app.services import notifications as positions
+from app.services.notifications import PushMessage, SendReport, StubTransport, map_position_due, record_position
+from app.tasks import notifications
+from app.tasks.notifications import FanoutReport, backoff, fan_out, send_batch
+
+
+class MemoryRedis:
+    def __init__(self, members, seen):
+        self.members, self.seen = members, seen
+        self.deleted = []
+        self.values, self.stored = {}, set()
+
+    async def geosearchstore(self, key, *args, **kwargs):
+        self.stored.add(key)
+        return len(self.members)
+
+    async def exists(self, key):
+        return key in self.stored
+
+    async def zcard(self, key):
+        return len(self.members)
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = str(value)
+
+    async def zrange(self, key, start, stop):
+        return self.members[start:stop + 1]
+
+    async def zmscore(self, key, members):
+        return [self.seen.get(m) for m in members]
+
+    async def expire(self, *args):
+        return True
+
+    async def delete(self, *keys):
+        self.deleted.extend(keys)
+        self.stored.difference_update(keys)
+
+
+class FlakyTransport:
+    """Throttles everything on the first call, then delivers."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def send(self, messages):
+        self.calls += 1
+        if self.calls == 1:
+            return SendReport(retry=list(messages), retry_after=0.0)
+        return SendReport(sent=len(messages))
+
+
+class TestBackoff:
+    def test_capped_and_respects_retry_after(self):
+        assert 0 <= backoff(1) <= settings.push_backoff_seconds
+        assert backoff(30) <= notifications.MAX_BACKOFF
+        assert backoff(1, retry_after=7.5) >= 7.5
+
+
+class TestPositions:
+    def test_clamps_latitude_for_geoadd(self):
+        pipe = MagicMock()
+        record_position(pipe, "user-1", 89.9, 10.0, at=1.0)
+        pipe.geoadd.assert_called_once_with("geo:users", (10.0, 85.05, "user-1"))
+        pipe.zadd.assert_called_once_with("geo:users:seen", {"user-1": 1.0})
+
+    def test_map_fetches_write_once_per_interval(self, monkeypatch):
+        monkeypatch.setattr(positions, "_map_positions", {})
+        monkeypatch.setattr(positions, "MAX_THROTTLED_USERS", 2)
+        interval = settings.push_position_interval_seconds
+        assert map_position_due("a", now=0.0)
+        assert not map_position_due("a", now=interval / 2)
+        assert map_position_due("a", now=interval)
+        assert map_position_due("b", now=interval) and map_position_due("c", now=interval)
+        assert list(positions._map_positions) == ["b", "c"]  # the longest-unseen user is forgotten first
+
+
+@pytest.mark.asyncio
+async def test_send_batch_retries_throttled(monkeypatch):
+    monkeypatch.setattr(settings, "push_backoff_seconds", 0.001)
+    transport, report = FlakyTransport(), FanoutReport()
+    await send_batch(transport, [PushMessage(f"t{i}", "t", "b") for i in range(3)], report, [])
+    assert (transport.calls, report.sent, report.failed) == (2, 3, 0)
+
+
+@pytest.mark.asyncio
+async def test_send_batch_gives_up(monkeypatch):
+    monkeypatch.setattr(settings, "push_backoff_seconds", 0.001)
+    monkeypatch.setattr(settings, "push_max_attempts", 3)
+    report = FanoutReport()
+    await send_batch(StubTransport(throttle_rate=1.0), [PushMessage("t", "t", "b")], report, [])
+    assert (report.sent, report.failed) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_fan_out_batches_fresh_recipients(monkeypatch):
+    now = time.time()
+    members = [f"u{i}" for i in range(1300)]
+    seen = {m: now for m in members}
+    seen["u0"] = now - 86400 * (settings.push_position_max_age_days + 1)  # stale position
+    redis_client = MemoryRedis(members, seen)
+    cleared = []
+
+    async def tokens(user_ids):
+        return [f"token-{u}" for u in user_ids]
+
+    async def clear_tokens(tokens):
+        cleared.extend(tokens)
+
+    monkeypatch.setattr(notifications, "_tokens", tokens)
+    monkeypatch.setattr(notifications, "clear_tokens", clear_tokens)
+    transport = StubTransport(invalid_tokens=frozenset({"token-u5"}))
+
+    report = await fan_out(41.0, 29.0, 3000, "title", "body", transport=transport, redis_client=redis_client)
+
+    assert report.recipients == 1299
+    assert sorted(len(b) for b in transport.batches) == [299, 500, 500]
+    assert (report.sent, report.invalid) == (1298, 1)
+    assert cleared == ["token-u5"]
+    assert redis_client.deleted  # scratch recipient set removed
+
+
+class HangingTransport(StubTransport):
+    """Delivers `batches` batches, then hangs until the run is cancelled (as when its worker dies)."""
+
+    def __init__(self, batches):
+        super().__init__()
+        self.left = batches
+        self.hung = asyncio.Event()
+
+    async def send(self, messages):
+        if self.left == 0:
+            self.hung.set()
+            await asyncio.Event().wait()
+        self.left -= 1
+        return await super().send(messages)
+
+
+@pytest.mark.asyncio
+async def test_rerun_resumes_after_the_last_sent_chunk(monkeypatch):
+    monkeypatch.setattr(notifications, "RECIPIENT_CHUNK", 100)
+    monkeypatch.setattr(settings, "push_batch_size", 50)
+    monkeypatch.setattr(settings, "push_concurrency", 1)
+    members = [f"u{i}" for i in range(450)]
+    redis_client = MemoryRedis(members, {m: time.time() for m in members})
+
+    async def tokens(user_ids):
+        return [f"token-{u}" for u in user_ids]
+
+    monkeypatch.setattr(notifications, "_tokens", tokens)
+
+    hanging = HangingTransport(batches=5)  # two chunks and half of the third
+    run = asyncio.create_task(
+        fan_out(41.0, 29.0, 3000, "t", "b", transport=hanging, redis_client=redis_client, run_id="job-1")
+    )
+    await hanging.hung.wait()
+    run.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await run
+    assert redis_client.values["push:progress:job-1"] == "200"
+    assert "push:recipients:job-1" in redis_client.stored  # kept for the rerun
+
+    rerun = StubTransport()
+    report = await fan_out(41.0, 29.0, 3000, "t", "b", transport=rerun, redis_client=redis_client, run_id="job-1")
+    resent = [m.token for batch in rerun.batches for m in batch]
+    assert resent == [f"token-u{i}" for i in range(200, 450)]  # only the half-sent chunk is repeated
+    assert report.sent == 250
+    assert {"push:recipients:job-1", "push:progress:job-1"} <= set(redis_client.deleted)
@@ -0,0 +1,155 @@
+"""Tests for weighted prize tables (the stock UPDATE runs against Postgres; here the session is faked)."""
+
+import random
+import uuid
+from collections import Counter
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.reward_prize import RewardPrize
+from app.models.reward_template import RewardTemplate
+from app.services import prizes
+from app.services.prizes import AliasTable, draw_prize, prize_table, replace_prizes
+
+DRAWS = 1_000_000
+
+
+def chi_square(weights, counts, draws):
+    total = sum(weights)
+    return sum((counts[i] - draws * w / total) ** 2 / (draws * w / total) for i, w in enumerate(weights))
+
+
+class TestAliasTable:
+    def test_million_draws_match_weights(self):
+        weights = [1, 10, 89]  # product, coupon, points
+        table, rng = AliasTable(weights), random.Random(50)
+        counts = Counter(table.sample(rng) for _ in range(DRAWS))
+        assert chi_square(weights, counts, DRAWS) < 13.82  # chi-square, 2 dof, p = 0.001
+
+    def test_many_uneven_prizes(self):
+        rng = random.Random(7)
+        weights = [rng.choice([0.01, 0.5, 1, 3, 40]) for _ in range(50)]
+        table = AliasTable(weights)
+        counts = Counter(table.sample(rng) for _ in range(DRAWS))
+        assert chi_square(weights, counts, DRAWS) < 85.35  # 49 dof, p = 0.001
+
+    def test_zero_weight_never_drawn(self):
+        table, rng = AliasTable([0, 1, 0, 3]), random.Random(1)
+        assert {table.sample(rng) for _ in range(10_000)} == {1, 3}
+
+    def test_single_prize(self):
+        assert AliasTable([2.5]).sample() == 0
+
+    @pytest.mark.parametrize("weights", [[], [0, 0], [1, -1]])
+    def test_invalid_weights(self, weights):
+        with pytest.raises(ValueError):
+            AliasTable(weights)
+
+
+def _template(version=1):
+    return RewardTemplate(id=uuid.uuid4(), location_id=uuid.uuid4(), reward_type="points", reward_value=10,
+                          has_prizes=True, prize_version=version)
+
+
+def _prize(template, reward_type, weight, stock=None, awarded=0):
+    return RewardPrize(id=uuid.uuid4(), reward_template_id=template.id, reward_type=reward_type, reward_value=1,
+                       weight=weight, stock=stock, awarded=awarded)
+
+
+def _session(rows, stock_updates=()):
+    """A session whose first execute loads `rows` and later ones answer the stock UPDATEs in turn."""
+    loaded = MagicMock()
+    loaded.scalars.return_value = rows
+    updates = []
+    for taken in stock_updates:
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = uuid.uuid4() if taken else None
+        updates.append(result)
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=[loaded, *updates])
+    return db
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(prizes, "_tables", {})
+
+
+@pytest.mark.asyncio
+class TestDrawPrize:
+    async def test_table_cached_until_version_changes(self):
+        template = _template()
+        rows = [_prize(template, "points", 9), _prize(template, "product", 1, stock=5, awarded=5)]
+        db = _session(rows)
+        table = await prize_table(db, template)
+        assert [p.reward_type for p in table.prizes] == ["points"]  # out of stock on load
+        assert await prize_table(db, template) is table
+        assert db.execute.await_count == 1
+
+        template.prize_version = 2  # edited: rebuilt from a fresh load
+        db = _session(rows)
+        assert (await prize_table(db, template)).version == 2
+        assert db.execute.await_count == 1
+
+    async def test_unlimited_prize_takes_no_write(self):
+        template = _template()
+        db = _session([_prize(template, "points", 1)])
+        prize = await draw_prize(db, template)
+        assert prize.reward_type == "points"
+        assert db.execute.await_count == 1
+
+    async def test_exhausted_prize_dropped_and_redrawn(self):
+        template = _template()
+        db = _session([_prize(template, "product", 1, stock=3), _prize(template, "coupon", 1, stock=3)],
+                      stock_updates=[False, True])
+        first = await draw_prize(db, template, random.Random(0))
+        table = await prize_table(db, template)
+        assert len(table.prizes) == 1 and table.prizes[0] == first
+
+    async def test_everything_gone(self):
+        template = _template()
+        db = _session([_prize(template, "product", 1, stock=1)], stock_updates=[False])
+        assert await draw_prize(db, template) is None
+
+
+def _editing_session(template_row: dict, prize_rows: list):
+    """A session that applies replace_prizes' version bump, prize load and delete to in-memory rows."""
+    async def execute(stmt):
+        result = MagicMock()
+        if stmt.is_update:
+            template_row["prize_version"] += 1
+            result.scalar_one.return_value = template_row["prize_version"]
+        elif stmt.is_select:
+            result.scalars.return_value = list(prize_rows)
+        else:
+            prize_rows.clear()
+        return result
+
+    db = MagicMock()
+    db.execute = execute
+    db.add = prize_rows.append
+    db.flush = AsyncMock()
+    return db
+
+
+@pytest.mark.asyncio
+async def test_emptied_then_refilled_table_is_reloaded():
+    template = _template(version=1)
+    row, rows = {"prize_version": 1}, [_prize(template, "product", 1)]
+    db = _editing_session(row, rows)
+    assert [p.reward_type for p in (await prize_table(_session(rows), template)).prizes] == ["product"]
+
+    await replace_prizes(db, template, [])
+    assert not template.has_prizes and template.prize_version == 2
+
+    await replace_prizes(db, template, [{"reward_type": "points", "reward_value": 5, "weight": 1.0}])
+    assert template.has_prizes and template.prize_version == 3  # never back to an old, cached version
+    table = await prize_table(_session(rows), template)
+    assert table.version == 3 and [p.reward_type for p in table.prizes] == ["points"]
+
+
+@pytest.mark.asyncio
+async def test_players_cannot_edit_prizes(client):
+    response = await client.put(f"/sponsor/prizes/{uuid.uuid4()}", json={"prizes": []})
+    assert response.status_code == 403
@@ -0,0 +1,46 @@
+"""Tests for the request profiling middleware."""
+
+import json
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core import settings
+from app.core.profiling import ProfilingMiddleware, sign_profile_token, verify_profile_token
+
+
+class TestProfileToken:
+    def test_round_trip(self):
+        assert verify_profile_token(sign_profile_token())
+
+    def test_tampered_or_expired_rejected(self):
+        expires, signature = sign_profile_token().split(".")
+        assert not verify_profile_token(f"{int(expires) + 60}.{signature}")
+        assert not verify_profile_token(sign_profile_token(ttl_seconds=-1))
+        assert not verify_profile_token("garbage")
+
+
+class TestProfilingMiddleware:
+    async def test_only_signed_requests_are_profiled(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "profile_dir", str(tmp_path))
+        monkeypatch.setattr(settings, "profile_sample_rate", 0.0)
+        app = FastAPI()
+
+        @app.get("/items/{item_id}")
+        async def read_item(item_id: int):
+            return {"id": item_id}
+
+        app.add_middleware(ProfilingMiddleware)
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            plain = await client.get("/items/1")
+            profiled = await client.get(
+                "/items/2", headers={"X-Profile": sign_profile_token(), "X-Request-ID": "../../etc"}
+            )
+
+        assert "x-profile-id" not in plain.headers
+        request_id = profiled.headers["x-profile-id"]
+        assert request_id != "../../etc"
+        meta = json.loads((tmp_path / f"{request_id}.json").read_text())
+        assert meta["route"] == "/items/{item_id}" and meta["status"] == 200
+        assert (tmp_path / f"{request_id}.prof").exists()
+        assert len(list(tmp_path.iterdir())) == 2
@@ -0,0 +1,80 @@
+"""Tests for the in-memory proximity index and hot/cold signals."""
+
+import random
+
+import pytest
+
+from app.core import settings
+from app.services.geo import haversine_distance, initial_bearing
+from app.services.proximity import IndexedLocation, LocationIndex, Walker
+
+
+def make_index(n: int, seed: int = 7) -> tuple[LocationIndex, list[IndexedLocation]]:
+    rng = random.Random(seed)
+    locations = [
+        IndexedLocation(f"loc-{i}", 41.0370 + rng.uniform(-0.2, 0.2), 28.9850 + rng.uniform(-0.2, 0.2), 100)
+        for i in range(n)
+    ]
+    return LocationIndex(locations), locations
+
+
+class TestBearing:
+    def test_cardinal_directions(self):
+        assert initial_bearing(41.0, 29.0, 41.1, 29.0) == pytest.approx(0.0, abs=0.01)
+        assert initial_bearing(0.0, 29.0, 0.0, 29.1) == pytest.approx(90.0, abs=0.01)
+        assert initial_bearing(41.1, 29.0, 41.0, 29.0) == pytest.approx(180.0, abs=0.01)
+        assert initial_bearing(0.0, 29.1, 0.0, 29.0) == pytest.approx(270.0, abs=0.01)
+
+
+class TestLocationIndex:
+    def test_matches_brute_force(self):
+        index, locations = make_index(2000)
+        rng = random.Random(1)
+        for _ in range(200):
+            lat, lon = 41.0370 + rng.uniform(-0.25, 0.25), 28.9850 + rng.uniform(-0.25, 0.25)
+            expected = min(locations, key=lambda loc: haversine_distance(lat, lon, loc.latitude, loc.longitude))
+            found = index.nearest(lat, lon, max_distance_m=100_000)
+            assert found.location == expected
+
+    def test_excludes_claimed(self):
+        index, locations = make_index(50)
+        first = index.nearest(41.0370, 28.9850)
+        second = index.nearest(41.0370, 28.9850, exclude={first.location.id})
+        assert second.location != first.location
+        assert second.distance_m >= first.distance_m
+
+    def test_respects_max_distance(self):
+        index = LocationIndex([IndexedLocation("far", 41.5, 29.5, 100)])
+        assert index.nearest(41.0370, 28.9850, max_distance_m=5_000) is None
+        assert index.nearest(41.0370, 28.9850, max_distance_m=100_000).location.id == "far"
+
+    def test_empty(self):
+        assert LocationIndex().nearest(41.0, 29.0) is None
+
+
+class TestWalker:
+    def setup_method(self):
+        self.index = LocationIndex([IndexedLocation("target", 41.0400, 28.9850, 50)])
+
+    def test_signals(self):
+        walker = Walker(set())
+        assert walker.update(self.index, 41.0300, 28.9850)["signal"] == "new"
+        assert walker.update(self.index, 41.0350, 28.9850)["signal"] == "hotter"
+        assert walker.update(self.index, 41.03501, 28.9850)["signal"] == "steady"  # ~1 m: GPS jitter
+        assert walker.update(self.index, 41.0300, 28.9850)["signal"] == "colder"
+
+    def test_in_range_and_bearing(self):
+        update = Walker(set()).update(self.index, 41.0398, 28.9850)
+        assert update["in_range"] is True
+        assert update["bearing_deg"] == pytest.approx(0.0, abs=0.1)
+
+    def test_claimed_target_disappears(self):
+        walker = Walker({"target"})
+        assert walker.update(self.index, 41.0300, 28.9850) == {"type": "proximity", "location_id": None}
+
+    def test_throttle(self):
+        walker = Walker(set())
+        interval = settings.proximity_min_interval_ms / 1000
+        assert walker.throttled(1000.0) is False
+        assert walker.throttled(1000.0 + interval / 2) is True
+        assert walker.throttled(1000.0 + interval * 1.5) is False
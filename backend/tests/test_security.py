@@ -0,0 +1,54 @@
+"""Tests for Firebase token verification."""
+
+import logging
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import security, settings
+from app.core.security import start_firebase_init, verify_firebase_token
+
+
+@pytest.fixture(autouse=True)
+def fresh_init(monkeypatch):
+    monkeypatch.setattr(security, "_init_task", None)
+    monkeypatch.setattr(security, "init_firebase", lambda: None)  # no credential discovery
+
+
+@pytest.mark.asyncio
+class TestStubTokens:
+    async def test_accepted_in_debug_with_flag(self, monkeypatch):
+        monkeypatch.setattr(settings, "debug", True)
+        monkeypatch.setattr(settings, "stub_auth_tokens", True)
+        assert (await verify_firebase_token("stub:alice"))["uid"] == "alice"
+
+    @pytest.mark.parametrize("debug, enabled", [(False, True), (True, False)])
+    async def test_rejected_otherwise(self, monkeypatch, debug, enabled):
+        monkeypatch.setattr(settings, "debug", debug)
+        monkeypatch.setattr(settings, "stub_auth_tokens", enabled)
+        with pytest.raises(HTTPException) as exc:
+            await verify_firebase_token("stub:alice")
+        assert exc.value.status_code == 401
+
+
+@pytest.mark.asyncio
+class TestInit:
+    async def test_requests_share_the_startup_task(self):
+        assert start_firebase_init() is start_firebase_init()
+
+    async def test_failure_logged_and_retried(self, monkeypatch, caplog):
+        def broken():
+            raise RuntimeError("no credentials")
+
+        monkeypatch.setattr(security, "init_firebase", broken)
+        failed = start_firebase_init()
+        with caplog.at_level(logging.ERROR, logger="app.core.security"):
+            with pytest.raises(HTTPException) as exc:
+                await verify_firebase_token("token")
+        assert exc.value.status_code == 503
+        assert "Firebase initialisation failed" in caplog.text
+
+        monkeypatch.setattr(security, "init_firebase", lambda: None)
+        retried = start_firebase_init()
+        assert retried is not failed
+        await retried
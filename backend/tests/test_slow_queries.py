@@ -0,0 +1,51 @@
+"""Tests for slow-query grouping."""
+
+import pytest
+
+from app.core.slow_queries import SLOW_QUERIES, is_read_only, normalize_sql, record, reset, top_offenders
+
+
+class TestNormalizeSql:
+    def test_placeholders_literals_and_in_lists_collapse(self):
+        a = normalize_sql("SELECT * FROM locations\n WHERE id IN ($1::UUID, $2::UUID) AND city = 'Ankara' LIMIT 10")
+        b = normalize_sql("SELECT * FROM locations WHERE id IN ($1::UUID, $2::UUID, $3::UUID) AND city = 'Izmir' LIMIT 5")
+        assert a == b == "SELECT * FROM locations WHERE id IN (...) AND city = ? LIMIT ?"
+
+    def test_identifiers_keep_digits(self):
+        assert normalize_sql("SELECT anon_1.id FROM t AS anon_1") == "SELECT anon_1.id FROM t AS anon_1"
+
+
+class TestReadOnly:
+    @pytest.mark.parametrize("sql", [
+        "SELECT id FROM locations WHERE city = $1",
+        "WITH near AS (SELECT id FROM locations) SELECT count(*) FROM near",
+        "SELECT updated_at, deleted FROM t WHERE note = 'FOR UPDATE' AND kind = 'insert'",
+    ])
+    def test_replayable(self, sql):
+        assert is_read_only(sql)
+
+    @pytest.mark.parametrize("sql", [
+        "UPDATE rewards SET redeemed = true",
+        "WITH redeemed AS (UPDATE coupon_codes SET redeemed_at = now() RETURNING reward_id) SELECT * FROM redeemed",
+        "WITH gone AS (DELETE FROM jobs RETURNING id) SELECT count(*) FROM gone",
+        "SELECT id FROM coupon_codes WHERE reward_id IS NULL LIMIT 1 FOR UPDATE SKIP LOCKED",
+        "SELECT id FROM rollup_watermarks FOR NO KEY UPDATE",
+        "SELECT id FROM locations FOR KEY SHARE",
+        "select id from locations for share",
+    ])
+    def test_writes_and_locks_never_replayed(self, sql):
+        assert not is_read_only(sql)
+
+
+class TestRecord:
+    def test_groups_and_ranks_by_total_time(self):
+        reset()
+        record("SELECT 1 FROM a WHERE x = $1", 300.0, "/map/locations")
+        record("SELECT 1 FROM a WHERE x = $2", 250.0, "/map/locations")
+        record("SELECT 1 FROM b", 400.0, None)
+        assert len(SLOW_QUERIES) == 2
+        top = top_offenders()
+        assert top[0].count == 2 and top[0].total_ms == 550.0
+        assert top[0].routes == {"/map/locations": 2}
+        assert top_offenders(order_by="max_ms")[0].routes == {"-": 1}
+        reset()
@@ -0,0 +1,158 @@
+"""Tests for sponsor analytics: rollup folding (needs a reachable Postgres) and access control."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, select
+
+from app.core import settings
+from app.models import ClaimLog, ClaimRollup, Location, Reward, RollupWatermark, Sponsor, User
+from app.services.analytics_service import get_sponsor_analytics, refresh_claim_rollups
+
+NOW = datetime(2026, 10, 19, 12, tzinfo=timezone.utc)
+WATERMARK = "claim_rollups"
+
+
+@pytest_asyncio.fixture
+async def claims(live_db):
+    """A sponsor location to add claims to; restores the rollup watermark afterwards."""
+    sponsor = Sponsor(id=uuid.uuid4(), name="Analytics Sponsor", contact_email="analytics@example.com")
+    location = Location(id=uuid.uuid4(), sponsor_id=sponsor.id, name="Kiosk", latitude=41.0, longitude=29.0,
+                        city="Test")
+    user = User(id=uuid.uuid4(), firebase_uid=f"test-{uuid.uuid4()}", email=f"{uuid.uuid4()}@example.com")
+    async with live_db() as db:
+        saved = await db.get(RollupWatermark, WATERMARK)
+        saved = saved.watermark if saved else None
+        db.add_all([sponsor, user])
+        await db.flush()
+        db.add(location)
+        await db.commit()
+
+    async def add(claimed_at, redeemed_at=None):
+        async with live_db() as db:
+            db.add(ClaimLog(user_id=user.id, location_id=location.id, latitude=41.0, longitude=29.0,
+                            claimed_at=claimed_at))
+            db.add(Reward(user_id=user.id, type="coupon", location_id=location.id, created_at=claimed_at,
+                          redeemed=redeemed_at is not None, redeemed_at=redeemed_at))
+            await db.commit()
+
+    async def set_watermark(at):
+        async with live_db() as db:
+            await db.execute(delete(RollupWatermark).where(RollupWatermark.name == WATERMARK))
+            if at is not None:
+                db.add(RollupWatermark(name=WATERMARK, watermark=at))
+            await db.commit()
+
+    yield live_db, sponsor, location, add, set_watermark
+
+    async with live_db() as db:
+        for model in (ClaimRollup, ClaimLog, Reward):
+            await db.execute(delete(model).where(model.location_id == location.id))
+        await db.execute(delete(Location).where(Location.id == location.id))
+        await db.execute(delete(Sponsor).where(Sponsor.id == sponsor.id))
+        await db.execute(delete(User).where(User.id == user.id))
+        await db.commit()
+    await set_watermark(saved)
+
+
+async def _refresh(factory) -> int:
+    async with factory() as db:
+        folded = await refresh_claim_rollups(db)
+        await db.commit()
+    return folded
+
+
+async def _rollups(factory, location) -> dict:
+    async with factory() as db:
+        result = await db.execute(select(ClaimRollup).where(ClaimRollup.location_id == location.id))
+        return {(r.granularity, r.bucket_start): (r.claims, r.redemptions) for r in result.scalars()}
+
+
+@pytest.mark.asyncio
+class TestRefreshRollups:
+    async def test_second_run_increments_the_buckets_of_the_first(self, claims, monkeypatch):
+        factory, sponsor, location, add, set_watermark = claims
+        hour = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) - timedelta(hours=3)
+        day = hour.replace(hour=0)
+        later = hour + timedelta(hours=1)
+        await set_watermark(hour)
+
+        await add(hour + timedelta(minutes=5), redeemed_at=hour + timedelta(minutes=20))
+        await add(hour + timedelta(minutes=10), redeemed_at=hour + timedelta(minutes=50))
+        await add(hour + timedelta(minutes=40))
+        await add(later + timedelta(minutes=5))
+
+        # first run sees only the first half hour
+        monkeypatch.setattr(settings, "analytics_rollup_lag_seconds",
+                            (datetime.now(timezone.utc) - (hour + timedelta(minutes=30))).total_seconds())
+        assert await _refresh(factory) == 2
+        first = await _rollups(factory, location)
+        assert first[("hour", hour)] == (2, 1)
+        assert first[("day", day)] == (2, 1)
+
+        monkeypatch.undo()
+        assert await _refresh(factory) == 2
+        second = await _rollups(factory, location)
+        assert second[("hour", hour)] == (3, 2)  # incremented in place, not recomputed
+        assert second[("hour", later)] == (1, 0)
+        if later.date() == hour.date():
+            assert second[("day", day)] == (4, 2)
+
+        async with factory() as db:
+            rows = await get_sponsor_analytics(db, sponsor.id, "hour", hour, later + timedelta(hours=1))
+        assert [(r["claims"], r["redemptions"]) for r in rows] == [(3, 2), (1, 0)]
+
+    async def test_nothing_new(self, claims):
+        factory, _, location, _, set_watermark = claims
+        await set_watermark(datetime.now(timezone.utc))  # already past now - lag
+        assert await _refresh(factory) == 0
+        assert await _rollups(factory, location) == {}
+
+
+@pytest.mark.asyncio
+async def test_totals_across_buckets(client, fake_user, monkeypatch):
+    fake_user.role = "sponsor"
+    fake_user.sponsor_id = uuid.uuid4()
+    day = timedelta(days=1)
+    start = NOW - 3 * day
+    buckets = [
+        {"bucket_start": start + i * day, "claims": claims, "redemptions": claims // 2, "active_locations": 2,
+         "first_claim_at": start + i * day, "last_claim_at": start + i * day + timedelta(hours=5)}
+        for i, claims in enumerate([5, 0, 12])
+    ]
+    read = AsyncMock(return_value=buckets)
+    monkeypatch.setattr("app.api.sponsor.get_sponsor_analytics", read)
+    monkeypatch.setattr("app.api.sponsor.count_unique", AsyncMock(return_value=9))
+
+    response = await client.get("/sponsor/analytics", params={"start": start.isoformat(), "end": NOW.isoformat()})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total_claims"] == 17
+    assert (body["total_redemptions"], body["redemption_rate"]) == (8, 8 / 17)
+    assert [b["claims"] for b in body["buckets"]] == [5, 0, 12]
+    assert body["unique_users"] == 9
+    assert read.await_args.args[1:] == (fake_user.sponsor_id, "day", start, NOW, None)
+
+
+@pytest.mark.asyncio
+async def test_regular_user_is_forbidden(client):
+    response = await client.get("/sponsor/analytics")
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_sponsor_cannot_read_other_sponsor(client, fake_user):
+    fake_user.role = "sponsor"
+    fake_user.sponsor_id = uuid.uuid4()
+    response = await client.get("/sponsor/analytics", params={"sponsor_id": str(uuid.uuid4())})
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_admin_must_name_sponsor(client, fake_user):
+    fake_user.role = "admin"
+    response = await client.get("/sponsor/analytics")
+    assert response.status_code == 400
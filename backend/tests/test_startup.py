@@ -0,0 +1,10 @@
+"""Cold-start budget for the API process."""
+
+from benchmarks.startup import COLD_START_BUDGET_S, measure_cold_start
+
+
+def test_cold_start_within_budget():
+    result = measure_cold_start()
+    assert result["status"] == 200
+    assert result["deferred_loaded"] == [], "heavy modules were imported with app.main"
+    assert result["total_s"] < COLD_START_BUDGET_S
@@ -0,0 +1,75 @@
+"""Tests for trace-context propagation and span export."""
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core import tracing
+from app.core.tracing import InMemoryExporter, TracingMiddleware, parse_traceparent, span
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+class TestParseTraceparent:
+    def test_valid(self):
+        assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-01") == (TRACE_ID, PARENT_ID, True)
+        assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-00")[2] is False
+
+    @pytest.mark.parametrize("value", ["", "garbage", f"00-{'0' * 32}-{PARENT_ID}-01", f"01-{TRACE_ID}-{PARENT_ID}"])
+    def test_invalid(self, value):
+        assert parse_traceparent(value) is None
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemoryExporter()
+    tracing.configure(exporter)
+    yield exporter
+    tracing._processor = None
+
+
+@pytest.fixture
+def traced_client():
+    app = FastAPI()
+
+    @app.get("/things/{thing_id}")
+    async def read_thing(thing_id: int):
+        with span("load_thing", thing_id=thing_id):
+            with span("cache_lookup"):
+                pass
+        return {"id": thing_id}
+
+    app.add_middleware(TracingMiddleware)
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+class TestTracingMiddleware:
+    async def test_continues_sampled_trace(self, exporter, traced_client):
+        async with traced_client as client:
+            response = await client.get("/things/7", headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"})
+        await tracing._processor.flush()
+
+        spans = {s.name: s for s in exporter.spans}
+        assert set(spans) == {"GET /things/{thing_id}", "load_thing", "cache_lookup"}
+        server = spans["GET /things/{thing_id}"]
+        assert {s.trace_id for s in spans.values()} == {TRACE_ID}
+        assert server.parent_id == PARENT_ID
+        assert spans["load_thing"].parent_id == server.span_id
+        assert spans["cache_lookup"].parent_id == spans["load_thing"].span_id
+        assert server.attributes["http.status_code"] == 200
+        assert response.headers["traceparent"] == server.traceparent
+
+    async def test_unsampled_parent_records_nothing(self, exporter, traced_client):
+        async with traced_client as client:
+            response = await client.get("/things/7", headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-00"})
+        await tracing._processor.flush()
+        assert exporter.spans == []
+        assert "traceparent" not in response.headers
+
+    def test_otlp_payload_shape(self):
+        server = tracing.Span("GET /x", TRACE_ID, None, kind=tracing.KIND_SERVER, attributes={"n": 1})
+        payload = tracing.otlp_payload([server])
+        otlp_span = payload["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+        assert otlp_span["traceId"] == TRACE_ID and "parentSpanId" not in otlp_span
+        assert otlp_span["attributes"] == [{"key": "n", "value": {"intValue": "1"}}]
@@ -0,0 +1,117 @@
+"""Tests for HyperLogLog unique-visitor counters (mostly against a reachable Redis)."""
+
+import uuid
+from datetime import date, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+import redis.asyncio as redis
+
+from app.core import settings
+from app.services.unique_visitors import (
+    STANDARD_ERROR, archived_before, count_unique, hll_key, record_unique_visit,
+)
+
+# 3 standard errors: a correct HLL lands inside this band >99.7% of the time
+TOLERANCE = 3 * STANDARD_ERROR
+
+
+@pytest_asyncio.fixture
+async def live_redis():
+    client = redis.from_url(settings.redis_url, decode_responses=True)
+    try:
+        await client.ping()
+    except (redis.ConnectionError, OSError):
+        await client.aclose()
+        pytest.skip("Redis not reachable")
+    yield client
+    await client.aclose()
+
+
+async def _feed(client, location_id, users, day):
+    pipe = client.pipeline(transaction=False)
+    for user_id in users:
+        record_unique_visit(pipe, user_id, location_id, None, None, day=day)
+    await pipe.execute()
+
+
+@pytest.mark.asyncio
+async def test_single_day_matches_exact_count(live_redis):
+    location_id = uuid.uuid4()
+    day = date(2026, 1, 1)
+    users = [uuid.uuid4() for _ in range(20_000)]
+
+    # every user claims twice; duplicates must not inflate the count
+    await _feed(live_redis, location_id, users + users, day)
+    try:
+        estimate = await count_unique(live_redis, "location", location_id, day, day)
+        assert abs(estimate - len(users)) / len(users) <= TOLERANCE
+    finally:
+        await live_redis.delete(hll_key("location", location_id, day))
+
+
+@pytest.mark.asyncio
+async def test_date_range_merge_matches_exact_union(live_redis):
+    location_id = uuid.uuid4()
+    days = [date(2026, 1, 1), date(2026, 1, 2), date(2026, 1, 3)]
+    pool = [uuid.uuid4() for _ in range(30_000)]
+    # overlapping daily audiences: [0, 15k), [10k, 25k), [20k, 30k)
+    audiences = [pool[0:15_000], pool[10_000:25_000], pool[20_000:30_000]]
+
+    for day, users in zip(days, audiences):
+        await _feed(live_redis, location_id, users, day)
+    try:
+        exact = len(set().union(*audiences))
+        estimate = await count_unique(live_redis, "location", location_id, days[0], days[-1])
+        assert abs(estimate - exact) / exact <= TOLERANCE
+    finally:
+        await live_redis.delete(*(hll_key("location", location_id, d) for d in days))
+        await live_redis.delete(f"hll:range:location:{location_id}:{days[0]}:{days[-1]}")
+
+
+def _snapshots(*rows):
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=list(rows))))
+    return db
+
+
+@pytest.mark.asyncio
+class TestArchivedDays:
+    async def test_expired_days_restored_from_snapshots(self):
+        location_id, cutoff = uuid.uuid4(), archived_before()
+        old = cutoff - timedelta(days=1)
+        db = _snapshots((old, b"HYLL-old"))
+        redis_client = MagicMock()
+        pipe = redis_client.pipeline.return_value
+        pipe.execute = AsyncMock(return_value=[True, True, True, 42])
+
+        assert await count_unique(redis_client, "location", location_id, old, cutoff, db) == 42
+        restored = f"hll:restored:location:{location_id}:{old.isoformat()}"
+        pipe.set.assert_called_once_with(restored, b"HYLL-old", ex=60)
+        pipe.pfmerge.assert_called_once()
+        assert pipe.pfmerge.call_args.args[1:] == (hll_key("location", location_id, cutoff), restored)
+
+    async def test_recent_days_skip_postgres(self):
+        db = _snapshots()
+        redis_client = AsyncMock()
+        redis_client.pfcount.return_value = 7
+        assert await count_unique(redis_client, "sponsor", uuid.uuid4(), archived_before(), archived_before(), db) == 7
+        db.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_snapshot_registers_round_trip(live_redis):
+    """Registers copied out with GET (as the snapshot task does) count the same once restored."""
+    location_id = uuid.uuid4()
+    day = archived_before() - timedelta(days=10)
+    users = [uuid.uuid4() for _ in range(5_000)]
+    await _feed(live_redis, location_id, users, day)
+    raw = redis.from_url(settings.redis_url)
+    try:
+        registers = await raw.get(hll_key("location", location_id, day))
+        await live_redis.delete(hll_key("location", location_id, day))  # expired
+        estimate = await count_unique(live_redis, "location", location_id, day, day, _snapshots((day, registers)))
+        assert abs(estimate - len(users)) / len(users) <= TOLERANCE
+    finally:
+        await raw.aclose()